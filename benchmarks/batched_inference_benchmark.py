@@ -0,0 +1,100 @@
+"""
+Throughput and latency of concurrent sessions sharing one model.
+
+Every session thread transcribes `--windows` windows of `--window-seconds` audio, either
+taking turns on the model behind `ServeClientFasterWhisper.SINGLE_MODEL_LOCK` (the previous
+path) or through the `InferenceScheduler`, which batches the windows of all sessions.
+Reports audio seconds transcribed per wall-clock second and the per-window latency.
+
+    python -m benchmarks.batched_inference_benchmark --model tiny --sessions 1 4 8 --audio assets/jfk.flac
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.inference_scheduler import InferenceScheduler
+from whisper_live.transcriber import TranscriptionRequest, WhisperModel
+
+RATE = 16000
+
+
+def run_sessions(sessions, windows, transcribe):
+    latencies = []
+    latencies_lock = threading.Lock()
+
+    def session():
+        for window in windows:
+            start = time.perf_counter()
+            transcribe(window)
+            elapsed = time.perf_counter() - start
+            with latencies_lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny", help="Model size or path of a CTranslate2 model.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--windows", type=int, default=5, help="Windows transcribed by every session.")
+    parser.add_argument("--window-seconds", type=float, default=5.0)
+    parser.add_argument("--audio", default=None, help="Audio file to cut the windows from; a tone is used otherwise.")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-batch-wait", type=float, default=0.01)
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    args = parser.parse_args()
+
+    model = WhisperModel(args.model, device="cpu", compute_type="int8", cpu_threads=args.cpu_threads)
+
+    samples = int(args.window_seconds * RATE)
+    if args.audio:
+        audio = decode_audio(args.audio, sampling_rate=RATE)
+    else:
+        t = np.arange(samples * args.windows) / RATE
+        audio = (0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    audio = np.resize(audio, samples * args.windows)
+    windows = [
+        TranscriptionRequest(audio[i * samples:(i + 1) * samples], language=args.language)
+        for i in range(args.windows)
+    ]
+
+    lock = threading.Lock()
+
+    def transcribe_locked(request):
+        with lock:
+            segments, _ = model.transcribe(request.audio, language=request.language)
+            return list(segments or [])
+
+    scheduler = InferenceScheduler(model, max_batch_size=args.max_batch_size, max_wait=args.max_batch_wait)
+    scheduler.start()
+
+    # load the model weights and allocator pools before measuring
+    transcribe_locked(windows[0])
+    scheduler.transcribe(windows[0])
+
+    print(f"{'sessions':>8} {'path':>8} {'audio s/s':>10} {'p50 s':>8} {'p95 s':>8}")
+    for sessions in args.sessions:
+        for name, transcribe in (("lock", transcribe_locked), ("batched", scheduler.transcribe)):
+            elapsed, latencies = run_sessions(sessions, windows, transcribe)
+            audio_seconds = sessions * args.windows * args.window_seconds
+            print(
+                f"{sessions:>8} {name:>8} {audio_seconds / elapsed:>10.1f}"
+                f" {np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f}"
+            )
+    print(f"batches: {scheduler.batches}, mean batch size: {scheduler.requests / max(1, scheduler.batches):.1f}")
+    scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Main model decode time with and without a model cascade.
+
+Replays an audio file to one session as if it arrived in real time, on a simulated clock
+that advances by the measured time of every transcription pass, with the LocalAgreement
+commit policy. Without the cascade the main model transcribes every pass; with it the
+draft model transcribes the passes and the main model only the audio whose text is
+committed. Reports the seconds the main model decodes per second of audio, the draft
+model's share, and how long after its end committed text was final.
+
+    python -m benchmarks.cascade_benchmark --model large-v3 --draft-model small --audio assets/jfk.flac --repeat 4
+"""
+import argparse
+import time
+from unittest import mock
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.commit_policy import LocalAgreement
+from whisper_live.serve_client_base import ServeClientBase
+from whisper_live.serve_client_faster_whisper import ServeClientFasterWhisper
+from whisper_live.transcriber import WhisperModel
+
+RATE = 16000
+
+
+class TimedModel:
+    """Wraps a `WhisperModel`, summing the seconds its transcribe calls take."""
+
+    def __init__(self, model):
+        self.model = model
+        self.feature_extractor = model.feature_extractor
+        self.seconds = 0.0
+
+    def transcribe(self, audio, **kwargs):
+        start = time.perf_counter()
+        segments, info = self.model.transcribe(audio, **kwargs)
+        segments = list(segments)
+        self.seconds += time.perf_counter() - start
+        return segments, info
+
+
+def make_session(model, draft_model, language):
+    session = ServeClientFasterWhisper.__new__(ServeClientFasterWhisper)
+    ServeClientBase.__init__(session, "replay", mock.Mock(), server=None)
+    session.transcriber = model
+    session.draft_transcriber = draft_model
+    session.draft_features = False
+    session.language = language
+    session.task = "transcribe"
+    session.initial_prompt = None
+    session.use_vad = False
+    session.vad_parameters = None
+    session.priority = "normal"
+    session.no_speech_thresh = 0.45
+    session.commit_policy = LocalAgreement()
+    # committed text is not translated during the replay
+    session.format_segment = lambda start, end, text, translate=False, words=None: {"start": start, "end": end, "text": text}
+    return session
+
+
+def replay(model, draft_model, audio, language, step):
+    model, draft_model = TimedModel(model), TimedModel(draft_model) if draft_model is not None else None
+    session = make_session(model, draft_model, language)
+    total = len(audio) / RATE
+    now, received, passes = 0.0, 0, 0
+    latencies = []
+    while True:
+        arrived = min(len(audio), int(now * RATE))
+        if arrived > received:
+            session.add_frames(audio[received:arrived])
+            received = arrived
+        final = received == len(audio)
+        if not final and session.get_lag() < session.min_audio_duration:
+            now += step
+            continue
+
+        session.clip_audio_if_no_valid_segment()
+        input_bytes, duration = session.get_audio_chunk_for_processing()
+        if duration == 0:
+            break
+        start = time.perf_counter()
+        session.at_endpoint = final
+        committed = len(session.transcript)
+        segments = session.transcribe_audio(input_bytes)
+        if segments:
+            session.update_segments(segments, duration)
+        else:
+            session.timestamp_offset += duration
+        # the pass and the decoding of its committed audio by the main model
+        now += max(time.perf_counter() - start, step)
+        passes += 1
+        latencies.extend(now - entry["end"] for entry in session.transcript[committed:])
+        if final:
+            break
+
+    return {
+        "passes": passes,
+        "main_per_second": model.seconds / total,
+        "draft_per_second": draft_model.seconds / total if draft_model is not None else 0.0,
+        "latency": float(np.mean(latencies)) if latencies else float("nan"),
+        "committed": sum(len(entry["text"].split()) for entry in session.transcript),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="large-v3")
+    parser.add_argument("--draft-model", default="small")
+    parser.add_argument("--audio", default="assets/jfk.flac")
+    parser.add_argument("--repeat", type=int, default=4, help="Times the audio is repeated to form the stream.")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--step", type=float, default=0.25, help="Seconds of new audio between two passes.")
+    parser.add_argument("--cpu-threads", type=int, default=4)
+    args = parser.parse_args()
+
+    model = WhisperModel(args.model, device="cpu", compute_type="int8", cpu_threads=args.cpu_threads)
+    draft_model = WhisperModel(args.draft_model, device="cpu", compute_type="int8", cpu_threads=args.cpu_threads)
+    audio = np.tile(decode_audio(args.audio), args.repeat).astype(np.float32)
+    print(f"stream of {len(audio) / RATE:.1f}s")
+    print(f"{'cascade':>8} {'passes':>7} {'main s/s':>9} {'draft s/s':>10} {'latency (s)':>12} {'committed':>10}")
+    for name, draft in (("off", None), ("on", draft_model)):
+        stats = replay(model, draft, audio, args.language, args.step)
+        print(
+            f"{name:>8} {stats['passes']:>7} {stats['main_per_second']:>9.3f} {stats['draft_per_second']:>10.3f}"
+            f" {stats['latency']:>12.2f} {stats['committed']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
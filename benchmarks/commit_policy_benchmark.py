@@ -0,0 +1,108 @@
+"""
+Decoder work and finalization latency of the streaming commit policies.
+
+Replays an audio file to one session as if it arrived in real time, on a simulated clock
+that advances by the measured time of every transcription pass. The session runs the pass
+loop of `ServeClientFasterWhisper.speech_to_text` with the `segments` policy (commit all
+segments but the last one, and the last one once it repeated more than five times) or the
+`local_agreement` policy of `whisper_live.commit_policy`. Reports the seconds of audio
+decoded per second of audio received, and how long after its end committed text was final.
+
+    python -m benchmarks.commit_policy_benchmark --model tiny --audio assets/jfk.flac --repeat 4
+"""
+import argparse
+import time
+from unittest import mock
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.commit_policy import COMMIT_POLICIES, LocalAgreement
+from whisper_live.serve_client_base import ServeClientBase
+from whisper_live.serve_client_faster_whisper import ServeClientFasterWhisper
+from whisper_live.transcriber import WhisperModel
+
+RATE = 16000
+
+
+def make_session(policy):
+    session = ServeClientFasterWhisper.__new__(ServeClientFasterWhisper)
+    ServeClientBase.__init__(session, "replay", mock.Mock(), server=None)
+    session.no_speech_thresh = 0.45
+    session.commit_policy = LocalAgreement() if policy == "local_agreement" else None
+    # committed text is not translated during the replay
+    session.format_segment = lambda start, end, text, translate=False, words=None: {"start": start, "end": end, "text": text}
+    return session
+
+
+def replay(model, audio, policy, language, step):
+    session = make_session(policy)
+    total = len(audio) / RATE
+    now, received, decoded, passes = 0.0, 0, 0.0, 0
+    latencies = []
+    while True:
+        arrived = min(len(audio), int(now * RATE))
+        if arrived > received:
+            session.add_frames(audio[received:arrived])
+            received = arrived
+        final = received == len(audio)
+        if not final and session.get_lag() < session.min_audio_duration:
+            now += step
+            continue
+
+        session.clip_audio_if_no_valid_segment()
+        input_bytes, duration = session.get_audio_chunk_for_processing()
+        if duration == 0:
+            break
+        start = time.perf_counter()
+        segments, _ = model.transcribe(input_bytes, language=language, vad_filter=False)
+        segments = list(segments)
+        elapsed = time.perf_counter() - start
+        now += max(elapsed, step)
+        decoded += duration
+        passes += 1
+
+        committed = len(session.transcript)
+        session.at_endpoint = final
+        if segments:
+            session.update_segments(segments, duration)
+        else:
+            session.timestamp_offset += duration
+        latencies.extend(now - entry["end"] for entry in session.transcript[committed:])
+        if final:
+            break
+
+    return {
+        "passes": passes,
+        "decoded_per_second": decoded / total,
+        "latency": float(np.mean(latencies)) if latencies else float("nan"),
+        "latency_p90": float(np.percentile(latencies, 90)) if latencies else float("nan"),
+        "committed": sum(len(entry["text"].split()) for entry in session.transcript),
+        "uncommitted": len(session.current_out.split()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--audio", default="assets/jfk.flac")
+    parser.add_argument("--repeat", type=int, default=4, help="Times the audio is repeated to form the stream.")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--step", type=float, default=0.25, help="Seconds of new audio between two passes.")
+    parser.add_argument("--cpu-threads", type=int, default=4)
+    args = parser.parse_args()
+
+    model = WhisperModel(args.model, device="cpu", compute_type="int8", cpu_threads=args.cpu_threads)
+    audio = np.tile(decode_audio(args.audio), args.repeat).astype(np.float32)
+    print(f"stream of {len(audio) / RATE:.1f}s")
+    print(f"{'policy':>16} {'passes':>7} {'decoded s/s':>12} {'latency (s)':>12} {'p90 (s)':>8} {'committed':>10} {'uncommitted':>12}")
+    for policy in COMMIT_POLICIES:
+        stats = replay(model, audio, policy, args.language, args.step)
+        print(
+            f"{policy:>16} {stats['passes']:>7} {stats['decoded_per_second']:>12.2f} {stats['latency']:>12.2f}"
+            f" {stats['latency_p90']:>8.2f} {stats['committed']:>10} {stats['uncommitted']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
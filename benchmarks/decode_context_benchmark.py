@@ -0,0 +1,94 @@
+"""
+Python overhead of the decode setup per transcribed window.
+
+Every window needs a tokenizer for its task and language, the suppressed tokens, the
+tokens of the initial prompt and hotwords, and its result decoded to text once for the
+compression ratio and once more per segment. Without a cache, all of it is rebuilt on
+every call; with `WhisperModel.get_decode_context` and a `MemoTokenizer`, it is looked
+up. Reports the setup time per window both ways, and the time of a whole
+`transcribe_batch` call with the context cache disabled and enabled.
+
+    python -m benchmarks.decode_context_benchmark --model tiny --audio assets/jfk.flac --prompt "Kennedy" --hotwords "Americans"
+"""
+import argparse
+import time
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.transcriber import (
+    DecodeContextCache,
+    MemoTokenizer,
+    Tokenizer,
+    TranscriptionRequest,
+    WhisperModel,
+    get_suppressed_tokens,
+)
+
+RATE = 16000
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--audio", default="assets/jfk.flac")
+    parser.add_argument("--window-seconds", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--prompt", default=None)
+    parser.add_argument("--hotwords", default=None)
+    parser.add_argument("--suppress-tokens", type=int, nargs="*", default=[-1])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    model = WhisperModel(args.model, device="cpu", compute_type="int8")
+    window = np.resize(decode_audio(args.audio), int(args.window_seconds * RATE)).astype(np.float32)
+    segments, _ = model.transcribe(window, language=args.language, initial_prompt=args.prompt)
+    segment_tokens = [segment.tokens for segment in segments]
+    sequence = [token for tokens in segment_tokens for token in tokens]
+    print(f"{len(sequence)} tokens in {len(segment_tokens)} segments per window")
+
+    def rebuilt():
+        tokenizer = Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=args.language)
+        get_suppressed_tokens(tokenizer, args.suppress_tokens)
+        if args.prompt:
+            tokenizer.encode(" " + args.prompt.strip())
+        if args.hotwords:
+            tokenizer.encode(" " + args.hotwords.strip())
+        tokenizer.decode(sequence)
+        for tokens in segment_tokens:
+            tokenizer.decode(tokens)
+
+    def cached():
+        context = model.get_decode_context("transcribe", args.language, args.prompt, args.hotwords, args.suppress_tokens)
+        tokenizer = MemoTokenizer(context)
+        tokenizer.decode(sequence)
+        for tokens in segment_tokens:
+            tokenizer.decode(tokens)
+
+    print(f"{'setup':>10} {'per window (us)':>16}")
+    for name, function in (("rebuilt", rebuilt), ("cached", cached)):
+        seconds = best_of(lambda: [function() for _ in range(args.iterations)], args.repeats) / args.iterations
+        print(f"{name:>10} {seconds * 1e6:>16.1f}")
+
+    requests = [TranscriptionRequest(window, language=args.language, initial_prompt=args.prompt)] * args.batch_size
+    print(f"{'contexts':>10} {'batch (ms)':>11}")
+    for name, max_size in (("disabled", 0), ("enabled", 256)):
+        model.decode_contexts = DecodeContextCache(max_size=max_size)
+        model.transcribe_batch(requests, hotwords=args.hotwords)
+        seconds = best_of(lambda: model.transcribe_batch(requests, hotwords=args.hotwords), args.repeats)
+        print(f"{name:>10} {seconds * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Time of the log-mel features of one encoder window on CPU for every feature backend.
+
+Compares faster_whisper's `FeatureExtractor` (what the transcriber used before) with the
+NumPy and torch backends of `whisper_live.feature_extractor`, for inputs of 1 to 30 seconds
+padded to the 30 second encoder input. The torch column is skipped if torch is missing.
+
+    python -m benchmarks.feature_extraction_benchmark --seconds 1 5 10 30 --torch-threads 1
+"""
+import argparse
+import time
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor as ReferenceFeatureExtractor
+
+from whisper_live.feature_extractor import FEATURE_BACKENDS
+
+RATE = 16000
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, nargs="+", default=[1, 2, 5, 10, 20, 30])
+    parser.add_argument("--feature-size", type=int, default=80, help="Number of mel bands (128 for large-v3).")
+    parser.add_argument("--torch-threads", type=int, default=0, help="torch intra-op threads, 0 for the default.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    extractors = {"faster_whisper": ReferenceFeatureExtractor(feature_size=args.feature_size)}
+    for name, backend in FEATURE_BACKENDS.items():
+        kwargs = {"device": "cpu"} if name == "torch" else {}
+        try:
+            extractors[name] = backend(feature_size=args.feature_size, **kwargs)
+        except RuntimeError as e:
+            print(f"skipping {name}: {e}")
+    if args.torch_threads and "torch" in extractors:
+        extractors["torch"].torch.set_num_threads(args.torch_threads)
+
+    rng = np.random.default_rng(0)
+    print(f"{'seconds':>8}" + "".join(f" {name + ' (ms)':>20}" for name in extractors) + f" {'fastest':>15}")
+    for seconds in args.seconds:
+        audio = (rng.standard_normal(int(seconds * RATE)) * 0.1).astype(np.float32)
+        timings = {}
+        for name, extractor in extractors.items():
+            extractor(audio)
+            timings[name] = best_of(lambda: extractor(audio), args.repeats)
+        fastest = min(timings, key=timings.get)
+        print(f"{seconds:>8g}" + "".join(f" {timing * 1000:>20.2f}" for timing in timings.values()) + f" {fastest:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compares the base64-in-JSON audio packets with the binary audio frames.
+
+Reports the bytes per second sent on the wire for a real-time 16 kHz stream and
+the CPU time per packet spent encoding on the client and decoding on the server.
+
+    python -m benchmarks.protocol_benchmark --packets 20000
+"""
+import argparse
+import base64
+import json
+import time
+
+import numpy as np
+
+from whisper_live.protocol import (
+    SAMPLE_FORMAT_FLOAT32,
+    SAMPLE_FORMAT_INT16,
+    decode_frame,
+    encode_audio_frame,
+    to_float32,
+)
+
+RATE = 16000
+
+
+def encode_json(audio_bytes, sequence):
+    return json.dumps({
+        "speakerLang": "en",
+        "allLangs": ["en", "fa", "ur", "ru", "no", "ar"],
+        "audio": base64.b64encode(audio_bytes).decode("utf-8"),
+    })
+
+
+def decode_json(packet):
+    parsed = json.loads(packet)
+    audio_bytes = base64.b64decode(parsed["audio"])
+    return np.frombuffer(audio_bytes, dtype=np.float32)
+
+
+def encode_binary_float32(audio_bytes, sequence):
+    return encode_audio_frame(np.frombuffer(audio_bytes, dtype=np.float32), sequence, RATE, SAMPLE_FORMAT_FLOAT32)
+
+
+def encode_binary_int16(audio_bytes, sequence):
+    samples = np.frombuffer(audio_bytes, dtype=np.float32)
+    samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+    return encode_audio_frame(samples, sequence, RATE, SAMPLE_FORMAT_INT16)
+
+
+def decode_binary(packet):
+    return to_float32(decode_frame(packet))
+
+
+def run(name, encode, decode, packets):
+    start = time.process_time()
+    encoded = [encode(packet, i) for i, packet in enumerate(packets)]
+    encode_time = time.process_time() - start
+
+    start = time.process_time()
+    for packet in encoded:
+        decode(packet)
+    decode_time = time.process_time() - start
+
+    packet_bytes = sum(len(packet) for packet in encoded) / len(encoded)
+    packet_seconds = np.frombuffer(packets[0], dtype=np.float32).shape[0] / RATE
+    print(
+        f"{name:<16} {packet_bytes / packet_seconds:>12.0f} B/s"
+        f" {1e6 * encode_time / len(packets):>12.1f} us"
+        f" {1e6 * decode_time / len(packets):>12.1f} us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--packets", type=int, default=10000, help="Number of packets to encode and decode.")
+    parser.add_argument("--chunk", type=int, default=4096, help="Samples per packet (client default is 4096).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    packets = [
+        (rng.standard_normal(args.chunk).astype(np.float32) * 0.1).tobytes()
+        for _ in range(args.packets)
+    ]
+
+    print(f"{'path':<16} {'wire':>14} {'encode/packet':>15} {'decode/packet':>15}")
+    run("json+base64", encode_json, decode_json, packets)
+    run("binary float32", encode_binary_float32, decode_binary, packets)
+    run("binary int16", encode_binary_int16, decode_binary, packets)
+
+
+if __name__ == "__main__":
+    main()
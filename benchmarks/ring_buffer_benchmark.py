@@ -0,0 +1,98 @@
+"""
+Per-packet ingest cost of the per-client audio buffer.
+
+Simulates 4 to 64 concurrent sessions streaming 256 ms packets for 20 hours each and
+compares the previous concatenate-and-trim buffer with `AudioRingBuffer`. Each packet
+also takes the pending window (up to 25 s) the way the transcription loop does.
+
+Ingest cost is constant once the buffer is full, so by default only `--measure-hours`
+of every session are streamed and the totals are extrapolated to `--hours`; pass
+`--measure-hours` equal to `--hours` to stream everything.
+
+    python -m benchmarks.ring_buffer_benchmark --sessions 4 16 64
+"""
+import argparse
+import time
+
+import numpy as np
+
+from whisper_live.ring_buffer import AudioRingBuffer
+
+RATE = 16000
+PACKET = 4096
+WINDOW = 25 * RATE
+
+
+class ConcatenateBuffer:
+    """The buffer previously used by ServeClientBase.add_frames."""
+
+    def __init__(self):
+        self.frames_np = None
+        self.offset = 0
+
+    def append(self, frame_np):
+        if self.frames_np is not None and self.frames_np.shape[0] > 60 * RATE:
+            self.offset += 30 * RATE
+            self.frames_np = self.frames_np[int(30 * RATE):]
+        if self.frames_np is None:
+            self.frames_np = frame_np.copy()
+        else:
+            self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
+
+    @property
+    def end(self):
+        return self.offset + self.frames_np.shape[0]
+
+    def window(self, start):
+        return self.frames_np[max(0, start - self.offset):].copy()
+
+
+class RingBuffer(AudioRingBuffer):
+    def __init__(self):
+        super().__init__(60 * RATE)
+
+    def window(self, start):
+        return self.view(start)
+
+
+def run(buffer_cls, sessions, packets):
+    buffers = [buffer_cls() for _ in range(sessions)]
+    packet = np.zeros(PACKET, dtype=np.float32)
+    # fill the buffers first, the cost per packet is constant from then on
+    for _ in range(61 * RATE // PACKET + 1):
+        for buffer in buffers:
+            buffer.append(packet)
+    start = time.process_time()
+    for _ in range(packets):
+        for buffer in buffers:
+            buffer.append(packet)
+            buffer.window(buffer.end - WINDOW)
+    return time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--hours", type=float, default=20.0, help="Simulated length of every session.")
+    parser.add_argument("--measure-hours", type=float, default=0.05,
+                        help="Hours per session actually streamed; the rest is extrapolated.")
+    args = parser.parse_args()
+
+    total_packets = int(args.hours * 3600 * RATE / PACKET)
+    packets = min(total_packets, int(args.measure_hours * 3600 * RATE / PACKET))
+    scale = total_packets / packets
+
+    print(f"{'sessions':>8} {'buffer':>12} {'us/packet':>10} {'cpu s for ' + str(args.hours) + ' h':>16} {'cpu/realtime':>13}")
+    for sessions in args.sessions:
+        for name, buffer_cls in (("concatenate", ConcatenateBuffer), ("ring", RingBuffer)):
+            elapsed = run(buffer_cls, sessions, packets)
+            per_packet = elapsed / (packets * sessions)
+            total = elapsed * scale
+            print(
+                f"{sessions:>8} {name:>12} {1e6 * per_packet:>10.1f} {total:>16.1f}"
+                f" {total / (args.hours * 3600):>13.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
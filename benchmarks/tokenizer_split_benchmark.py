@@ -0,0 +1,67 @@
+"""
+Word splitting of 448-token sequences, the longest a window decodes.
+
+Times `Tokenizer.split_tokens_on_unicode`, which decodes every token once from the byte
+table of the vocabulary, against the previous implementation that decodes the word so far
+after every token, for text in spaced languages and in languages split on code points,
+and for random tokens of the vocabulary. Both must return the same words.
+
+    python -m benchmarks.tokenizer_split_benchmark --tokenizer openai/whisper-tiny --repeats 50
+"""
+import argparse
+import random
+import time
+
+import tokenizers
+
+from whisper_live.tokenizer import Tokenizer
+
+MAX_TOKENS = 448
+TEXTS = {
+    "en": "And so, my fellow Americans: ask not what your country can do for you, ask what you can do for your country. ",
+    "zh": "所以，我的美国同胞们：不要问你的国家能为你做什么，而要问你能为你的国家做什么。",
+    "ja": "だから、アメリカ国民の皆さん、国があなたのために何ができるかではなく、あなたが国のために何ができるかを問うてください。",
+    "th": "ดังนั้น เพื่อนร่วมชาติชาวอเมริกันของข้าพเจ้า อย่าถามว่าประเทศจะทำอะไรให้ท่านได้บ้าง จงถามว่าท่านจะทำอะไรให้ประเทศได้บ้าง",
+}
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokenizer", default="openai/whisper-tiny", help="Hugging Face model or tokenizer.json path.")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.tokenizer.endswith(".json"):
+        hf_tokenizer = tokenizers.Tokenizer.from_file(args.tokenizer)
+    else:
+        hf_tokenizer = tokenizers.Tokenizer.from_pretrained(args.tokenizer)
+
+    rng = random.Random(0)
+    print(f"{'text':>8} {'prefixes (ms)':>14} {'linear (ms)':>12} {'speedup':>8}")
+    for name in (*TEXTS, "random"):
+        tokenizer = Tokenizer(hf_tokenizer, True, task="transcribe", language="en" if name == "random" else name)
+        if name == "random":
+            tokens = [rng.randrange(tokenizer.eot) for _ in range(MAX_TOKENS)]
+        else:
+            text_tokens = tokenizer.encode(TEXTS[name])
+            tokens = (text_tokens * (MAX_TOKENS // len(text_tokens) + 1))[:MAX_TOKENS]
+        # the table is built on the first call
+        words = tokenizer.split_tokens_on_unicode(tokens)
+        assert words == tokenizer._split_tokens_on_unicode_by_prefix(tokens), name
+
+        prefixes = best_of(lambda: tokenizer._split_tokens_on_unicode_by_prefix(tokens), args.repeats)
+        linear = best_of(lambda: tokenizer.split_tokens_on_unicode(tokens), args.repeats)
+        print(f"{name:>8} {prefixes * 1000:>14.3f} {linear * 1000:>12.3f} {prefixes / linear:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
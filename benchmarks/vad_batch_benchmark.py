@@ -0,0 +1,52 @@
+"""
+Silero VAD windows scored per second for a growing number of streams per model call.
+
+Batch size 1 is the per-window loop used by `get_speech_timestamps` and the synchronous
+`StreamingVAD`; larger batches stack one 512 sample window of each stream into one
+`session.run`, as `BatchedVAD` does across sessions.
+
+    python -m benchmarks.vad_batch_benchmark --batch-sizes 1 8 32 128
+"""
+import argparse
+import time
+
+import numpy as np
+
+from whisper_live.vad_silero import get_vad_model
+
+RATE = 16000
+WINDOW = 512
+
+
+def run(model, batch_size, steps):
+    rng = np.random.default_rng(0)
+    windows = (rng.standard_normal((steps, batch_size, WINDOW)) * 0.1).astype(np.float32)
+    state, context = model.get_initial_states(batch_size=batch_size)
+    model(windows[0], state, context, RATE)
+
+    start = time.perf_counter()
+    for step in range(steps):
+        _, state, context = model(windows[step], state, context, RATE)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--windows", type=int, default=20000, help="Windows scored per batch size.")
+    args = parser.parse_args()
+
+    model = get_vad_model()
+    print(f"{'batch':>6} {'steps':>7} {'windows/s':>11} {'realtime streams':>17}")
+    for batch_size in args.batch_sizes:
+        steps = max(1, args.windows // batch_size)
+        elapsed = run(model, batch_size, steps)
+        windows_per_second = steps * batch_size / elapsed
+        print(
+            f"{batch_size:>6} {steps:>7} {windows_per_second:>11.0f}"
+            f" {windows_per_second * WINDOW / RATE:>17.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Time to turn the Silero speech probabilities of multi-hour audio into speech chunks.
+
+Compares the per-window Python loop `speech_probs_to_timestamps` used to run with the
+compiled hysteresis and vectorized padding (numba is used when installed; the first call,
+which compiles the kernel, is not timed). Both get the probabilities as a list of floats
+like `StreamingVAD` keeps them; the last column is the compiled path given a float32 array.
+
+    python -m benchmarks.vad_postprocessing_benchmark --hours 1 4 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tests.test_vad_postprocessing import random_probs, reference_speech_probs_to_timestamps
+from whisper_live.vad_silero import VadOptions, speech_probs_to_timestamps
+
+RATE = 16000
+WINDOW = 512
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--max-speech-duration", type=float, default=30.0, help="max_speech_duration_s of the VAD options.")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    options = VadOptions(max_speech_duration_s=args.max_speech_duration)
+    speech_probs_to_timestamps(np.zeros(16, dtype=np.float32), 16 * WINDOW, options)
+
+    print(
+        f"{'hours':>6} {'windows':>9} {'chunks':>7} {'python (s)':>11} {'compiled (s)':>13}"
+        f" {'speedup':>8} {'from array (s)':>15}"
+    )
+    for hours in args.hours:
+        n_windows = int(hours * 3600 * RATE / WINDOW)
+        array = random_probs(np.random.default_rng(0), n_windows)
+        probs = array.tolist()
+        audio_length = n_windows * WINDOW
+        reference_time, expected = best_of(
+            lambda: reference_speech_probs_to_timestamps(probs, audio_length, options), args.repeats
+        )
+        compiled_time, chunks = best_of(
+            lambda: speech_probs_to_timestamps(probs, audio_length, options), args.repeats
+        )
+        assert chunks == expected
+        array_time, _ = best_of(lambda: speech_probs_to_timestamps(array, audio_length, options), args.repeats)
+        print(
+            f"{hours:>6g} {n_windows:>9} {len(chunks):>7} {reference_time:>11.3f}"
+            f" {compiled_time:>13.4f} {reference_time / compiled_time:>7.1f}x {array_time:>15.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Cost of the word alignment per transcribed window.
+
+Transcribes windows of `--window-seconds` audio with and without `word_timestamps`, one
+window at a time and as one batch of `--batch-size` windows, and reports the time per
+window and what the alignment adds.
+
+    python -m benchmarks.word_timestamps_benchmark --model tiny --audio assets/jfk.flac --window-seconds 5 10
+"""
+import argparse
+import time
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.transcriber import TranscriptionRequest, WhisperModel
+
+RATE = 16000
+
+
+def best_of(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--audio", default="assets/jfk.flac")
+    parser.add_argument("--window-seconds", type=float, nargs="+", default=[2, 5, 10, 20])
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    model = WhisperModel(args.model, device=args.device, compute_type=args.compute_type)
+    audio = decode_audio(args.audio)
+
+    print(f"{'window (s)':>10} {'mode':>8} {'plain (ms)':>11} {'aligned (ms)':>13} {'overhead':>9}")
+    for seconds in args.window_seconds:
+        samples = int(seconds * RATE)
+        window = np.resize(audio, samples).astype(np.float32)
+        requests = [TranscriptionRequest(window, language=args.language)] * args.batch_size
+
+        def single(word_timestamps):
+            segments, _ = model.transcribe(window, language=args.language, word_timestamps=word_timestamps)
+            list(segments)
+
+        def batch(word_timestamps):
+            model.transcribe_batch(requests, word_timestamps=word_timestamps)
+
+        for mode, run, windows in (("single", single, 1), ("batch", batch, args.batch_size)):
+            run(True)
+            plain = best_of(lambda: run(False), args.repeats) / windows
+            aligned = best_of(lambda: run(True), args.repeats) / windows
+            print(
+                f"{seconds:>10g} {mode:>8} {plain * 1000:>11.1f} {aligned * 1000:>13.1f}"
+                f" {(aligned - plain) / plain:>8.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
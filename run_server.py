@@ -1,5 +1,6 @@
 import argparse
 import logging
+import os
 import asyncio
 from aiohttp import web
 
@@ -20,6 +21,14 @@ async def check_availability(request: web.Request) -> web.Response:
         "clients_number": client_number
     })
 
+async def get_status(request: web.Request) -> web.Response:
+    """
+    Returns the scheduling state of the TranscriptionServer: per-session lag behind
+    real time, starvation and dropped-audio counters, and the batching counters.
+    """
+    transcription_server = request.app["transcription_server"]
+    return web.json_response(transcription_server.get_status())
+
 async def start_http_server(host: str, port: int, transcription_server) -> None:
     """
     Start an aiohttp-based HTTP server with a single route: /checkAvailability
@@ -32,6 +41,7 @@ async def start_http_server(host: str, port: int, transcription_server) -> None:
 
     # Register our route
     app.router.add_get('/check', check_availability)
+    app.router.add_get('/status', get_status)
 
     # Set up the web server
     runner = web.AppRunner(app)
@@ -75,13 +85,152 @@ async def main():
                         type=int,
                         default=8080,
                         help="Port to run the HTTP server on for /checkAvailability, etc.")
+    parser.add_argument('--max_batch_size', '-mbs',
+                        type=int,
+                        default=8,
+                        help="Maximum number of session windows transcribed in one batched model call. \
+                              0 serializes the sessions on a lock instead.")
+    parser.add_argument('--max_batch_wait', '-mbw',
+                        type=float,
+                        default=0.01,
+                        help="Seconds to wait for more session windows before running a batch.")
+    parser.add_argument('--replicas', '-r',
+                        type=int,
+                        default=1,
+                        help="Number of model replicas; every transcription goes to the least-loaded one.")
+    parser.add_argument('--cpu_threads', '-ct',
+                        type=int,
+                        default=0,
+                        help="CPU threads of every model replica, 0 for the CTranslate2 default.")
+    parser.add_argument('--num_workers', '-nw',
+                        type=int,
+                        default=1,
+                        help="Parallel workers (CTranslate2 inter_threads) of every model replica.")
+    parser.add_argument('--vad_batch_size', '-vbs',
+                        type=int,
+                        default=32,
+                        help="Maximum number of sessions whose VAD windows are scored in one batched call. \
+                              0 runs the VAD of every session on its own.")
+    parser.add_argument('--vad_sessions', '-vs',
+                        type=int,
+                        default=1,
+                        help="Number of Silero ONNX sessions shared by the VAD of all sessions.")
+    parser.add_argument('--vad_threads', '-vt',
+                        type=int,
+                        default=1,
+                        help="Intra-op threads of every VAD session.")
+    parser.add_argument('--vad_inter_threads', '-vit',
+                        type=int,
+                        default=1,
+                        help="Inter-op threads of every VAD session.")
+    parser.add_argument('--energy_gate', '-eg',
+                        action='store_true',
+                        help="Skip the neural VAD and transcription for windows an energy / spectral \
+                              flatness gate classifies as certainly silent.")
+    parser.add_argument('--no_streaming_features', '-nsf',
+                        action='store_true',
+                        help="Recompute the log-mel features of the whole window on every pass \
+                              instead of caching the frames of each session.")
+    parser.add_argument('--feature_backend', '-fb',
+                        type=str,
+                        default="numpy",
+                        choices=["numpy", "torch"],
+                        help="Backend computing the log-mel features of the transcriber.")
+    parser.add_argument('--max_fallback_attempts', '-mfa',
+                        type=int,
+                        default=0,
+                        help="Decodings per window in the temperature fallback, the first one included. \
+                              0 tries every temperature.")
+    parser.add_argument('--sequential_fallback', '-sfb',
+                        action='store_true',
+                        help="Retry every rejected window of a batch on its own instead of together.")
+    parser.add_argument('--adaptive_decoding', '-ad',
+                        action='store_true',
+                        help="Step decoding down (greedy, fewer fallbacks, fewer tokens) while sessions lag \
+                              or the model is saturated, and back up when there is headroom.")
+    parser.add_argument('--commit_policy', '-cp',
+                        type=str,
+                        default="local_agreement",
+                        choices=["local_agreement", "segments"],
+                        help="How sessions finalize text: commit what two consecutive passes agree on \
+                              (local_agreement), or complete segments and repeated output (segments).")
+    parser.add_argument('--word_timestamps', '-wt',
+                        action='store_true',
+                        help="Align every word with the audio: commit and trim at word boundaries, and \
+                              send per-word timings to clients.")
+    parser.add_argument('--cascade_model', '-cm',
+                        type=str,
+                        default=None,
+                        help="Fast model (name or path) for the tentative text of every pass; the main \
+                              model then only transcribes the audio whose text is committed.")
+    parser.add_argument('--autotune', '-at',
+                        action='store_true',
+                        help="On CPU, pick the compute type, --cpu_threads and --num_workers at startup by \
+                              benchmarking a few combinations; the result is cached per CPU and model.")
+    parser.add_argument('--autotune_latency', '-atl',
+                        type=float,
+                        default=1.0,
+                        help="Seconds a window may take in the autotune search.")
+    parser.add_argument('--autotune_audio', '-ata',
+                        type=str,
+                        default=None,
+                        help="Speech sample of the autotune search, defaults to a built-in synthetic \
+                              speech signal.")
+    parser.add_argument('--pin_cores', '-pc',
+                        action='store_true',
+                        help="Give every replica, the VAD, the translation model and the session threads \
+                              their own cores and pin their threads to them.")
+    parser.add_argument('--vad_cores', '-vc',
+                        type=int,
+                        default=1,
+                        help="Cores of the VAD with --pin_cores.")
+    parser.add_argument('--translation_cores', '-tc',
+                        type=int,
+                        default=0,
+                        help="Cores of the local translation model with --pin_cores, 0 to share the \
+                              Whisper cores.")
+    parser.add_argument('--feature_cores', '-fc',
+                        type=int,
+                        default=0,
+                        help="Cores of the session threads (feature extraction) with --pin_cores, 0 to \
+                              share the Whisper cores.")
 
     args = parser.parse_args()
+    if args.autotune and args.faster_whisper_custom_model_path is None:
+        parser.error("--autotune needs the model to tune, pass its path with --faster_whisper_custom_model_path.")
+    if args.autotune_audio is not None and not os.path.isfile(args.autotune_audio):
+        parser.error(f"--autotune_audio {args.autotune_audio} does not exist.")
 
     from whisper_live.server import TranscriptionServer
 
     # Initialize your TranscriptionServer instance
-    server = TranscriptionServer()
+    server = TranscriptionServer(
+        max_batch_size=args.max_batch_size,
+        max_batch_wait=args.max_batch_wait,
+        replicas=args.replicas,
+        cpu_threads=args.cpu_threads,
+        num_workers=args.num_workers,
+        vad_batch_size=args.vad_batch_size,
+        vad_sessions=args.vad_sessions,
+        vad_intra_threads=args.vad_threads,
+        vad_inter_threads=args.vad_inter_threads,
+        energy_gate=args.energy_gate,
+        streaming_features=not args.no_streaming_features,
+        feature_backend=args.feature_backend,
+        max_fallback_attempts=args.max_fallback_attempts,
+        batch_fallback=not args.sequential_fallback,
+        adaptive_decoding=args.adaptive_decoding,
+        commit_policy=args.commit_policy,
+        word_timestamps=args.word_timestamps,
+        cascade_model=args.cascade_model,
+        autotune=args.autotune,
+        autotune_latency=args.autotune_latency,
+        autotune_audio=args.autotune_audio,
+        pin_cores=args.pin_cores,
+        vad_cores=args.vad_cores,
+        translation_cores=args.translation_cores,
+        feature_cores=args.feature_cores,
+    )
 
     # Prepare SSL parameters only if SSL files are provided
     ssl_key_file = args.ssl_key_file if args.ssl_key_file else None
@@ -0,0 +1,72 @@
+import tracemalloc
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.feature_extractor import NumpyFeatureExtractor
+from whisper_live.serve_client_base import ServeClientBase
+from whisper_live.streaming_features import StreamingFeatureExtractor
+from whisper_live.transcriber import WhisperModel
+
+RATE = 16000
+WINDOW = 10 * RATE
+SPEECH_CHUNKS = [{"start": 160 * 20, "end": 160 * 400}, {"start": 160 * 450, "end": WINDOW}]
+# bookkeeping of numpy and Python objects, far below the size of a window
+SLACK = 64 * 1024
+
+
+def allocated(function):
+    """Peak bytes allocated by one call, after a warm-up call."""
+    function()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        return result, tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+class TestAllocationsPerIteration(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.session = ServeClientBase("uid", mock.Mock(), server=None)
+        feature_extractor = NumpyFeatureExtractor(feature_size=80)
+        self.session.features = StreamingFeatureExtractor.from_feature_extractor(feature_extractor)
+        self.session.add_frames((rng.standard_normal(WINDOW) * 0.1).astype(np.float32))
+        self.model = WhisperModel.__new__(WhisperModel)
+        self.model.feature_extractor = feature_extractor
+        self.model.logger = mock.Mock(isEnabledFor=lambda level: False)
+
+    def iteration(self, need_audio=False):
+        audio, _ = self.session.get_audio_chunk_for_processing()
+        features = self.session.get_features(audio, SPEECH_CHUNKS)
+        prepared = self.model._prepare_audio(
+            audio, True, {"threshold": 0.5}, speech_chunks=SPEECH_CHUNKS, need_audio=need_audio
+        )
+        return features, prepared
+
+    def test_window_features_are_the_only_allocation(self):
+        (features, prepared), peak = allocated(self.iteration)
+        self.assertIsNone(prepared[0])
+        self.assertAlmostEqual(prepared[2], (WINDOW - 160 * 70) / RATE)
+        # the window itself is neither copied nor normalized out of place
+        self.assertLessEqual(peak, features.nbytes + SLACK)
+
+    def test_collected_audio_is_normalized_in_place(self):
+        (features, prepared), peak = allocated(lambda: self.iteration(need_audio=True))
+        audio = prepared[0]
+        self.assertAlmostEqual(float(np.max(np.abs(audio))), 1.0, places=6)
+        self.assertLessEqual(peak, features.nbytes + audio.nbytes + SLACK)
+
+    def test_prepare_audio_without_vad_copies_once(self):
+        audio, _ = self.session.get_audio_chunk_for_processing()
+        (prepared, *_), peak = allocated(lambda: self.model._prepare_audio(audio, False, None))
+        np.testing.assert_allclose(prepared, audio / np.max(np.abs(audio)))
+        self.assertLessEqual(peak, audio.nbytes + SLACK)
+
+
+if __name__ == "__main__":
+    unittest.main()
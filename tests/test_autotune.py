@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.autotune import (
+    RATE, TuneConfig, TuneResult, autotune, candidate_configs, model_hash, select, synthetic_speech,
+)
+from whisper_live.server import TranscriptionServer
+
+
+def fake_measure(model_path, config, audio):
+    """Workers add throughput, and latency."""
+    return TuneResult(config, 0.2 * config.num_workers, float(config.cpu_threads * config.num_workers ** 2))
+
+
+class TestSearch(unittest.TestCase):
+    def test_candidates_fit_the_cores(self):
+        configs = candidate_configs(8, compute_types=("int8",))
+        self.assertEqual(
+            [(config.cpu_threads, config.num_workers) for config in configs],
+            [(8, 1), (4, 1), (4, 2), (2, 1), (2, 2), (2, 4)],
+        )
+        self.assertEqual(candidate_configs(1, compute_types=("int8", "float32")), [TuneConfig("int8", 1, 1), TuneConfig("float32", 1, 1)])
+
+    def test_highest_throughput_within_the_target_latency(self):
+        results = [
+            TuneResult(TuneConfig("int8", 8, 1), 0.4, 20.0),
+            TuneResult(TuneConfig("int8", 4, 2), 0.9, 30.0),
+            TuneResult(TuneConfig("int8", 2, 4), 1.5, 40.0),
+        ]
+        self.assertEqual(select(results, target_latency=1.0), results[1])
+        # none is fast enough: the fastest one
+        self.assertEqual(select(results, target_latency=0.1), results[0])
+
+
+class TestAutotune(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.model_path = os.path.join(directory.name, "model")
+        os.makedirs(self.model_path)
+        with open(os.path.join(self.model_path, "model.bin"), "wb") as model_file:
+            model_file.write(b"weights")
+        self.cache_path = os.path.join(directory.name, "cache", "autotune.json")
+        patch = mock.patch("whisper_live.autotune.measure", side_effect=fake_measure)
+        self.measure = patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_result_is_cached(self):
+        result = autotune(self.model_path, target_latency=0.5, cpus=8, compute_types=("int8",), cache_path=self.cache_path)
+        self.assertEqual(result.config, TuneConfig("int8", 4, 2))
+        self.assertEqual(self.measure.call_count, 6)
+        with open(self.cache_path, encoding="utf-8") as cache_file:
+            self.assertEqual(list(json.load(cache_file).values()), [result.to_dict()])
+
+        # a restart skips the search
+        self.assertEqual(autotune(self.model_path, target_latency=0.5, cpus=8, cache_path=self.cache_path), result)
+        self.assertEqual(self.measure.call_count, 6)
+        # another latency target is searched again
+        autotune(self.model_path, target_latency=1.0, cpus=8, compute_types=("int8",), cache_path=self.cache_path)
+        self.assertEqual(self.measure.call_count, 12)
+
+    def test_unsupported_configurations_are_skipped(self):
+        def measure(model_path, config, audio):
+            if config.compute_type == "float32":
+                raise ValueError("unsupported compute type")
+            return fake_measure(model_path, config, audio)
+
+        self.measure.side_effect = measure
+        with self.assertLogs(level="WARNING"):
+            result = autotune(self.model_path, cpus=2, compute_types=("float32", "int8"), cache_path=None)
+        self.assertEqual(result.config.compute_type, "int8")
+
+    def test_built_in_sample_by_default(self):
+        autotune(self.model_path, cpus=1, compute_types=("int8",), cache_path=None)
+        audio = self.measure.call_args.args[2]
+        np.testing.assert_array_equal(audio, synthetic_speech(10.0))
+
+    def test_missing_sample_is_an_error(self):
+        autotune(self.model_path, cpus=2, cache_path=self.cache_path)
+        self.measure.reset_mock()
+        with mock.patch("whisper_live.autotune.decode_audio", side_effect=FileNotFoundError("no such file")):
+            # even with a cached result
+            with self.assertRaises(ValueError):
+                autotune(self.model_path, cpus=2, audio_path="missing.flac", cache_path=self.cache_path)
+            with self.assertRaises(ValueError):
+                autotune(self.model_path, cpus=4, audio_path="missing.flac", cache_path=self.cache_path)
+        self.measure.assert_not_called()
+
+    def test_synthetic_speech_is_voiced_with_pauses(self):
+        audio = synthetic_speech(10.0)
+        self.assertEqual((len(audio), audio.dtype), (10 * RATE, np.float32))
+        frames = np.abs(audio).reshape(-1, RATE // 100).max(axis=1)
+        self.assertLess(np.abs(audio).max(), 1.0)
+        self.assertTrue(0.3 < np.mean(frames > 0.1) < 0.9)
+
+    def test_model_fingerprint_follows_the_files(self):
+        fingerprint = model_hash(self.model_path)
+        self.assertEqual(model_hash(self.model_path), fingerprint)
+        with open(os.path.join(self.model_path, "model.bin"), "wb") as model_file:
+            model_file.write(b"other weights")
+        self.assertNotEqual(model_hash(self.model_path), fingerprint)
+
+
+class TestServerAutotune(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch("whisper_live.server.LoadBalancedTranslator"),
+            mock.patch("whisper_live.server.ModelPool"),
+            mock.patch("whisper_live.server.InferenceScheduler"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.server = TranscriptionServer(autotune=True, cpu_threads=3)
+
+    def test_model_path_is_required(self):
+        with mock.patch("whisper_live.server.autotune") as search, self.assertRaises(ValueError):
+            self.server.create_model(None)
+        search.assert_not_called()
+
+    def test_tuned_configuration_is_used(self):
+        result = TuneResult(TuneConfig("int8_float32", 4, 2), 0.5, 20.0)
+        with tempfile.TemporaryDirectory() as model_path, mock.patch("whisper_live.server.autotune", return_value=result):
+            self.server.create_model(model_path)
+        self.assertEqual((self.server.cpu_threads, self.server.num_workers), (4, 2))
+        self.assertEqual(self.server.get_status()["autotune"]["compute_type"], "int8_float32")
+
+    def test_unloadable_sample_fails_the_startup(self):
+        error = ValueError("Autotune: cannot load the sample missing.flac")
+        with tempfile.TemporaryDirectory() as model_path, mock.patch("whisper_live.server.autotune", side_effect=error):
+            with self.assertRaises(ValueError):
+                self.server.create_model(model_path)
+        self.assertEqual((self.server.cpu_threads, self.server.num_workers), (3, 1))
+        self.assertNotIn("autotune", self.server.get_status())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.commit_policy import LocalAgreement
+from whisper_live.serve_client_base import ServeClientBase
+from whisper_live.serve_client_faster_whisper import ServeClientFasterWhisper
+from whisper_live.transcriber import Segment
+
+RATE = 16000
+
+
+def make_segment(start, end, text):
+    return Segment(0, 0, start, end, text, [], 0.0, -0.1, 1.0, 0.01, None)
+
+
+class FakeModel:
+    """Returns the queued segments of every call, and records the seconds of audio it got."""
+
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(len(audio) / RATE)
+        return self.results.pop(0), None
+
+
+def make_session(final, draft=None, policy="local_agreement"):
+    session = ServeClientFasterWhisper.__new__(ServeClientFasterWhisper)
+    ServeClientBase.__init__(session, "uid", mock.Mock(), server=None)
+    session.transcriber = final
+    session.draft_transcriber = draft
+    session.draft_features = False
+    session.language = "en"
+    session.task = "transcribe"
+    session.initial_prompt = None
+    session.use_vad = False
+    session.vad_parameters = None
+    session.priority = "normal"
+    session.no_speech_thresh = 0.45
+    session.commit_policy = LocalAgreement() if policy == "local_agreement" else None
+    session.format_segment = lambda start, end, text, translate=False, words=None: (round(start, 3), round(end, 3), text)
+    return session
+
+
+def run_pass(session):
+    input_bytes, duration = session.get_audio_chunk_for_processing()
+    return session.update_segments(session.transcribe_audio(input_bytes), duration)
+
+
+class TestCascade(unittest.TestCase):
+    def test_final_model_transcribes_the_committed_audio(self):
+        draft = FakeModel([
+            [make_segment(0.0, 1.2, " hello there."), make_segment(1.5, 2.0, " how")],
+            [make_segment(0.0, 1.2, " hello there."), make_segment(1.5, 2.5, " how are")],
+        ])
+        final = FakeModel([[make_segment(0.0, 1.2, " Hello there!")]])
+        session = make_session(final, draft)
+        session.add_frames(np.zeros(2 * RATE, dtype=np.float32))
+
+        self.assertEqual(run_pass(session), (0.0, 2.0, " hello there. how"))
+        self.assertEqual(final.calls, [])
+
+        session.add_frames(np.zeros(RATE // 2, dtype=np.float32))
+        last_segment = run_pass(session)
+        # the final model only gets the trimmed audio, and its text is committed
+        self.assertEqual(draft.calls, [2.0, 2.5])
+        self.assertEqual(final.calls, [1.2])
+        self.assertEqual(session.transcript, [(0.0, 1.2, " Hello there!")])
+        self.assertEqual(session.text, [" Hello there!"])
+        # "how" is committed, but its audio is still in the window
+        self.assertEqual(last_segment, (1.5, 2.5, " how are"))
+        self.assertAlmostEqual(session.timestamp_offset, 1.2)
+
+    def test_draft_text_is_kept_if_the_final_model_finds_no_speech(self):
+        draft = FakeModel([[make_segment(0.0, 1.0, " one."), make_segment(1.0, 2.0, " two")]])
+        final = FakeModel([None])
+        session = make_session(final, draft, policy="segments")
+        session.add_frames(np.zeros(2 * RATE, dtype=np.float32))
+
+        self.assertEqual(run_pass(session), (1.0, 2.0, " two"))
+        self.assertEqual(final.calls, [1.0])
+        self.assertEqual(session.transcript, [(0.0, 1.0, " one.")])
+        self.assertAlmostEqual(session.timestamp_offset, 1.0)
+
+    def test_without_cascade_every_pass_runs_on_the_main_model(self):
+        final = FakeModel([[make_segment(0.0, 1.0, " one."), make_segment(1.0, 2.0, " two")]])
+        session = make_session(final, policy="segments")
+        session.add_frames(np.zeros(2 * RATE, dtype=np.float32))
+
+        self.assertEqual(run_pass(session), (1.0, 2.0, " two"))
+        self.assertEqual(final.calls, [2.0])
+        self.assertEqual(session.transcript, [(0.0, 1.0, " one.")])
+
+
+if __name__ == "__main__":
+    unittest.main()
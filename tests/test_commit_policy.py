@@ -0,0 +1,102 @@
+import unittest
+from typing import NamedTuple
+
+from whisper_live.commit_policy import LocalAgreement, segment_words
+from whisper_live.transcriber import Word
+
+
+class Segment(NamedTuple):
+    start: float
+    end: float
+    text: str
+    words: list = None
+
+
+def texts(words):
+    return [word.text.strip() for word in words]
+
+
+class TestSegmentWords(unittest.TestCase):
+    def test_times_are_spread_over_the_words(self):
+        words = segment_words(Segment(1.0, 2.0, " ab abc"), offset=10.0, duration=5.0)
+        self.assertEqual(texts(words), ["ab", "abc"])
+        self.assertAlmostEqual(words[0].start, 11.0)
+        self.assertAlmostEqual(words[0].end, 11.0 + 3 / 7)
+        self.assertAlmostEqual(words[1].end, 12.0)
+
+    def test_segment_end_is_clipped_to_the_window(self):
+        words = segment_words(Segment(0.0, 3.0, " one"), offset=0.0, duration=2.0)
+        self.assertAlmostEqual(words[-1].end, 2.0)
+
+
+class TestLocalAgreement(unittest.TestCase):
+    def test_commits_the_common_prefix_of_two_passes(self):
+        policy = LocalAgreement()
+        update = policy.update([Segment(0.0, 1.0, " the quick bro")], offset=5.0, duration=1.0)
+        self.assertEqual(update.committed, [])
+        self.assertEqual(texts(update.tentative), ["the", "quick", "bro"])
+
+        update = policy.update([Segment(0.0, 1.5, " The quick brown fox")], offset=5.0, duration=1.5)
+        self.assertEqual(texts(update.committed), ["The", "quick"])
+        self.assertEqual(texts(update.tentative), ["brown", "fox"])
+        self.assertIsNone(update.trim)
+
+        # committed words are skipped, only the new words need to agree
+        update = policy.update([Segment(0.0, 2.0, " the quick brown fox jumps")], offset=5.0, duration=2.0)
+        self.assertEqual(texts(update.committed), ["brown", "fox"])
+        self.assertEqual(texts(update.tentative), ["jumps"])
+
+    def test_fully_committed_segments_are_trimmed(self):
+        policy = LocalAgreement()
+        segments = [Segment(0.0, 1.2, " hello there."), Segment(1.5, 2.0, " how")]
+        policy.update(segments, offset=3.0, duration=2.0)
+        update = policy.update(segments[:1] + [Segment(1.5, 2.5, " how are")], offset=3.0, duration=2.5)
+        self.assertEqual(texts(update.committed), ["hello", "there.", "how"])
+        self.assertAlmostEqual(update.trim, 4.2)
+        # "how" stays committed while its segment is still in the window
+        self.assertEqual(texts(policy.committed), ["how"])
+
+        update = policy.update([Segment(0.3, 1.3, " how are you")], offset=4.2, duration=1.3)
+        self.assertEqual(texts(update.committed), ["are"])
+        self.assertEqual(texts(update.tentative), ["you"])
+
+    def test_rephrased_committed_words_are_skipped_by_time(self):
+        policy = LocalAgreement()
+        policy.update([Segment(0.0, 1.5, " one two thr")], offset=0.0, duration=1.5)
+        policy.update([Segment(0.0, 1.5, " one two three")], offset=0.0, duration=1.5)
+        self.assertEqual(texts(policy.committed), ["one", "two"])
+        update = policy.update([Segment(0.0, 0.9, " 1 2"), Segment(1.0, 2.0, " three four")], offset=0.0, duration=2.0)
+        self.assertEqual(texts(update.committed), ["three"])
+        self.assertEqual(texts(update.tentative), ["four"])
+        self.assertAlmostEqual(update.trim, 0.9)
+
+    def test_final_pass_commits_everything(self):
+        policy = LocalAgreement()
+        policy.update([Segment(0.0, 1.0, " good")], offset=0.0, duration=1.0)
+        update = policy.update([Segment(0.0, 1.4, " goodbye")], offset=0.0, duration=1.5, final=True)
+        self.assertEqual(texts(update.committed), ["goodbye"])
+        self.assertAlmostEqual(update.trim, 1.4)
+        self.assertEqual(policy.committed, [])
+        self.assertEqual(policy.hypotheses, [])
+
+    def test_aligned_words_are_trimmed_between_words(self):
+        policy = LocalAgreement()
+        words = [Word(0.1, 0.5, " see", 0.9), Word(0.6, 0.9, " you", 0.8), Word(1.0, 1.2, " la", 0.4)]
+        policy.update([Segment(0.1, 1.2, " see you la", words)], offset=10.0, duration=1.2)
+        words[2] = Word(1.0, 1.5, " later", 0.9)
+        update = policy.update([Segment(0.1, 1.5, " see you later", words)], offset=10.0, duration=1.5)
+        self.assertEqual(texts(update.committed), ["see", "you"])
+        self.assertEqual(update.committed[1], (10.6, 10.9, " you", 0.8))
+        self.assertAlmostEqual(update.trim, 10.95)
+        self.assertEqual(policy.committed, [])
+
+    def test_agreement_of_three_passes(self):
+        policy = LocalAgreement(agreement=3)
+        policy.update([Segment(0.0, 1.0, " a b")], offset=0.0, duration=1.0)
+        self.assertEqual(policy.update([Segment(0.0, 1.0, " a b c")], offset=0.0, duration=1.0).committed, [])
+        update = policy.update([Segment(0.0, 1.0, " a x")], offset=0.0, duration=1.0)
+        self.assertEqual(texts(update.committed), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
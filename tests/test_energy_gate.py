@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from whisper_live.energy_gate import EnergyGate, GateOptions
+
+RATE = 16000
+WINDOW = 512
+
+
+def windows_of(audio):
+    return audio[: len(audio) // WINDOW * WINDOW].reshape(-1, WINDOW)
+
+
+def noise(seconds, level, seed=0):
+    return (np.random.default_rng(seed).standard_normal(int(seconds * RATE)) * level).astype(np.float32)
+
+
+def voiced(seconds, level):
+    """Harmonic signal with a 150 Hz pitch, tonal like voiced speech."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    signal = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 20))
+    return (signal / np.abs(signal).max() * level).astype(np.float32)
+
+
+class TestEnergyGate(unittest.TestCase):
+    def test_digital_silence_and_noise_floor_are_silent(self):
+        self.assertTrue(EnergyGate()(windows_of(np.zeros(RATE, dtype=np.float32))).all())
+        # room noise well above the absolute silence level, once the floor rose to it
+        silent = EnergyGate()(windows_of(noise(15.0, 0.01)))
+        self.assertFalse(silent[:100].any())
+        self.assertGreater(silent[-150:].mean(), 0.95)
+
+    def test_speech_and_hangover_are_passed_on(self):
+        gate = EnergyGate(GateOptions(hangover_ms=320))
+        gate(windows_of(noise(10.0, 0.005, 3)))
+        audio = np.concatenate([noise(1.0, 0.005), voiced(0.5, 0.3) + noise(0.5, 0.005, 1), noise(1.0, 0.005, 2)])
+        silent = gate(windows_of(audio))
+        speech = slice(RATE // WINDOW, int(1.5 * RATE) // WINDOW)
+        self.assertFalse(silent[speech].any())
+        # the 10 windows after the speech are left to the neural VAD
+        end = int(1.5 * RATE) // WINDOW + 1
+        self.assertFalse(silent[end:end + 9].any())
+        self.assertTrue(silent[end + 12:].all())
+
+    def test_quiet_tonal_audio_is_borderline(self):
+        gate = EnergyGate()
+        gate(windows_of(noise(15.0, 0.01)))
+        # as loud as the noise floor, but tonal: left to the neural VAD
+        self.assertFalse(gate(windows_of(voiced(0.5, 0.015))).any())
+
+    def test_noise_floor_follows_louder_noise(self):
+        gate = EnergyGate(GateOptions(floor_rise_db=5.0))
+        gate(windows_of(noise(2.0, 0.001)))
+        # 26 dB louder noise: borderline at first, silent once the floor caught up
+        silent = gate(windows_of(noise(8.0, 0.02, 1)))
+        self.assertFalse(silent[:10].any())
+        self.assertGreater(silent[-50:].mean(), 0.95)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor as ReferenceFeatureExtractor
+
+from whisper_live.feature_extractor import (
+    NumpyFeatureExtractor,
+    TorchFeatureExtractor,
+    get_feature_extractor,
+)
+
+RATE = 16000
+LENGTHS = [0, 150, 250, 1 * RATE, 7 * RATE + 77, 30 * RATE]
+
+
+def make_audio(samples, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) / RATE
+    tone = sum(np.sin(2 * np.pi * 220 * k * t) / k for k in range(1, 8))
+    return (tone * 0.1 + rng.standard_normal(samples) * 0.01).astype(np.float32)
+
+
+class TestNumpyFeatureExtractor(unittest.TestCase):
+    def setUp(self):
+        self.reference = ReferenceFeatureExtractor(feature_size=80)
+        self.extractor = NumpyFeatureExtractor(feature_size=80)
+
+    def test_matches_faster_whisper(self):
+        for samples in LENGTHS:
+            audio = make_audio(samples)
+            expected = self.reference(audio)
+            features = self.extractor(audio)
+            self.assertEqual(features.shape, expected.shape)
+            np.testing.assert_allclose(features, expected, atol=1e-5)
+
+    def test_without_padding(self):
+        for samples in LENGTHS[3:]:
+            audio = make_audio(samples)
+            np.testing.assert_allclose(self.extractor(audio, padding=False), self.reference(audio, padding=False), atol=1e-5)
+
+    def test_chunk_length(self):
+        audio = make_audio(3 * RATE)
+        features = self.extractor(audio, chunk_length=10)
+        self.assertEqual(features.shape, (80, 300 + 1000))
+        self.assertEqual(self.extractor.nb_max_frames, 1000)
+
+    def test_configuration_is_shared(self):
+        other = get_feature_extractor("numpy", feature_size=80)
+        self.assertIs(other.mel_filters, self.extractor.mel_filters)
+        self.assertIs(other.window, self.extractor.window)
+        self.assertFalse(self.extractor.mel_filters.flags.writeable)
+        np.testing.assert_allclose(self.extractor.mel_filters, self.reference.mel_filters, atol=1e-6)
+        self.assertEqual(NumpyFeatureExtractor(feature_size=128).mel_filters.shape, (128, 201))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_feature_extractor("cupy")
+
+
+class TestTorchFeatureExtractor(unittest.TestCase):
+    def test_matches_numpy_backend(self):
+        extractor = TorchFeatureExtractor(device="cpu", feature_size=80)
+        numpy_extractor = NumpyFeatureExtractor(feature_size=80)
+        for samples in LENGTHS[2:]:
+            audio = make_audio(samples)
+            features = extractor(audio)
+            expected = numpy_extractor(audio)
+            self.assertEqual(features.shape, expected.shape)
+            # torch reflects the first frame about the whole signal, faster_whisper about its window
+            np.testing.assert_allclose(features[:, 1:], expected[:, 1:], atol=1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
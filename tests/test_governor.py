@@ -0,0 +1,72 @@
+import unittest
+
+from whisper_live.governor import DECODING_LEVELS, DecodingGovernor, GovernorOptions, LoadSample
+
+IDLE = LoadSample(max_lag=0.0, queued=0, busy_seconds=0.0)
+
+
+class TestDecodingGovernor(unittest.TestCase):
+    def make_governor(self, capacity=1, **options):
+        self.samples = []
+        return DecodingGovernor(lambda: self.samples.pop(0), capacity=capacity, options=GovernorOptions(**options))
+
+    def test_steps_down_on_lag_and_logs_the_reason(self):
+        governor = self.make_governor()
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertEqual(governor.update(LoadSample(5.0, 0, 0.0), now=0.0), -1)
+        self.assertEqual(governor.current.name, "reduced")
+        self.assertIn("session lag 5.0s", logs.output[0])
+
+    def test_holds_the_level_for_an_interval(self):
+        governor = self.make_governor(interval=2.0)
+        governor.update(LoadSample(5.0, 0, 0.0), now=0.0)
+        self.assertEqual(governor.update(LoadSample(5.0, 0, 0.0), now=1.0), 0)
+        self.assertEqual(governor.update(LoadSample(5.0, 0, 0.0), now=2.0), -1)
+        self.assertEqual(governor.current.name, "greedy")
+        governor.update(LoadSample(5.0, 0, 0.0), now=4.0)
+        # the cheapest level is the floor
+        self.assertEqual(governor.update(LoadSample(5.0, 0, 0.0), now=6.0), 0)
+        self.assertEqual(governor.level, len(DECODING_LEVELS) - 1)
+
+    def test_utilization_is_per_replica(self):
+        governor = self.make_governor(capacity=2)
+        governor.update(IDLE, now=0.0)
+        # 3.8 busy seconds over 2 seconds and 2 replicas
+        self.assertEqual(governor.update(LoadSample(0.0, 0, 3.8), now=2.0), -1)
+        self.assertAlmostEqual(governor.utilization, 0.95)
+        self.assertEqual(governor.update(LoadSample(0.0, 0, 5.0), now=4.0), 0)
+        self.assertAlmostEqual(governor.utilization, 0.3)
+
+    def test_queue_is_per_replica(self):
+        governor = self.make_governor(capacity=2, high_queue=2.0)
+        self.assertEqual(governor.update(LoadSample(0.0, 4, 0.0), now=0.0), 0)
+        self.assertEqual(governor.update(LoadSample(0.0, 5, 0.0), now=1.0), -1)
+
+    def test_recovers_after_low_load(self):
+        governor = self.make_governor(recovery=10.0)
+        governor.update(LoadSample(5.0, 0, 0.0), now=0.0)
+        governor.update(IDLE, now=2.0)
+        self.assertEqual(governor.update(IDLE, now=11.0), 0)
+        # moderate load restarts the recovery period
+        governor.update(LoadSample(2.0, 0, 0.0), now=11.5)
+        self.assertEqual(governor.update(IDLE, now=12.0), 0)
+        self.assertEqual(governor.update(IDLE, now=22.0), 1)
+        self.assertEqual(governor.current.name, "full")
+        self.assertEqual(governor.get_status()["step_ups"], 1)
+
+    def test_decode_options_sample_once_per_interval(self):
+        governor = self.make_governor(interval=2.0)
+        self.samples = [LoadSample(5.0, 0, 0.0)]
+        with self.assertLogs(level="WARNING"):
+            options = governor.decode_options(now=0.0)
+        self.assertEqual(options["beam_size"], DECODING_LEVELS[1].beam_size)
+        self.assertEqual(options["temperature"], list(DECODING_LEVELS[1].temperatures))
+        # no sample is due yet, the list of samples is empty
+        self.assertEqual(governor.decode_options(now=1.0), options)
+        self.samples = [IDLE]
+        governor.decode_options(now=2.5)
+        self.assertEqual(self.samples, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
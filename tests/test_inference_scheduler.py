@@ -0,0 +1,137 @@
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.inference_scheduler import InferenceScheduler
+from whisper_live.transcriber import TranscriptionRequest
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.batch_sizes = []
+        self.order = []
+        self.release = threading.Event()
+
+    def transcribe_batch(self, requests):
+        self.release.wait()
+        self.batch_sizes.append(len(requests))
+        self.order.extend(request.language for request in requests)
+        return [(float(request.audio[0]), request.language) for request in requests]
+
+
+class TestInferenceScheduler(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = FakeTranscriber()
+        self.scheduler = InferenceScheduler(self.transcriber, max_batch_size=3, max_wait=0.05)
+
+    def tearDown(self):
+        self.transcriber.release.set()
+        self.scheduler.stop()
+
+    def test_pending_windows_are_batched_and_routed(self):
+        futures = [
+            self.scheduler.submit(TranscriptionRequest(np.full(16, i, dtype=np.float32), language=str(i)))
+            for i in range(5)
+        ]
+        self.transcriber.release.set()
+        self.scheduler.start()
+
+        results = [future.result(timeout=5) for future in futures]
+        self.assertEqual(results, [(float(i), str(i)) for i in range(5)])
+        self.assertEqual(self.transcriber.batch_sizes, [3, 2])
+
+    def test_errors_reach_every_session_of_the_batch(self):
+        def fail(requests):
+            raise RuntimeError("model failure")
+
+        self.transcriber.transcribe_batch = fail
+        futures = [self.scheduler.submit(TranscriptionRequest(np.zeros(16, dtype=np.float32))) for _ in range(2)]
+        self.scheduler.start()
+
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=5)
+
+    def test_governor_options_reach_the_batch(self):
+        options = []
+
+        def transcribe_batch(requests, **kwargs):
+            options.append(kwargs)
+            return [(None, None)] * len(requests)
+
+        self.transcriber.transcribe_batch = transcribe_batch
+        governor = mock.Mock(decode_options=mock.Mock(return_value={"beam_size": 1, "temperature": [0.0]}))
+        scheduler = InferenceScheduler(
+            self.transcriber, max_batch_size=2, max_wait=0.01, transcribe_options={"temperature": [0.0, 0.5]},
+            governor=governor)
+        future = scheduler.submit(TranscriptionRequest(np.zeros(16, dtype=np.float32)))
+        scheduler.start()
+        try:
+            future.result(timeout=5)
+        finally:
+            scheduler.stop()
+        # explicit transcribe options win over the governor
+        self.assertEqual(options, [{"beam_size": 1, "temperature": [0.0, 0.5]}])
+
+    def test_stop_cancels_pending_windows(self):
+        future = self.scheduler.submit(TranscriptionRequest(np.zeros(16, dtype=np.float32)))
+        self.scheduler.stop()
+        self.assertTrue(future.cancelled())
+
+
+class TestDeadlineScheduling(unittest.TestCase):
+    def setUp(self):
+        self.transcriber = FakeTranscriber()
+        self.transcriber.release.set()
+        self.scheduler = InferenceScheduler(self.transcriber, max_batch_size=1, max_wait=0.0)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def submit(self, session_uid, lag=0.0):
+        return self.scheduler.submit(
+            TranscriptionRequest(np.zeros(16, dtype=np.float32), language=session_uid),
+            session_uid=session_uid,
+            lag=lag,
+        )
+
+    def test_lagging_session_is_served_first(self):
+        self.scheduler.register_session("a")
+        self.scheduler.register_session("b")
+        futures = [self.submit("a", lag=0.5), self.submit("b", lag=12.0)]
+        self.scheduler.start()
+        for future in futures:
+            future.result(timeout=5)
+
+        self.assertEqual(self.transcriber.order, ["b", "a"])
+        sessions = self.scheduler.get_status()["sessions"]
+        self.assertEqual(sessions["a"]["skipped_batches"], 1)
+        self.assertEqual(sessions["b"]["skipped_batches"], 0)
+        self.assertEqual(sessions["b"]["max_lag"], 12.0)
+        self.assertEqual(sessions["b"]["deadline_misses"], 1)
+
+    def test_priority_class_orders_equal_lag(self):
+        self.scheduler.register_session("low", priority="low")
+        self.scheduler.register_session("high", priority="high")
+        futures = [self.submit("low"), self.submit("high")]
+        self.scheduler.start()
+        for future in futures:
+            future.result(timeout=5)
+
+        self.assertEqual(self.transcriber.order, ["high", "low"])
+
+    def test_unknown_priority_class(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.register_session("a", priority="urgent")
+
+    def test_dropped_audio_is_counted(self):
+        self.scheduler.register_session("a")
+        self.scheduler.record_dropped_audio("a", 20.0)
+        self.scheduler.record_dropped_audio("unknown", 1.0)
+        self.assertEqual(self.scheduler.get_status()["sessions"]["a"]["dropped_audio"], 20.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from whisper_live.language_cache import LanguageCache
+
+
+def probs(**languages):
+    return sorted(languages.items(), key=lambda item: -item[1])
+
+
+class TestLanguageCache(unittest.TestCase):
+    def test_settles_once_the_mean_converges(self):
+        cache = LanguageCache(threshold=0.5, min_windows=3)
+        self.assertIsNone(cache.update("de", 0.6, probs(de=0.6, nl=0.4)))
+        self.assertIsNone(cache.update("nl", 0.55, probs(nl=0.55, de=0.45)))
+        self.assertIsNone(cache.language)
+        self.assertEqual(cache.update("de", 0.7, probs(de=0.7, nl=0.3)), "de")
+        self.assertAlmostEqual(cache.probability, (0.6 + 0.45 + 0.7) / 3)
+        # settled: later windows change nothing
+        self.assertIsNone(cache.update("nl", 0.99, probs(nl=0.99, de=0.01)))
+        self.assertEqual(cache.language, "de")
+        self.assertEqual(cache.windows, 3)
+
+    def test_confident_window_settles_at_once(self):
+        cache = LanguageCache(confident=0.9)
+        self.assertEqual(cache.update("fr", 0.95, probs(fr=0.95, en=0.05)), "fr")
+
+    def test_ambiguous_windows_settle_on_the_leader_eventually(self):
+        cache = LanguageCache(threshold=0.5, min_windows=3, max_windows=5)
+        for _ in range(4):
+            self.assertIsNone(cache.update("de", 0.4, probs(de=0.4, nl=0.35, en=0.25)))
+        self.assertEqual(cache.to_dict()["candidate"], "de")
+        self.assertEqual(cache.update("nl", 0.4, probs(nl=0.4, de=0.35, en=0.25)), "de")
+
+    def test_given_language_is_taken_as_is(self):
+        cache = LanguageCache()
+        self.assertEqual(cache.update("ar", 1, None), "ar")
+        self.assertEqual(cache.windows, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from whisper_live.model_pool import ModelPool
+
+
+class TestModelPool(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("whisper_live.model_pool.WhisperModel", side_effect=lambda *args, **kwargs: mock.Mock())
+        self.whisper_model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = ModelPool("tiny", replicas=3, cpu_threads=2, device="cpu")
+
+    def test_replicas_get_their_own_thread_budget(self):
+        self.assertEqual(self.whisper_model.call_count, 3)
+        for call in self.whisper_model.call_args_list:
+            self.assertEqual(call.kwargs["cpu_threads"], 2)
+            self.assertEqual(call.kwargs["device"], "cpu")
+        self.assertEqual(self.pool.capacity, 3)
+
+    def test_replicas_are_loaded_on_their_cores(self):
+        with mock.patch("whisper_live.model_pool.pinned") as pinned:
+            ModelPool("tiny", replicas=2, core_sets=[(0, 1), (2, 3)])
+        self.assertEqual([call.args for call in pinned.call_args_list], [((0, 1),), ((2, 3),)])
+
+    def test_dispatch_to_least_loaded_replica(self):
+        with self.pool.acquire() as first, self.pool.acquire() as second, self.pool.acquire() as third:
+            self.assertEqual(len({id(first), id(second), id(third)}), 3)
+            self.assertEqual([replica["active"] for replica in self.pool.get_status()], [1, 1, 1])
+        self.assertEqual([replica["active"] for replica in self.pool.get_status()], [0, 0, 0])
+
+    def test_utilization(self):
+        release = threading.Event()
+
+        def transcribe(audio, **kwargs):
+            release.wait()
+            return None, None
+
+        self.pool.replicas[0].model.transcribe.side_effect = transcribe
+        thread = threading.Thread(target=self.pool.transcribe, args=(None,))
+        thread.start()
+        try:
+            while self.pool.replicas[0].active == 0:
+                time.sleep(0.001)
+            time.sleep(0.01)
+            status = self.pool.get_status()
+            self.assertEqual(status[0]["active"], 1)
+            self.assertGreater(status[0]["busy_seconds"], 0)
+        finally:
+            release.set()
+            thread.join()
+
+        status = self.pool.get_status()
+        self.assertEqual([replica["calls"] for replica in status], [1, 0, 0])
+        self.assertEqual(status[1]["utilization"], 0)
+        self.assertLessEqual(status[0]["utilization"], 1)
+        self.assertAlmostEqual(self.pool.get_busy_seconds(), self.pool.replicas[0].busy_time)
+
+    def test_fallback_stats_are_summed(self):
+        for index, replica in enumerate(self.pool.replicas):
+            replica.model.get_fallback_stats.return_value = {
+                "temperatures": {"0.0": 10, "0.2": index},
+                "fallback_seconds": 0.5,
+                "deadline_stops": index,
+                "attempt_cap_stops": 1,
+            }
+        stats = self.pool.get_fallback_stats()
+        self.assertEqual(stats["temperatures"], {"0.0": 30, "0.2": 3})
+        self.assertEqual(stats["fallback_seconds"], 1.5)
+        self.assertEqual(stats["deadline_stops"], 3)
+        self.assertEqual(stats["attempt_cap_stops"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.offline import (
+    AudioChunk,
+    FileTranscript,
+    OfflineStats,
+    OfflineTranscriber,
+    find_audio_files,
+    split_speech,
+    write_outputs,
+)
+from whisper_live.transcriber import Segment, TranscriptionInfo, Word
+
+RATE = 16000
+
+
+def make_segment(start, end, text, words=None):
+    return Segment(0, 0, start, end, text, [], 0.0, -0.1, 1.0, 0.01, words)
+
+
+class FakeModel:
+    """Transcribes every chunk as one segment spanning its speech."""
+
+    def __init__(self):
+        self.feature_extractor = mock.Mock(sampling_rate=RATE)
+        self.batches = []
+
+    def transcribe_batch(self, requests, **kwargs):
+        self.batches.append((len(requests), kwargs))
+        results = []
+        for request in requests:
+            chunks = request.speech_chunks
+            speech = sum(chunk["end"] - chunk["start"] for chunk in chunks) / RATE
+            info = TranscriptionInfo("en", 1, len(request.audio) / RATE, speech, None, None, None)
+            segment = make_segment(chunks[0]["start"] / RATE, chunks[-1]["end"] / RATE, f" {request.audio[0]:.0f}")
+            results.append(([segment], info))
+        return results
+
+
+class TestSplitSpeech(unittest.TestCase):
+    def test_speech_is_grouped_up_to_the_chunk_length(self):
+        speech = [{"start": 0, "end": 10 * RATE}, {"start": 15 * RATE, "end": 30 * RATE}, {"start": 40 * RATE, "end": 50 * RATE}]
+        chunks = split_speech(speech, chunk_length=30, sampling_rate=RATE)
+        # the silence between the speech of a chunk does not count
+        self.assertEqual(chunks[0], AudioChunk(0, 30 * RATE, [{"start": 0, "end": 10 * RATE}, {"start": 15 * RATE, "end": 30 * RATE}]))
+        self.assertEqual(chunks[1], AudioChunk(40 * RATE, 50 * RATE, [{"start": 0, "end": 10 * RATE}]))
+
+    def test_long_speech_is_cut(self):
+        chunks = split_speech([{"start": RATE, "end": 71 * RATE}], chunk_length=30, sampling_rate=RATE)
+        self.assertEqual([(chunk.start, chunk.end) for chunk in chunks], [(RATE, 31 * RATE), (31 * RATE, 61 * RATE), (61 * RATE, 71 * RATE)])
+
+    def test_no_speech(self):
+        self.assertEqual(split_speech([]), [])
+
+
+class TestOfflineTranscriber(unittest.TestCase):
+    def setUp(self):
+        # every file is 100 s of audio whose samples hold the index of the file
+        self.files = {f"file{index}.wav": np.full(100 * RATE, index, dtype=np.float32) for index in range(1, 4)}
+        self.speech = {
+            "file1.wav": [{"start": 0, "end": 20 * RATE}, {"start": 30 * RATE, "end": 50 * RATE}],
+            "file2.wav": [],
+            "file3.wav": [{"start": 60 * RATE, "end": 70 * RATE}],
+        }
+        patches = [
+            mock.patch("whisper_live.offline.decode_audio", side_effect=lambda path, sampling_rate: self.files[path]),
+            mock.patch(
+                "whisper_live.offline.get_speech_timestamps",
+                side_effect=lambda audio, options: self.speech[self.loading],
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def transcribe(self, paths, **kwargs):
+        model = FakeModel()
+        transcriber = OfflineTranscriber(model, workers=1, **kwargs)
+        load = transcriber.load
+
+        def load_file(path):
+            self.loading = path
+            return load(path)
+
+        transcriber.load = load_file
+        return model, list(transcriber.transcribe_files(paths))
+
+    def test_chunks_of_several_files_share_a_batch(self):
+        model, transcripts = self.transcribe(list(self.files), batch_size=4, transcribe_options={"beam_size": 1})
+        self.assertEqual(model.batches, [(3, {"beam_size": 1})])
+        self.assertEqual([transcript.path for transcript in transcripts], list(self.files))
+
+        first = transcripts[0]
+        self.assertEqual(first.duration, 100)
+        self.assertEqual(first.duration_after_vad, 40)
+        self.assertEqual(first.language, "en")
+        self.assertEqual([(segment.start, segment.end) for segment in first.segments], [(0, 20), (30, 50)])
+        self.assertEqual([segment.id for segment in first.segments], [1, 2])
+
+        self.assertEqual(transcripts[1].segments, [])
+        self.assertIsNone(transcripts[1].language)
+        # segment times are relative to the file, not to the chunk
+        self.assertEqual([(segment.start, segment.end, segment.text) for segment in transcripts[2].segments], [(60, 70, " 3")])
+
+    def test_batch_size_bounds_the_model_calls(self):
+        model, transcripts = self.transcribe(list(self.files), batch_size=2)
+        self.assertEqual([size for size, _ in model.batches], [2, 1])
+        self.assertEqual(len(transcripts), 3)
+
+    def test_files_that_fail_to_load_are_skipped(self):
+        del self.files["file2.wav"]
+        with self.assertLogs(level="ERROR"):
+            _, transcripts = self.transcribe(["file1.wav", "file2.wav", "file3.wav"])
+        self.assertEqual([transcript.path for transcript in transcripts], ["file1.wav", "file3.wav"])
+
+
+class TestOutputs(unittest.TestCase):
+    def test_srt_and_json(self):
+        words = [Word(61.0, 61.5, " hello", 0.9), Word(61.6, 62.25, " there.", 0.8)]
+        transcript = FileTranscript(
+            "in/talk.flac", 3700.0, 2.0, "en", [make_segment(0.5, 1.25, " Hi."), make_segment(61.0, 62.25, " hello there.", words)]
+        )
+        with tempfile.TemporaryDirectory() as output_dir:
+            written = write_outputs(transcript, output_dir)
+            self.assertEqual(written, [os.path.join(output_dir, "talk.srt"), os.path.join(output_dir, "talk.json")])
+            with open(written[0], encoding="utf-8") as srt_file:
+                self.assertEqual(
+                    srt_file.read(),
+                    "1\n00:00:00,500 --> 00:00:01,250\nHi.\n\n2\n00:01:01,000 --> 00:01:02,250\nhello there.\n\n",
+                )
+            with open(written[1], encoding="utf-8") as json_file:
+                output = json.load(json_file)
+        self.assertEqual(output["language"], "en")
+        self.assertEqual(output["segments"][0], {"start": 0.5, "end": 1.25, "text": "Hi."})
+        self.assertEqual(output["segments"][1]["words"][1], {"start": 61.6, "end": 62.25, "word": " there.", "probability": 0.8})
+
+    def test_audio_files_of_directories(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "b"))
+            for name in ("a.wav", "notes.txt", os.path.join("b", "c.MP3")):
+                open(os.path.join(directory, name), "w").close()
+            self.assertEqual(
+                find_audio_files([directory, "single.ogg"]),
+                [os.path.join(directory, "a.wav"), os.path.join(directory, "b", "c.MP3"), "single.ogg"],
+            )
+
+    def test_throughput_in_audio_hours_per_hour(self):
+        stats = OfflineStats()
+        stats.record(mock.Mock(duration=7200.0, duration_after_vad=3600.0))
+        status = stats.to_dict(now=stats.start_time + 60.0)
+        self.assertEqual(status["audio_hours"], 2.0)
+        self.assertEqual(status["audio_hours_per_hour"], 120.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from whisper_live.protocol import (
+    FRAME_HEADER,
+    SAMPLE_FORMAT_FLOAT32,
+    SAMPLE_FORMAT_INT16,
+    AudioFrame,
+    ControlFrame,
+    ProtocolError,
+    decode_frame,
+    encode_audio_frame,
+    encode_control_frame,
+    is_binary_frame,
+    to_float32,
+)
+
+
+class TestAudioFrames(unittest.TestCase):
+    def test_float32_roundtrip_is_zero_copy(self):
+        samples = np.linspace(-1, 1, 4096, dtype=np.float32)
+        data = encode_audio_frame(samples, sequence=7)
+
+        self.assertTrue(is_binary_frame(data))
+        self.assertEqual(len(data), FRAME_HEADER.size + samples.nbytes)
+
+        frame = decode_frame(data)
+        self.assertIsInstance(frame, AudioFrame)
+        self.assertEqual(frame.sequence, 7)
+        self.assertEqual(frame.sample_rate, 16000)
+        self.assertEqual(frame.sample_format, SAMPLE_FORMAT_FLOAT32)
+        np.testing.assert_array_equal(to_float32(frame), samples)
+        self.assertFalse(frame.samples.flags.owndata)
+
+    def test_int16_roundtrip(self):
+        samples = np.array([-32768, -1, 0, 1, 32767], dtype=np.int16)
+        frame = decode_frame(encode_audio_frame(samples, sequence=1))
+
+        self.assertEqual(frame.sample_format, SAMPLE_FORMAT_INT16)
+        np.testing.assert_array_equal(frame.samples, samples)
+        np.testing.assert_allclose(to_float32(frame), samples / 32768.0)
+
+    def test_sequence_wraps(self):
+        frame = decode_frame(encode_audio_frame(np.zeros(4, dtype=np.float32), sequence=2**32 + 3))
+        self.assertEqual(frame.sequence, 3)
+
+    def test_invalid_frames(self):
+        with self.assertRaises(ProtocolError):
+            decode_frame(b"WL")
+        data = bytearray(encode_audio_frame(np.zeros(4, dtype=np.float32), sequence=0))
+        data[2] = 99
+        with self.assertRaises(ProtocolError):
+            decode_frame(bytes(data))
+        with self.assertRaises(ProtocolError):
+            decode_frame(encode_audio_frame(np.zeros(4, dtype=np.float32), sequence=0) + b"\x00")
+
+    def test_json_packets_are_not_binary_frames(self):
+        self.assertFalse(is_binary_frame(b'{"audio": ""}'))
+        self.assertFalse(is_binary_frame('{"audio": ""}'))
+
+
+class TestControlFrames(unittest.TestCase):
+    def test_roundtrip(self):
+        frame = decode_frame(encode_control_frame(3, "ar", ["en", "fr"]))
+        self.assertIsInstance(frame, ControlFrame)
+        self.assertEqual(frame.sequence, 3)
+        self.assertEqual(frame.speaker_lang, "ar")
+        self.assertEqual(frame.all_langs, ["en", "fr"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+from whisper_live.resource_plan import EngineResources, available_cores, pinned, plan_resources
+from whisper_live.server import TranscriptionServer
+
+
+class TestPlanResources(unittest.TestCase):
+    def test_engines_get_their_own_cores(self):
+        plan = plan_resources(replicas=2, num_workers=2, vad_sessions=2, vad_cores=2, feature_cores=2, cores=range(16))
+        self.assertEqual(plan.replicas, (EngineResources((0, 1, 2, 3, 4, 5), 3, 2), EngineResources((6, 7, 8, 9, 10, 11), 3, 2)))
+        self.assertEqual(plan.features, EngineResources((12, 13), 2))
+        self.assertEqual(plan.vad, EngineResources((14, 15), 1))
+        self.assertEqual(plan.asr.cores, tuple(range(12)))
+        self.assertEqual((plan.drafts, plan.draft), ((), None))
+        self.assertEqual(plan.to_dict()["vad"], {"cores": [14, 15], "threads": 1, "workers": 1})
+
+    def test_shared_engines_get_a_single_thread(self):
+        plan = plan_resources(replicas=1, cores=[0, 2, 4, 6])
+        self.assertEqual(plan.replicas, (EngineResources((0, 2, 4), 3),))
+        self.assertEqual(plan.translation, EngineResources((0, 2, 4), 1))
+        self.assertEqual(plan.features, EngineResources((0, 2, 4), 1))
+        self.assertEqual(plan.vad.cores, (6,))
+
+    def test_draft_replicas_get_half_of_every_block(self):
+        plan = plan_resources(replicas=2, num_workers=1, cascade=True, cores=range(8))
+        self.assertEqual(plan.replicas, (EngineResources((0, 1), 2), EngineResources((3, 4), 2)))
+        self.assertEqual(plan.drafts, (EngineResources((2,), 1), EngineResources((5, 6), 2)))
+        self.assertEqual(plan.draft, EngineResources((2, 5, 6), 1))
+        # a single core is shared by the replica and its draft
+        plan = plan_resources(cascade=True, cores=range(2))
+        self.assertEqual((plan.replicas, plan.drafts), ((EngineResources((0,), 1),), (EngineResources((0,), 1),)))
+
+    def test_every_replica_needs_a_core(self):
+        with self.assertRaises(ValueError):
+            plan_resources(replicas=3, vad_cores=2, cores=range(4))
+        with self.assertRaises(ValueError):
+            plan_resources(vad_cores=0, cores=range(4))
+
+    def test_every_worker_needs_a_core(self):
+        with self.assertRaises(ValueError):
+            plan_resources(num_workers=4, cores=range(4))
+        with self.assertRaises(ValueError):
+            plan_resources(num_workers=2, cascade=True, cores=range(4))
+
+
+class TestServerPlan(unittest.TestCase):
+    def make_server(self, **kwargs):
+        with mock.patch("whisper_live.resource_plan.available_cores", return_value=list(range(8))), \
+                mock.patch("whisper_live.server.LoadBalancedTranslator"):
+            return TranscriptionServer(pin_cores=True, **kwargs)
+
+    def test_thread_counts_follow_the_plan(self):
+        server = self.make_server(replicas=2, vad_sessions=1, vad_cores=2, vad_intra_threads=1)
+        plan = server.resource_plan
+        self.assertEqual(plan.replicas, (EngineResources((0, 1, 2), 3), EngineResources((3, 4, 5), 3)))
+        self.assertEqual(server.cpu_threads, 3)
+        self.assertEqual(server.vad_intra_threads, 2)
+        self.assertEqual(server.get_status()["resources"], plan.to_dict())
+
+    def test_explicit_cpu_threads_are_kept(self):
+        server = self.make_server(cpu_threads=2)
+        self.assertEqual(server.cpu_threads, 2)
+        self.assertEqual(server.resource_plan.replicas, (EngineResources(tuple(range(7)), 2),))
+
+    def test_thread_counts_beyond_the_replica_cores_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.make_server(cpu_threads=4, num_workers=2)
+        with self.assertRaises(ValueError):
+            self.make_server(num_workers=8)
+
+    def test_draft_pool_gets_its_own_cores(self):
+        server = self.make_server(cascade_model="tiny", num_workers=2)
+        with mock.patch("whisper_live.server.ModelPool") as pool, mock.patch("whisper_live.server.InferenceScheduler"):
+            server.create_model(None)
+        (_, main), (_, draft) = [(call.args, call.kwargs) for call in pool.call_args_list]
+        self.assertEqual((main["cpu_threads"], main["num_workers"], main["core_sets"]), (2, 2, [(0, 1, 2, 3)]))
+        self.assertEqual((draft["cpu_threads"], draft["num_workers"], draft["core_sets"]), (1, 2, [(4, 5, 6)]))
+
+
+@unittest.skipUnless(hasattr(os, "sched_setaffinity"), "CPU affinity is not supported")
+class TestPinned(unittest.TestCase):
+    def test_threads_started_within_the_block_keep_the_cores(self):
+        cores = available_cores()
+        affinity = {}
+        with pinned(cores[:1]):
+            thread = threading.Thread(target=lambda: affinity.update(thread=os.sched_getaffinity(0)))
+            thread.start()
+            thread.join()
+        self.assertEqual(affinity["thread"], set(cores[:1]))
+        # the calling thread gets its cores back
+        self.assertEqual(available_cores(), cores)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from whisper_live.ring_buffer import AudioRingBuffer
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = AudioRingBuffer(capacity=10)
+
+    def test_append_and_view(self):
+        self.buffer.append(np.arange(4, dtype=np.float32))
+        self.assertEqual((self.buffer.start, self.buffer.end), (0, 4))
+        np.testing.assert_array_equal(self.buffer.view(1), [1, 2, 3])
+
+    def test_wraparound_keeps_absolute_indexing(self):
+        stream = np.arange(37, dtype=np.float32)
+        for packet in np.array_split(stream, 9):
+            self.buffer.append(packet)
+
+        self.assertEqual((self.buffer.start, self.buffer.end), (27, 37))
+        self.assertEqual(len(self.buffer), 10)
+        np.testing.assert_array_equal(self.buffer.view(27), stream[27:])
+        np.testing.assert_array_equal(self.buffer.view(30, 35), stream[30:35])
+        # ranges before the retained audio are clamped
+        np.testing.assert_array_equal(self.buffer.view(0, 29), stream[27:29])
+
+    def test_views_are_contiguous_and_not_copied(self):
+        self.buffer.append(np.arange(8, dtype=np.float32))
+        self.buffer.append(np.arange(8, 15, dtype=np.float32))
+
+        view = self.buffer.view(6, 15)
+        self.assertTrue(view.flags.c_contiguous)
+        self.assertFalse(view.flags.owndata)
+        self.assertFalse(view.flags.writeable)
+        np.testing.assert_array_equal(view, np.arange(6, 15))
+
+    def test_packet_larger_than_capacity(self):
+        self.buffer.append(np.arange(25, dtype=np.float32))
+        self.assertEqual((self.buffer.start, self.buffer.end), (15, 25))
+        np.testing.assert_array_equal(self.buffer.view(0), np.arange(15, 25))
+
+    def test_empty_ranges(self):
+        self.assertEqual(self.buffer.view(0).shape, (0,))
+        self.buffer.append(np.ones(3, dtype=np.float32))
+        self.assertEqual(self.buffer.view(5).shape, (0,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.client_managers import SpeakerManager
+from whisper_live.serve_client_base import ServeClientBase
+
+RATE = 16000
+# time a blocked loop is given to (wrongly) wake up
+BLOCKED = 0.1
+# upper bound on the time a signalled loop takes to wake up
+WAKE = 2.0
+
+
+def audio(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+class TestWaitForAudio(unittest.TestCase):
+    def setUp(self):
+        self.client = ServeClientBase("uid", mock.Mock(), server=None)
+
+    def start_waiting(self):
+        """Runs `wait_for_audio` in a thread, like the transcription loop."""
+        result = {}
+
+        def wait():
+            result["ready"] = self.client.wait_for_audio()
+            result["time"] = time.monotonic()
+
+        thread = threading.Thread(target=wait, daemon=True)
+        thread.start()
+        return thread, result
+
+    def assert_blocked(self, thread):
+        thread.join(BLOCKED)
+        self.assertTrue(thread.is_alive())
+
+    def assert_woken(self, thread, result, ready=True):
+        thread.join(WAKE)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result["ready"], ready)
+
+    def test_blocks_below_the_minimum_audio(self):
+        thread, result = self.start_waiting()
+        self.client.add_frames(audio(0.5))
+        self.assert_blocked(thread)
+        # crossing min_audio_duration wakes the loop
+        self.client.add_frames(audio(0.6))
+        self.assert_woken(thread, result)
+        self.assertEqual(self.client.processed_end, int(1.1 * RATE))
+
+    def test_blocks_below_the_minimum_new_audio(self):
+        self.client.add_frames(audio(1.0))
+        self.assertTrue(self.client.wait_for_audio(timeout=0))
+        thread, result = self.start_waiting()
+        self.client.add_frames(audio(0.1))
+        self.assert_blocked(thread)
+        self.client.add_frames(audio(0.2))
+        self.assert_woken(thread, result)
+
+    def test_endpoint_wakes_the_loop_with_pending_audio(self):
+        self.client.vad = mock.Mock(**{"end_of_speech.return_value": False, "has_speech.return_value": True})
+        thread, result = self.start_waiting()
+        self.client.add_frames(audio(0.3))
+        self.client.on_vad_scored()
+        self.assert_blocked(thread)
+
+        self.client.vad.end_of_speech.return_value = True
+        self.client.on_vad_scored()
+        self.assert_woken(thread, result)
+        self.assertTrue(self.client.at_endpoint)
+        self.assertFalse(self.client.endpoint_detected)
+
+    def test_endpoint_without_pending_audio_keeps_waiting(self):
+        self.client.vad = mock.Mock(**{"end_of_speech.return_value": True, "has_speech.return_value": True})
+        thread, _ = self.start_waiting()
+        self.client.on_vad_scored()
+        self.assert_blocked(thread)
+        self.client.signal_stop()
+        thread.join(WAKE)
+
+    def test_stop_ends_the_loop(self):
+        thread, result = self.start_waiting()
+        self.assert_blocked(thread)
+        stopped = time.monotonic()
+        self.client.signal_stop()
+        self.assert_woken(thread, result, ready=False)
+        self.assertLess(result["time"] - stopped, WAKE)
+        # and keeps it ended, with audio pending
+        self.client.add_frames(audio(2.0))
+        self.assertFalse(self.client.wait_for_audio(timeout=0))
+
+    def test_removed_speaker_ends_the_loop(self):
+        websocket = mock.Mock()
+        manager = SpeakerManager()
+        manager.add_client(websocket, self.client)
+        thread, result = self.start_waiting()
+        self.assert_blocked(thread)
+        manager.remove_client(websocket)
+        self.assert_woken(thread, result, ready=False)
+        websocket.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_live.streaming_features import StreamingFeatureExtractor
+
+RATE = 16000
+
+
+def make_stream(seconds, seed=0):
+    """Noise with bursts of harmonic 'speech' of varying loudness."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * RATE)) / RATE
+    envelope = np.repeat(rng.uniform(0, 1, int(seconds * 4) + 1), RATE // 4)[:t.shape[0]]
+    signal = sum(np.sin(2 * np.pi * 180 * k * t) / k for k in range(1, 12)) * envelope
+    return (signal * 0.1 + rng.standard_normal(t.shape[0]) * 0.005).astype(np.float32)
+
+
+class TestStreamingFeatureExtractor(unittest.TestCase):
+    def setUp(self):
+        self.batch = FeatureExtractor(feature_size=80)
+        self.stream = make_stream(20.0)
+        self.extractor = StreamingFeatureExtractor.from_feature_extractor(self.batch)
+        packets = np.random.default_rng(1).integers(50, 6000, 200)
+        position = 0
+        for size in packets:
+            self.extractor.accept(self.stream[position:position + size])
+            position += size
+            if position >= self.stream.shape[0]:
+                break
+        self.extractor.accept(self.stream[position:])
+
+    def expected(self, audio):
+        # the transcriber normalizes every window by its peak
+        return self.batch(audio / np.max(np.abs(audio)))
+
+    def test_window_matches_batch_extractor(self):
+        for start, end in [(0, 4 * RATE), (160 * 123, 160 * 123 + 12345), (5 * RATE, 20 * RATE)]:
+            audio = self.stream[start:end]
+            features = self.extractor.get_features(audio, start)
+            expected = self.expected(audio)
+            self.assertEqual(features.shape, expected.shape)
+            np.testing.assert_allclose(features, expected, atol=1e-5)
+
+    def test_speech_chunks_match_collected_audio(self):
+        start = 160 * 200
+        audio = self.stream[start:start + 15 * RATE]
+        chunks = [{"start": 320, "end": 320 + 160 * 200}, {"start": 160 * 400, "end": 160 * 900}, {"start": 160 * 1000, "end": 15 * RATE - 77}]
+        features = self.extractor.get_features(audio, start, chunks)
+
+        normalized = audio / np.max(np.abs(audio))
+        expected = self.batch(np.concatenate([normalized[chunk["start"]:chunk["end"]] for chunk in chunks]))
+        self.assertEqual(features.shape, expected.shape)
+        np.testing.assert_allclose(features, expected, atol=1e-5)
+
+    def test_only_edge_frames_are_computed(self):
+        start = 160 * 300
+        audio = self.stream[start:start + 10 * RATE]
+        with mock.patch.object(self.extractor, "log_mel", wraps=self.extractor.log_mel) as log_mel:
+            self.extractor.get_features(audio, start)
+        (windows,), _ = log_mel.call_args
+        # two frames reflected at the start, the frames reaching past the end
+        self.assertLessEqual(windows.shape[0], 5)
+
+    def test_unaligned_windows_are_not_served(self):
+        audio = self.stream[1000:2 * RATE]
+        self.assertIsNone(self.extractor.get_features(audio, 1000))
+        self.assertIsNone(self.extractor.get_features(self.stream[:RATE], 0, [{"start": 0, "end": 1000}, {"start": 1600, "end": 3200}]))
+        self.assertIsNone(self.extractor.get_features(np.zeros(RATE, dtype=np.float32), 0))
+
+    def test_frames_are_computed_once_and_old_frames_dropped(self):
+        self.assertEqual(self.extractor.end, (self.stream.shape[0] - 200) // 160 + 1)
+        extractor = StreamingFeatureExtractor.from_feature_extractor(self.batch, max_frames=500)
+        for position in range(0, self.stream.shape[0], 4000):
+            extractor.accept(self.stream[position:position + 4000])
+        self.assertLessEqual(extractor.count, 1000)
+        self.assertEqual(extractor.end, self.extractor.end)
+
+        # frames no longer cached are computed from the audio
+        start = 160 * 100
+        audio = self.stream[start:start + 5 * RATE]
+        np.testing.assert_allclose(extractor.get_features(audio, start), self.expected(audio), atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
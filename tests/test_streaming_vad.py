@@ -0,0 +1,171 @@
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.energy_gate import EnergyGate
+from whisper_live.vad_silero import BatchedVAD, StreamingVAD, VadOptions, get_speech_timestamps
+
+
+class FakeSileroModel:
+    """Scores a window by its loudness and counts the windows it has seen."""
+
+    def __init__(self):
+        self.calls = 0
+        self.batch_sizes = []
+
+    def get_initial_states(self, batch_size):
+        return np.zeros((2, batch_size, 128), dtype=np.float32), np.zeros((batch_size, 64), dtype=np.float32)
+
+    def __call__(self, x, state, context, sr):
+        x = np.atleast_2d(x)
+        self.calls += 1
+        self.batch_sizes.append(x.shape[0])
+        probs = np.where(np.abs(x).mean(axis=1) > 0.05, 0.9, 0.05).astype(np.float32)
+        # the state counts the windows seen by every stream
+        return probs[:, None], state + 1, context
+
+
+def make_audio(pattern, rate=16000):
+    """Builds audio from (seconds, is_speech) pairs."""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, is_speech in pattern:
+        n = int(seconds * rate)
+        parts.append(rng.uniform(-0.5, 0.5, n) if is_speech else np.zeros(n))
+    return np.concatenate(parts).astype(np.float32)
+
+
+class TestStreamingVAD(unittest.TestCase):
+    def setUp(self):
+        self.model = FakeSileroModel()
+        patcher = mock.patch("whisper_live.vad_silero.get_vad_model", return_value=self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.options = VadOptions(min_silence_duration_ms=500, speech_pad_ms=100)
+        # 512 * 250 samples
+        self.audio = make_audio([(1.0, False), (2.0, True), (1.5, False), (1.5, True), (2.0, False)])
+
+    def stream(self, vad, packet_sizes):
+        position = 0
+        for size in packet_sizes:
+            vad.accept(self.audio[position:position + size])
+            position += size
+        vad.accept(self.audio[position:])
+
+    def test_matches_offline_vad_and_scores_each_window_once(self):
+        expected = get_speech_timestamps(self.audio, self.options)
+        self.model.calls = 0
+
+        vad = StreamingVAD(self.options)
+        self.stream(vad, np.random.default_rng(1).integers(100, 5000, 30))
+
+        self.assertEqual(self.model.calls, len(self.audio) // 512)
+        self.assertEqual(vad.get_speech_chunks(0, len(self.audio)), expected)
+        # asking again does not run the model
+        vad.get_speech_chunks(16000, len(self.audio))
+        self.assertEqual(self.model.calls, len(self.audio) // 512)
+
+    def test_chunks_are_relative_to_the_range(self):
+        vad = StreamingVAD(self.options)
+        vad.accept(self.audio)
+        start = 512 * 40
+        whole = vad.get_speech_chunks(0, len(self.audio))
+        shifted = vad.get_speech_chunks(start, len(self.audio))
+        self.assertEqual(shifted[-1]["start"], whole[-1]["start"] - start)
+        self.assertEqual(shifted[-1]["end"], whole[-1]["end"] - start)
+
+    def test_silence_and_end_of_speech(self):
+        vad = StreamingVAD(self.options)
+        vad.accept(self.audio[:16000])
+        self.assertFalse(vad.has_speech(0))
+        self.assertFalse(vad.end_of_speech())
+
+        vad.accept(self.audio[16000:3 * 16000])
+        self.assertTrue(vad.has_speech(0))
+        self.assertFalse(vad.end_of_speech())
+
+        vad.accept(self.audio[3 * 16000:4 * 16000])
+        self.assertTrue(vad.end_of_speech())
+        # reported once per utterance
+        self.assertFalse(vad.end_of_speech())
+        self.assertFalse(vad.has_speech(vad.end))
+
+    def test_energy_gate_skips_the_model_for_silence(self):
+        expected = get_speech_timestamps(self.audio, self.options)
+        self.model.calls = 0
+
+        vad = StreamingVAD(self.options, gate=EnergyGate())
+        self.stream(vad, np.random.default_rng(1).integers(100, 5000, 30))
+
+        n_windows = len(self.audio) // 512
+        self.assertLess(self.model.calls, n_windows * 0.7)
+        self.assertEqual(vad.gated_windows + vad.scored_windows, n_windows)
+        self.assertEqual(vad.get_speech_chunks(0, len(self.audio)), expected)
+        filtered = vad.get_filtered_seconds()
+        self.assertAlmostEqual(filtered["energy_gate"], vad.gated_windows * 512 / 16000, places=3)
+        self.assertGreater(filtered["energy_gate"], 2.0)
+
+    def test_old_probabilities_are_dropped(self):
+        vad = StreamingVAD(self.options, max_windows=50)
+        vad.accept(self.audio)
+        self.assertLessEqual(len(vad.speech_probs), 100)
+        self.assertEqual(vad.end, len(self.audio) // 512 * 512)
+        self.assertEqual(vad.get_speech_chunks(0, 512 * 10), [])
+
+
+class TestBatchedVAD(unittest.TestCase):
+    def setUp(self):
+        self.model = FakeSileroModel()
+        patcher = mock.patch("whisper_live.vad_silero.get_vad_model", return_value=self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.options = VadOptions(min_silence_duration_ms=500, speech_pad_ms=100)
+        self.engine = BatchedVAD(max_batch_size=2)
+        self.addCleanup(self.engine.stop)
+
+    def test_gated_windows_skip_the_batch(self):
+        audio = make_audio([(1.0, True), (2.0, False)])
+        scored = threading.Event()
+        stream = StreamingVAD(self.options, engine=self.engine, on_scored=scored.set, gate=EnergyGate())
+        stream.accept(audio)
+        self.engine.start()
+        self.assertTrue(scored.wait(5))
+
+        n_windows = len(audio) // 512
+        self.assertEqual(stream.end, n_windows * 512)
+        self.assertEqual(self.engine.windows, stream.scored_windows)
+        self.assertEqual(stream.gated_windows + stream.scored_windows, n_windows)
+        self.assertGreater(stream.gated_windows, 0)
+        self.assertEqual(stream.get_speech_chunks(0, len(audio)), get_speech_timestamps(audio, self.options))
+
+    def test_streams_are_scored_together(self):
+        audios = [
+            make_audio([(0.5, False), (1.0, True), (0.5, False)]),
+            make_audio([(1.0, True), (1.0, False)]),
+            make_audio([(2.0, False)]),
+        ]
+        scored = [threading.Event() for _ in audios]
+        streams = [
+            StreamingVAD(self.options, engine=self.engine, on_scored=event.set) for event in scored
+        ]
+        for stream, audio in zip(streams, audios):
+            stream.accept(audio)
+        self.engine.start()
+        for event in scored:
+            self.assertTrue(event.wait(5))
+
+        n_windows = len(audios[0]) // 512
+        self.assertEqual(self.engine.windows, 3 * n_windows)
+        self.assertLess(self.engine.steps, 3 * n_windows)
+        self.assertEqual(max(self.model.batch_sizes), 2)
+        for stream, audio in zip(streams, audios):
+            # every stream kept its own recurrent state
+            self.assertTrue(np.all(stream.state == n_windows))
+            self.assertEqual(stream.end, n_windows * 512)
+            self.assertEqual(stream.get_speech_chunks(0, len(audio)), get_speech_timestamps(audio, self.options))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import itertools
+import unittest
+
+from whisper_live.tokenizer import Tokenizer, bytes_to_unicode, get_token_table
+
+BYTE_ENCODER = bytes_to_unicode()
+# pieces of text a byte-level vocabulary has tokens for, with code points cut between tokens
+VOCABULARY = [
+    b"a",
+    b" b",
+    "你".encode()[:2],
+    "你".encode()[2:],
+    "好".encode(),
+    "😀".encode()[:1],
+    "😀".encode()[1:],
+    b"\xff",
+    b",",
+    "�".encode(),
+    " ภา".encode()[:5],
+]
+SPECIAL = ["<|endoftext|>", "<|notimestamps|>"]
+
+
+class FakeHFTokenizer:
+    """Decodes like a byte-level `tokenizers.Tokenizer`: special tokens are skipped and the
+    bytes of the others decoded with replacement characters."""
+
+    def __init__(self, byte_level=True):
+        self.tokens = ["".join(BYTE_ENCODER[byte] for byte in piece) for piece in VOCABULARY] + SPECIAL
+        if not byte_level:
+            self.tokens[0] = "▁a"
+
+    def token_to_id(self, token):
+        return self.tokens.index(token)
+
+    def id_to_token(self, token_id):
+        return self.tokens[token_id] if token_id < len(self.tokens) else None
+
+    def decode(self, ids):
+        return b"".join(VOCABULARY[token_id] for token_id in ids if token_id < len(VOCABULARY)).decode("utf-8", "replace")
+
+
+class TestSplitTokensOnUnicode(unittest.TestCase):
+    def test_same_words_as_decoding_every_prefix(self):
+        tokenizer = Tokenizer(FakeHFTokenizer(), multilingual=False)
+        # text tokens, the special tokens and two timestamps
+        token_ids = range(tokenizer.timestamp_begin + 2)
+        for length in range(1, 5):
+            for tokens in itertools.product(token_ids, repeat=length):
+                tokens = list(tokens)
+                self.assertEqual(
+                    tokenizer.split_tokens_on_unicode(tokens),
+                    tokenizer._split_tokens_on_unicode_by_prefix(tokens),
+                    tokens,
+                )
+
+    def test_code_points_cut_between_tokens(self):
+        tokenizer = Tokenizer(FakeHFTokenizer(), multilingual=False)
+        timestamp = tokenizer.timestamp_begin + 1
+        words, word_tokens = tokenizer.split_tokens_on_unicode([2, 3, 4, 5, 6, timestamp, 0])
+        self.assertEqual(words, ["你", "好", "😀", "<|0.02|>", "a"])
+        self.assertEqual(word_tokens, [[2, 3], [4], [5, 6], [timestamp], [0]])
+
+    def test_unfinished_code_points(self):
+        tokenizer = Tokenizer(FakeHFTokenizer(), multilingual=False)
+        # the first byte of the emoji is never completed and is a word of its own
+        self.assertEqual(tokenizer.split_tokens_on_unicode([5, 0, 1]), (["�", "a", " b"], [[5], [0], [1]]))
+        self.assertEqual(tokenizer.split_tokens_on_unicode([1, 5]), ([" b", "�"], [[1], [5]]))
+
+    def test_vocabularies_that_are_not_byte_level_decode_every_prefix(self):
+        tokenizer = Tokenizer(FakeHFTokenizer(byte_level=False), multilingual=False)
+        self.assertIsNone(tokenizer.token_table)
+        self.assertEqual(tokenizer.split_tokens_on_unicode([1, 2, 3]), ([" b", "你"], [[1], [2, 3]]))
+
+    def test_token_table_is_built_once_per_tokenizer(self):
+        hf_tokenizer = FakeHFTokenizer()
+        table = get_token_table(hf_tokenizer, len(VOCABULARY) + 2)
+        self.assertIs(get_token_table(hf_tokenizer, len(VOCABULARY) + 2), table)
+        self.assertEqual(table.encoded[:3], VOCABULARY[:3])
+        self.assertEqual(table.encoded[-2:], [b"", b""])
+        self.assertEqual(table.decoded[:4], ["a", " b", None, None])
+        # a token of the replacement character needs the decoded tokens as a whole
+        self.assertIsNone(table.decoded[9])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,363 @@
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.feature_extractor import NumpyFeatureExtractor
+from whisper_live.transcriber import (
+    DecodeContext,
+    DecodeContextCache,
+    FallbackOptions,
+    FallbackStats,
+    MemoTokenizer,
+    Segment,
+    TranscriptionRequest,
+    WhisperModel,
+    Word,
+    restore_speech_timestamps,
+)
+
+RATE = 16000
+LANGUAGE_PROBS = [("<|de|>", 0.8), ("<|en|>", 0.15), ("<|nl|>", 0.05)]
+
+
+class FakeWhisper:
+    """Stands in for the CTranslate2 model and records its calls."""
+
+    is_multilingual = True
+    device = "cpu"
+    device_index = [0]
+
+    def __init__(self, passing_temperatures=None):
+        self.encoded = []
+        self.outputs = []
+        self.detected = []
+        self.generated = []
+        self.aligned = []
+        # window (first prompt token) -> lowest temperature whose result is accepted
+        self.passing_temperatures = passing_temperatures or {}
+
+    def encode(self, features, to_cpu=False):
+        self.encoded.append(features)
+        # rows identify the window: the first feature of every window
+        self.outputs.append(np.ascontiguousarray(features[:, :1, :1]))
+        return self.outputs[-1]
+
+    def detect_language(self, encoder_output):
+        self.detected.append(encoder_output)
+        return [LANGUAGE_PROBS] * len(encoder_output)
+
+    def align(self, encoder_output, start_sequence, text_tokens, num_frames, median_filter_width=7):
+        self.aligned.append((start_sequence, text_tokens, num_frames))
+        # every token (and the end of text) takes 10 frames
+        return [
+            mock.Mock(
+                alignments=[(i, 10 * i + j) for i in range(len(tokens) + 1) for j in range(10)],
+                text_token_probs=[0.9] * len(tokens),
+            )
+            for tokens in text_tokens
+        ]
+
+    def generate(self, encoder_output, prompts, **kwargs):
+        temperature = kwargs.get("sampling_temperature", 0.0)
+        self.generated.append((encoder_output, prompts, temperature))
+        return [
+            mock.Mock(no_speech_prob=0.0, passed=temperature >= self.passing_temperatures.get(prompt[0] if prompt else None, 0.0))
+            for prompt in prompts
+        ]
+
+
+class FakeTokenizerEncoding:
+    def __init__(self, text):
+        self.ids = [ord(c) for c in text]
+
+
+def make_model():
+    model = WhisperModel.__new__(WhisperModel)
+    model.model = FakeWhisper()
+    model.hf_tokenizer = mock.Mock(encode=lambda text, add_special_tokens=False: FakeTokenizerEncoding(text))
+    model.feature_extractor = NumpyFeatureExtractor(feature_size=80)
+    model.logger = mock.Mock()
+    model.max_length = 448
+    model.time_precision = 0.02
+    model.tokens_per_second = 50
+    model.fallback_options = FallbackOptions()
+    model.fallback_stats = FallbackStats()
+    model.decode_contexts = DecodeContextCache()
+    return model
+
+
+def make_audio(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * RATE)) * 0.1).astype(np.float32)
+
+
+@mock.patch("whisper_live.transcriber.get_ctranslate2_storage", new=lambda features: features)
+@mock.patch("whisper_live.transcriber.get_suppressed_tokens", return_value=[-1])
+@mock.patch("whisper_live.transcriber.Tokenizer")
+class TestSharedEncoderPass(unittest.TestCase):
+    def test_transcribe_detects_on_the_decoded_encoder_output(self, tokenizer, suppressed):
+        model = make_model()
+        with mock.patch.object(WhisperModel, "generate_segments", return_value=iter([])) as generate_segments:
+            _, info = model.transcribe(make_audio(5))
+
+        self.assertEqual(len(model.model.encoded), 1)
+        self.assertEqual(model.model.detected, model.model.outputs)
+        self.assertIs(generate_segments.call_args.args[3], model.model.outputs[0])
+        self.assertEqual(info.language, "de")
+        self.assertAlmostEqual(info.language_probability, 0.8)
+        self.assertEqual(tokenizer.call_args.kwargs["language"], "de")
+
+    def test_first_window_is_the_one_decoded(self, tokenizer, suppressed):
+        model = make_model()
+        audio = make_audio(5)
+        with mock.patch.object(WhisperModel, "generate_segments", return_value=iter([])):
+            model.transcribe(audio)
+        features = model.feature_extractor(audio / np.max(np.abs(audio)))
+        first_window = np.pad(features[:, :500], ((0, 0), (0, 2500)))
+        np.testing.assert_array_equal(model.model.encoded[0][0], first_window)
+
+    def test_given_language_skips_the_detection(self, tokenizer, suppressed):
+        model = make_model()
+        with mock.patch.object(WhisperModel, "generate_segments", return_value=iter([])) as generate_segments:
+            _, info = model.transcribe(make_audio(5), language="en")
+        self.assertEqual(model.model.encoded, [])
+        self.assertEqual(model.model.detected, [])
+        self.assertIsNone(generate_segments.call_args.args[3])
+        self.assertEqual(info.language_probability, 1)
+
+    @mock.patch.object(WhisperModel, "_get_window_segments", return_value=[])
+    @mock.patch.object(WhisperModel, "_get_decode_result", return_value=(mock.Mock(no_speech_prob=0.0), -0.1, 0.0, 1.0))
+    def test_batch_encodes_each_window_once(self, decode_result, segments, tokenizer, suppressed):
+        model = make_model()
+        requests = [
+            TranscriptionRequest(make_audio(3, seed=0)),
+            TranscriptionRequest(make_audio(4, seed=1), language="fr"),
+            TranscriptionRequest(make_audio(2, seed=2)),
+        ]
+        results = model.transcribe_batch(requests)
+
+        self.assertEqual(len(model.model.encoded), 1)
+        self.assertEqual(model.model.encoded[0].shape[0], 3)
+        self.assertEqual(len(model.model.detected), 1)
+        self.assertIs(model.model.detected[0], model.model.outputs[0])
+        self.assertIs(model.model.generated[0][0], model.model.outputs[0])
+        self.assertEqual([info.language for _, info in results], ["de", "fr", "de"])
+        self.assertEqual([info.language_probability for _, info in results], [0.8, 1, 0.8])
+
+
+class FakeTokenizer:
+    """Splits tokens into words the way faster_whisper's tokenizer does for spaced languages."""
+
+    eot = 100
+    sot_prev = 99
+    vocabulary = {1: " Hello", 2: ",", 3: " world", 4: "."}
+
+    def __init__(self, language="en"):
+        self.sot_sequence = [50, 60 if language == "en" else 61, 70]
+
+    def split_to_word_tokens(self, tokens):
+        words, word_tokens = [], []
+        for token in tokens:
+            text = self.vocabulary.get(token, "<|endoftext|>")
+            if token >= self.eot or text.startswith(" ") or text in ",." or not words:
+                words.append(text)
+                word_tokens.append([token])
+            else:
+                words[-1] += text
+                word_tokens[-1].append(token)
+        return words, word_tokens
+
+
+def window_segment(tokens, start=0.0, end=1.0):
+    return Segment(
+        id=1, seek=0, start=start, end=end, text="", tokens=tokens, temperature=0.0,
+        avg_logprob=-0.1, compression_ratio=1.0, no_speech_prob=0.0, words=None,
+    )
+
+
+@mock.patch("whisper_live.transcriber.get_ctranslate2_storage", new=lambda features: features)
+@mock.patch("whisper_live.transcriber.get_suppressed_tokens", return_value=[-1])
+class TestWordTimestamps(unittest.TestCase):
+    def test_alignment_words_and_punctuation(self, suppressed):
+        model = make_model()
+        alignment = model.find_alignments([FakeTokenizer()], [[1, 2, 3, 4]], np.zeros((1, 1, 1)), [100])[0]
+        self.assertEqual([word["word"] for word in alignment], [" Hello", ",", " world", "."])
+        self.assertEqual([word["start"] for word in alignment], [0.0, 0.2, 0.4, 0.6])
+        self.assertEqual([word["end"] for word in alignment], [0.2, 0.4, 0.6, 0.8])
+
+        segments = [dict(start=2.0, end=3.0, tokens=[150, 1, 2, 3, 4, 190])]
+        last_speech = model.add_word_timestamps(
+            segments, FakeTokenizer(), alignment, 2.0, "\"'“¿([{-", "\"'.。,，!！?？:：”)]}、", last_speech_timestamp=0.0)
+        words = segments[0]["words"]
+        self.assertEqual([word["word"] for word in words], [" Hello,", " world."])
+        # merged punctuation keeps the times of the word
+        self.assertEqual([(word["start"], word["end"]) for word in words], [(2.0, 2.2), (2.4, 2.6)])
+        # the segment is moved to its words
+        self.assertEqual((segments[0]["start"], segments[0]["end"]), (2.0, 2.6))
+        self.assertEqual(last_speech, 2.6)
+
+    @mock.patch("whisper_live.transcriber.Tokenizer", side_effect=lambda *args, language=None, **kwargs: FakeTokenizer(language))
+    def test_batch_aligns_once_per_start_sequence(self, tokenizer, suppressed):
+        model = make_model()
+        requests = [
+            TranscriptionRequest(make_audio(2, seed=0), language="en"),
+            TranscriptionRequest(make_audio(2, seed=1), language="fr"),
+            TranscriptionRequest(make_audio(2, seed=2), language="en"),
+        ]
+        with mock.patch.object(WhisperModel, "_get_decode_result", return_value=(mock.Mock(no_speech_prob=0.0), -0.1, 0.0, 1.0)), \
+                mock.patch.object(WhisperModel, "_get_window_segments", return_value=[window_segment([150, 1, 2, 3, 4, 190])]):
+            results = model.transcribe_batch(requests, word_timestamps=True)
+
+        self.assertEqual(len(model.model.encoded), 1)
+        self.assertEqual(sorted(call[0][1] for call in model.model.aligned), [60, 61])
+        self.assertEqual([len(call[1]) for call in model.model.aligned], [2, 1])
+        for segments, _ in results:
+            self.assertEqual([word.word for word in segments[0].words], [" Hello,", " world."])
+
+    def test_speech_timestamps_restore_the_words(self, suppressed):
+        segment = window_segment([1, 3])._replace(words=[Word(0.2, 0.6, " Hello", 0.9), Word(1.1, 1.4, " world", 0.9)])
+        # one second of speech, a second of silence, then the rest
+        chunks = [{"start": 0, "end": 16000}, {"start": 32000, "end": 64000}]
+        restored = restore_speech_timestamps([segment], chunks, 16000)[0]
+        self.assertEqual([(word.start, word.end) for word in restored.words], [(0.2, 0.6), (2.1, 2.4)])
+        self.assertEqual((restored.start, restored.end), (0.2, 2.4))
+
+
+@mock.patch("whisper_live.transcriber.get_ctranslate2_storage", new=lambda features: features)
+@mock.patch("whisper_live.transcriber.Tokenizer", side_effect=lambda *args, language=None, **kwargs: FakeTokenizer(language))
+class TestDecodeContext(unittest.TestCase):
+    def test_contexts_are_built_once_per_key(self, tokenizer):
+        model = make_model()
+        model.hf_tokenizer = mock.Mock(encode=mock.Mock(side_effect=lambda text, add_special_tokens=False: FakeTokenizerEncoding(text)))
+        requests = [
+            TranscriptionRequest(make_audio(2, seed=0), language="en", initial_prompt="Hi"),
+            TranscriptionRequest(make_audio(2, seed=1), language="fr", initial_prompt="Hi"),
+        ]
+        with mock.patch.object(WhisperModel, "_get_decode_result", return_value=(mock.Mock(no_speech_prob=0.0), -0.1, 0.0, 1.0)), \
+                mock.patch.object(WhisperModel, "_get_window_segments", return_value=[]):
+            model.transcribe_batch(requests)
+            model.transcribe_batch(requests)
+
+        self.assertEqual(tokenizer.call_count, 2)
+        self.assertEqual(model.decode_contexts.to_dict()["contexts"], 2)
+        # the prompt is encoded once, whatever the language
+        self.assertEqual(model.hf_tokenizer.encode.call_count, 1)
+        prompts = [prompt for _, prompts, _ in model.model.generated for prompt in prompts]
+        self.assertEqual(prompts[0][:4], [99, ord(" "), ord("H"), ord("i")])
+
+    def test_hotwords_are_encoded_once(self, tokenizer):
+        model = make_model()
+        encode = mock.Mock(return_value=list(range(300)))
+        tokenizer.side_effect = lambda *args, **kwargs: mock.Mock(encode=encode, sot_prev=1000, sot_sequence=[2000])
+        context = model.get_decode_context("transcribe", "en", hotwords="WhisperLive")
+        self.assertEqual(len(context.hotwords_tokens), 223)
+        self.assertIs(model.get_decode_context("transcribe", "en", hotwords="WhisperLive"), context)
+
+        prompt = model.get_prompt(context.tokenizer, [], hotwords="WhisperLive", hotwords_tokens=context.hotwords_tokens)
+        self.assertEqual(prompt, [1000, *range(223), 2000])
+        self.assertEqual(encode.call_count, 1)
+
+    def test_token_sequences_are_decoded_once_per_call(self, tokenizer):
+        inner = mock.Mock(decode=mock.Mock(side_effect=lambda tokens: "x" * len(tokens)), eot=100)
+        memo = MemoTokenizer(DecodeContext(inner, [-1], [], None))
+        self.assertEqual(memo.decode([1, 2, 3]), "xxx")
+        self.assertEqual(memo.decode((1, 2, 3)), "xxx")
+        self.assertEqual(memo.decode([1, 2]), "xx")
+        self.assertEqual(inner.decode.call_count, 2)
+        self.assertEqual(memo.eot, 100)
+
+    def test_least_recently_used_contexts_are_evicted(self, tokenizer):
+        model = make_model()
+        model.decode_contexts = DecodeContextCache(max_size=2)
+        english = model.get_decode_context("transcribe", "en")
+        model.get_decode_context("transcribe", "fr")
+        self.assertIs(model.get_decode_context("transcribe", "en"), english)
+        model.get_decode_context("transcribe", "de")
+        self.assertEqual([key[1] for key in model.decode_contexts.contexts], ["en", "de"])
+
+
+def decode_result(result, tokenizer, options, temperature):
+    """Accepted results have a high average log probability, rejected ones rise with temperature."""
+    return result, (-0.1 if result.passed else -2.0 + temperature), temperature, 1.0
+
+
+@mock.patch("whisper_live.transcriber.get_ctranslate2_storage", new=lambda features: features)
+@mock.patch.object(WhisperModel, "_get_decode_result", side_effect=decode_result)
+class TestTemperatureFallback(unittest.TestCase):
+    temperatures = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+    def options(self):
+        return mock.Mock(
+            temperatures=self.temperatures,
+            max_initial_timestamp=1.0,
+            max_new_tokens=None,
+            compression_ratio_threshold=2.4,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            beam_size=3,
+            best_of=3,
+            patience=1.5,
+        )
+
+    def run_batch(self, passing_temperatures, deadlines=None, **fallback):
+        model = make_model()
+        model.model = FakeWhisper(passing_temperatures)
+        model.fallback_options = FallbackOptions(**fallback)
+        windows = len(passing_temperatures)
+        features = [np.full((80, 3000), window, dtype=np.float32) for window in range(windows)]
+        encoder_output = model.encode(np.stack(features))
+        results = model.generate_batch_with_fallback(
+            encoder_output,
+            [[window, 1, 2] for window in range(windows)],
+            [None] * windows,
+            self.options(),
+            features=features,
+            deadlines=deadlines,
+        )
+        return model, results
+
+    def test_rejected_windows_fall_back_together(self, decode):
+        model, results = self.run_batch({0: 0.0, 1: 0.4, 2: 2.0})
+
+        calls = [(len(prompts), temperature) for _, prompts, temperature in model.model.generated]
+        self.assertEqual(calls, [(3, 0.0), (2, 0.2), (2, 0.4), (1, 0.6), (1, 0.8), (1, 1.0)])
+        # the remaining windows are decoded from their rows of the encoder output
+        np.testing.assert_array_equal(model.model.generated[3][0].ravel(), [2.0])
+        self.assertEqual(len(model.model.encoded), 1)
+
+        self.assertEqual([result[2] for result in results], [0.0, 0.4, 1.0])
+        self.assertTrue(results[1][0].passed)
+        # window 2 keeps its best rejected result, reported with the last temperature
+        self.assertAlmostEqual(results[2][1], -1.0)
+        stats = model.get_fallback_stats()
+        self.assertEqual(stats["temperatures"], {"0.0": 3, "0.2": 2, "0.4": 2, "0.6": 1, "0.8": 1, "1.0": 1})
+        self.assertEqual(stats["deadline_stops"] + stats["attempt_cap_stops"], 0)
+
+    def test_sequential_fallback(self, decode):
+        model, results = self.run_batch({0: 0.2, 1: 0.4, 2: 0.0}, batch_fallback=False)
+        calls = [(len(prompts), temperature) for _, prompts, temperature in model.model.generated]
+        self.assertEqual(calls, [(3, 0.0), (1, 0.2), (1, 0.2), (1, 0.4)])
+        self.assertEqual([result[2] for result in results], [0.2, 0.4, 0.0])
+
+    def test_attempt_cap(self, decode):
+        model, results = self.run_batch({0: 2.0, 1: 0.2}, max_attempts=2)
+        self.assertEqual(len(model.model.generated), 2)
+        self.assertEqual([result[2] for result in results], [0.2, 0.2])
+        self.assertFalse(results[0][0].passed)
+        self.assertEqual(model.get_fallback_stats()["attempt_cap_stops"], 1)
+
+    def test_deadline_stops_the_fallback(self, decode):
+        now = time.monotonic()
+        model, results = self.run_batch({0: 2.0, 1: 2.0}, deadlines=[now - 1.0, now + 60.0])
+        calls = [(len(prompts), temperature) for _, prompts, temperature in model.model.generated]
+        self.assertEqual(calls, [(2, 0.0), (1, 0.2), (1, 0.4), (1, 0.6), (1, 0.8), (1, 1.0)])
+        self.assertEqual([result[2] for result in results], [0.0, 1.0])
+        stats = model.get_fallback_stats()
+        self.assertEqual(stats["deadline_stops"], 1)
+        self.assertEqual(stats["temperatures"]["0.2"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
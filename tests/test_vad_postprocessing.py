@@ -0,0 +1,145 @@
+import unittest
+
+import numpy as np
+
+from whisper_live.vad_silero import VadOptions, speech_probs_to_timestamps
+
+
+def reference_speech_probs_to_timestamps(speech_probs, audio_length_samples, vad_options, window_size_samples=512):
+    """The per-window Python implementation the compiled post-processing replaced."""
+    sampling_rate = 16000
+    threshold = vad_options.threshold
+    min_speech_samples = sampling_rate * vad_options.min_speech_duration_ms / 1000
+    speech_pad_samples = sampling_rate * vad_options.speech_pad_ms / 1000
+    max_speech_samples = (
+        sampling_rate * vad_options.max_speech_duration_s - window_size_samples - 2 * speech_pad_samples
+    )
+    min_silence_samples = sampling_rate * vad_options.min_silence_duration_ms / 1000
+    min_silence_samples_at_max_speech = sampling_rate * 98 / 1000
+
+    triggered = False
+    speeches = []
+    current_speech = {}
+    neg_threshold = threshold - 0.15
+    temp_end = 0
+    prev_end = next_start = 0
+
+    for i, speech_prob in enumerate(speech_probs):
+        if (speech_prob >= threshold) and temp_end:
+            temp_end = 0
+            if next_start < prev_end:
+                next_start = window_size_samples * i
+
+        if (speech_prob >= threshold) and not triggered:
+            triggered = True
+            current_speech["start"] = window_size_samples * i
+            continue
+
+        if triggered and (window_size_samples * i) - current_speech["start"] > max_speech_samples:
+            if prev_end:
+                current_speech["end"] = prev_end
+                speeches.append(current_speech)
+                current_speech = {}
+                if next_start < prev_end:
+                    triggered = False
+                else:
+                    current_speech["start"] = next_start
+                prev_end = next_start = temp_end = 0
+            else:
+                current_speech["end"] = window_size_samples * i
+                speeches.append(current_speech)
+                current_speech = {}
+                prev_end = next_start = temp_end = 0
+                triggered = False
+                continue
+
+        if (speech_prob < neg_threshold) and triggered:
+            if not temp_end:
+                temp_end = window_size_samples * i
+            if (window_size_samples * i) - temp_end > min_silence_samples_at_max_speech:
+                prev_end = temp_end
+            if (window_size_samples * i) - temp_end < min_silence_samples:
+                continue
+            current_speech["end"] = temp_end
+            if (current_speech["end"] - current_speech["start"]) > min_speech_samples:
+                speeches.append(current_speech)
+            current_speech = {}
+            prev_end = next_start = temp_end = 0
+            triggered = False
+            continue
+
+    if current_speech and (audio_length_samples - current_speech["start"]) > min_speech_samples:
+        current_speech["end"] = audio_length_samples
+        speeches.append(current_speech)
+
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech["start"] = int(max(0, speech["start"] - speech_pad_samples))
+        if i != len(speeches) - 1:
+            silence_duration = speeches[i + 1]["start"] - speech["end"]
+            if silence_duration < 2 * speech_pad_samples:
+                speech["end"] += int(silence_duration // 2)
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - silence_duration // 2))
+            else:
+                speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - speech_pad_samples))
+        else:
+            speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+
+    return speeches
+
+
+def random_probs(rng, n_windows):
+    """Speech probabilities in runs of speech, silence and values between the two thresholds."""
+    probs = []
+    while len(probs) < n_windows:
+        level = rng.choice([0.02, 0.4, 0.9, 0.5, 0.35])
+        run = int(rng.integers(1, 120))
+        noise = rng.normal(0, 0.05, run) if rng.random() < 0.5 else np.zeros(run)
+        probs.extend(np.clip(level + noise, 0, 1))
+    return np.asarray(probs[:n_windows], dtype=np.float32)
+
+
+class TestVadPostProcessing(unittest.TestCase):
+    def assert_matches_reference(self, probs, audio_length, options):
+        expected = reference_speech_probs_to_timestamps(
+            [np.array([[prob]], dtype=np.float32) for prob in probs], audio_length, options
+        )
+        self.assertEqual(speech_probs_to_timestamps(list(probs.reshape(-1, 1, 1)), audio_length, options), expected)
+        self.assertEqual(speech_probs_to_timestamps(probs, audio_length, options), expected)
+        # the streaming VAD passes Python floats, compared in double precision
+        floats = probs.tolist()
+        self.assertEqual(
+            speech_probs_to_timestamps(floats, audio_length, options),
+            reference_speech_probs_to_timestamps(floats, audio_length, options),
+        )
+
+    def test_random_probabilities_and_options(self):
+        rng = np.random.default_rng(0)
+        for _ in range(300):
+            n_windows = int(rng.integers(0, 3000))
+            options = VadOptions(
+                threshold=float(rng.choice([0.3, 0.5, 0.6])),
+                min_speech_duration_ms=int(rng.choice([0, 250, 1000])),
+                max_speech_duration_s=float(rng.choice([float("inf"), 3.0, 10.0, 30.0])),
+                min_silence_duration_ms=int(rng.choice([0, 100, 500, 2000])),
+                speech_pad_ms=int(rng.choice([0, 30, 100, 400])),
+            )
+            audio_length = n_windows * 512 - int(rng.integers(0, 512)) if n_windows else 0
+            with self.subTest(n_windows=n_windows, options=options):
+                self.assert_matches_reference(random_probs(rng, n_windows), audio_length, options)
+
+    def test_speech_until_the_end(self):
+        probs = np.full(100, 0.9, dtype=np.float32)
+        self.assertEqual(
+            speech_probs_to_timestamps(probs, 100 * 512, VadOptions()),
+            [{"start": 0, "end": 100 * 512}],
+        )
+
+    def test_probabilities_equal_to_the_thresholds(self):
+        probs = np.array([0.5, 0.35, 0.35, 0.5, 0.0, 0.0] * 200, dtype=np.float32)
+        self.assert_matches_reference(probs, len(probs) * 512, VadOptions(min_silence_duration_ms=50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from whisper_live.vad_silero import VADSessionPool
+
+
+class SlowSileroModel:
+    """Takes a while per call and records how many calls overlap."""
+
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, path, intra_op_num_threads=1, inter_op_num_threads=1):
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+
+    def get_initial_states(self, batch_size):
+        return np.zeros((2, batch_size, 128), dtype=np.float32), np.zeros((batch_size, 64), dtype=np.float32)
+
+    def __call__(self, x, state, context, sr):
+        with SlowSileroModel.lock:
+            SlowSileroModel.running += 1
+            SlowSileroModel.max_running = max(SlowSileroModel.max_running, SlowSileroModel.running)
+        time.sleep(0.02)
+        with SlowSileroModel.lock:
+            SlowSileroModel.running -= 1
+        return np.full((1, 1), 0.9, dtype=np.float32), state, context
+
+
+class TestVADSessionPool(unittest.TestCase):
+    def setUp(self):
+        SlowSileroModel.running = SlowSileroModel.max_running = 0
+        patcher = mock.patch("whisper_live.vad_silero.SileroVADModel", SlowSileroModel)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call_concurrently(self, pool, threads):
+        def score():
+            state, context = pool.get_initial_states(batch_size=1)
+            pool(np.zeros(512, dtype=np.float32), state, context, 16000)
+
+        workers = [threading.Thread(target=score) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    def test_sessions_limit_parallel_calls_and_waits_are_counted(self):
+        pool = VADSessionPool(sessions=2, intra_op_num_threads=2, path="silero_vad.onnx")
+        self.assertEqual([model.intra_op_num_threads for model in pool.models], [2, 2])
+
+        self.call_concurrently(pool, threads=6)
+
+        status = pool.get_status()
+        self.assertEqual(SlowSileroModel.max_running, 2)
+        self.assertEqual(status["checkouts"], 6)
+        self.assertEqual(status["in_use"], 0)
+        self.assertGreaterEqual(status["contended"], 1)
+        self.assertGreater(status["max_wait"], 0.01)
+        self.assertGreater(status["utilization"], 0)
+
+    def test_checkout_returns_the_session(self):
+        pool = VADSessionPool(sessions=1, path="silero_vad.onnx")
+        with pool.checkout() as model:
+            self.assertIs(model, pool.models[0])
+            self.assertEqual(pool.get_status()["in_use"], 1)
+        self.assertEqual(pool.get_status()["in_use"], 0)
+        self.assertEqual(pool.get_status()["contended"], 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            VADSessionPool(sessions=0, path="silero_vad.onnx")
+
+
+if __name__ == "__main__":
+    unittest.main()
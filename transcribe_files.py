@@ -0,0 +1,96 @@
+import argparse
+import json
+import logging
+
+logging.basicConfig(level=logging.ERROR)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Transcribe audio files and directories of audio files offline, in batches."
+    )
+    parser.add_argument('paths',
+                        nargs='+',
+                        help="Audio files, or directories searched recursively for audio files.")
+    parser.add_argument('--output_dir', '-o',
+                        type=str,
+                        default="transcripts",
+                        help="Directory the transcripts are written to, one file per input and format.")
+    parser.add_argument('--formats', '-f',
+                        nargs='+',
+                        default=["srt", "json"],
+                        choices=["srt", "json"],
+                        help="Output formats.")
+    parser.add_argument('--model', '-m',
+                        type=str,
+                        default="large-v3",
+                        help="Whisper model size or path of a converted CTranslate2 model.")
+    parser.add_argument('--device', '-d',
+                        type=str,
+                        default="cuda",
+                        help="Device of the model, cuda or cpu.")
+    parser.add_argument('--compute_type', '-ctp',
+                        type=str,
+                        default="default",
+                        help="CTranslate2 compute type of the model, e.g. float16 or int8.")
+    parser.add_argument('--cpu_threads', '-ct',
+                        type=int,
+                        default=0,
+                        help="CPU threads of the model, 0 for the CTranslate2 default.")
+    parser.add_argument('--batch_size', '-bs',
+                        type=int,
+                        default=16,
+                        help="Chunks of up to 30 seconds transcribed in one batched model call.")
+    parser.add_argument('--workers', '-w',
+                        type=int,
+                        default=4,
+                        help="Threads decoding the files and splitting them with the VAD ahead of the model.")
+    parser.add_argument('--language', '-l',
+                        type=str,
+                        default=None,
+                        help="Language of the files, detected per chunk if not given.")
+    parser.add_argument('--task', '-t',
+                        type=str,
+                        default="transcribe",
+                        choices=["transcribe", "translate"],
+                        help="Transcribe, or translate to English.")
+    parser.add_argument('--beam_size', '-bms',
+                        type=int,
+                        default=3,
+                        help="Beam size of the decoding.")
+    parser.add_argument('--word_timestamps', '-wt',
+                        action='store_true',
+                        help="Align every word with the audio and add the words to the JSON output.")
+
+    args = parser.parse_args()
+
+    from whisper_live.offline import OfflineStats, OfflineTranscriber, find_audio_files, write_outputs
+    from whisper_live.transcriber import WhisperModel
+
+    model = WhisperModel(
+        args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads,
+    )
+    transcriber = OfflineTranscriber(
+        model,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        language=args.language,
+        task=args.task,
+        transcribe_options={"beam_size": args.beam_size, "word_timestamps": args.word_timestamps},
+    )
+    stats = OfflineStats()
+    for transcript in transcriber.transcribe_files(find_audio_files(args.paths)):
+        write_outputs(transcript, args.output_dir, args.formats)
+        stats.record(transcript)
+        print(
+            f"{transcript.path}: {transcript.duration:.1f}s, {len(transcript.segments)} segments,"
+            f" language {transcript.language}"
+        )
+    print(json.dumps(stats.to_dict()))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ def timer_decorator(func):
     return wrapper
 
 class MultiLingualTranslatorLive:
-    def __init__(self, model_path="madlad400-3b", compute_type="int8_float16", device="cuda"):
+    def __init__(self, model_path="madlad400-3b", compute_type="int8_float16", device="cuda", intra_threads=0, inter_threads=1):
         """
         Initializes the MultiLingualTranslatorLive with a model and tokenizer.
 
@@ -30,11 +30,15 @@ class MultiLingualTranslatorLive:
             model_path (str): Path or identifier of the CTranslate2 model.
             compute_type (str): The compute type for the model (e.g., "int8_float16").
             device (str): The compute device to use (e.g., "cuda" or "cpu").
+            intra_threads (int): CPU threads per translation, 0 for the CTranslate2 default.
+            inter_threads (int): Translations run in parallel.
         """
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
 
-        self.translator = ctranslate2.Translator(model_path, compute_type=compute_type, device=device)
+        self.translator = ctranslate2.Translator(
+            model_path, compute_type=compute_type, device=device, intra_threads=intra_threads, inter_threads=inter_threads
+        )
         self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_path)
         self.logger.info("MultiLingualTranslatorLive has been initialized successfully.")
 
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from faster_whisper.audio import decode_audio
+
+from whisper_live.transcriber import WhisperModel
+
+RATE = 16000
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "whisper_live", "autotune.json")
+COMPUTE_TYPES = ("int8", "int8_float32", "float32")
+# first three formants (Hz) of the vowels /a/, /i/, /e/, /o/, /u/ and /ae/
+VOWEL_FORMANTS = ((730, 1090, 2440), (270, 2290, 3010), (530, 1840, 2480), (570, 840, 2410), (300, 870, 2240), (660, 1720, 2410))
+
+
+class TuneConfig(NamedTuple):
+    """CPU configuration of the model replicas.
+
+    Attributes:
+      compute_type: CTranslate2 compute type of the weights.
+      cpu_threads: Intra-op threads of every replica.
+      num_workers: Parallel workers (inter_threads) of every replica.
+    """
+
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+
+
+class TuneResult(NamedTuple):
+    """Measured performance of a configuration.
+
+    Attributes:
+      config: The configuration.
+      latency: 90th percentile of the seconds a window took with every worker busy.
+      throughput: Seconds of audio transcribed per wall second.
+    """
+
+    config: TuneConfig
+    latency: float
+    throughput: float
+
+    def to_dict(self):
+        return {**self.config._asdict(), "latency": round(self.latency, 3), "throughput": round(self.throughput, 3)}
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(TuneConfig(entry["compute_type"], entry["cpu_threads"], entry["num_workers"]), entry["latency"], entry["throughput"])
+
+
+def cpu_model() -> str:
+    """Name of the CPU, from /proc/cpuinfo on Linux."""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def available_cpus() -> int:
+    """Number of cores the process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def model_hash(model_path: str, head_bytes: int = 1 << 20) -> str:
+    """
+    Fingerprint of a converted model directory: the name and size of every file and the first
+    `head_bytes` of its content. Hashing the whole weights would take longer than a search.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(model_path)):
+        path = os.path.join(model_path, name)
+        if not os.path.isfile(path):
+            continue
+        digest.update(f"{name}:{os.path.getsize(path)}".encode())
+        with open(path, "rb") as model_file:
+            digest.update(model_file.read(head_bytes))
+    return digest.hexdigest()[:16]
+
+
+def candidate_configs(cpus: int, compute_types: Sequence[str] = COMPUTE_TYPES) -> List[TuneConfig]:
+    """
+    Configurations that use at most `cpus` cores: all cores, half of them or a quarter as
+    intra-op threads, times 1, 2 or 4 workers.
+    """
+    threads = sorted({max(1, cpus // divisor) for divisor in (1, 2, 4)}, reverse=True)
+    return [
+        TuneConfig(compute_type, cpu_threads, num_workers)
+        for compute_type in compute_types
+        for cpu_threads in threads
+        for num_workers in (1, 2, 4)
+        if cpu_threads * num_workers <= cpus
+    ]
+
+
+def select(results: List[TuneResult], target_latency: float) -> TuneResult:
+    """The highest throughput within the target latency, or the lowest latency if none meets it."""
+    within = [result for result in results if result.latency <= target_latency]
+    if within:
+        return max(within, key=lambda result: result.throughput)
+    return min(results, key=lambda result: result.latency)
+
+
+def measure(model_path: str, config: TuneConfig, audio: np.ndarray, rounds: int = 3, language: str = "en") -> TuneResult:
+    """
+    Loads the model with `config` and transcribes `audio` as a window, `rounds` times on
+    every worker at once after a warm-up call.
+    """
+    model = WhisperModel(
+        model_path,
+        device="cpu",
+        compute_type=config.compute_type,
+        cpu_threads=config.cpu_threads,
+        num_workers=config.num_workers,
+    )
+
+    def transcribe(_=None):
+        start = time.perf_counter()
+        segments, _ = model.transcribe(audio, language=language, vad_filter=False)
+        list(segments)
+        return time.perf_counter() - start
+
+    transcribe()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config.num_workers) as executor:
+        latencies = list(executor.map(transcribe, range(rounds * config.num_workers)))
+    elapsed = time.perf_counter() - start
+    return TuneResult(config, float(np.percentile(latencies, 90)), len(latencies) * len(audio) / RATE / elapsed)
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Speech-like signal, the built-in sample of the search: voiced syllables with a gliding
+    pitch and vowel formants, fricative noise between them and pauses between words, at
+    about four syllables per second. It keeps the encoder and decoder busy like a recording
+    of the same length, but the decoded text and its length differ from real speech.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    position = 0
+    while position < total:
+        for _ in range(rng.integers(1, 4)):
+            length = int(rng.uniform(0.12, 0.25) * RATE)
+            t = np.arange(length) / RATE
+            pitch = rng.uniform(100, 180) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(1, 3) * t))
+            phase = 2 * np.pi * np.cumsum(pitch) / RATE
+            harmonics = np.arange(1, int(4000 / pitch.max()) + 1)
+            frequencies = harmonics * pitch.mean()
+            # glottal roll-off shaped by the resonances of the vowel
+            formants = VOWEL_FORMANTS[rng.integers(len(VOWEL_FORMANTS))]
+            envelope = sum(1 / (1 + ((frequencies - formant) / 80) ** 2) for formant in formants) / harmonics
+            voiced = (envelope[:, None] * np.sin(harmonics[:, None] * phase)).sum(axis=0) * np.hanning(length)
+            fricative = int(rng.uniform(0.03, 0.08) * RATE)
+            syllable = np.concatenate([
+                0.5 * voiced / np.abs(voiced).max(),
+                0.05 * rng.standard_normal(fricative) * np.hanning(fricative) * (rng.random() < 0.4),
+            ])
+            end = min(total, position + len(syllable))
+            audio[position:end] = syllable[:end - position]
+            position = end
+        position += int(rng.uniform(0.1, 0.3) * RATE)
+    return audio
+
+
+def load_sample(audio_path: Optional[str], seconds: float) -> np.ndarray:
+    """
+    The sample of the search as a window of `seconds`: `audio_path` cut or repeated, or the
+    built-in `synthetic_speech` for None.
+
+    Raises:
+        ValueError: If `audio_path` cannot be decoded or holds no audio.
+    """
+    if audio_path is None:
+        return synthetic_speech(seconds)
+    try:
+        sample = decode_audio(audio_path, sampling_rate=RATE)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Autotune: cannot load the sample {audio_path}: {e}") from e
+    if len(sample) == 0:
+        raise ValueError(f"Autotune: the sample {audio_path} is empty.")
+    return np.resize(sample, int(seconds * RATE)).astype(np.float32)
+
+
+def load_cache(cache_path: str) -> dict:
+    try:
+        with open(cache_path, encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def autotune(
+    model_path: str,
+    target_latency: float = 1.0,
+    cpus: Optional[int] = None,
+    compute_types: Sequence[str] = COMPUTE_TYPES,
+    audio_path: Optional[str] = None,
+    window_seconds: float = 10.0,
+    cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+) -> TuneResult:
+    """
+    Finds the CPU configuration of a model replica with the highest throughput at the target
+    latency by transcribing a sample with every candidate configuration.
+
+    The result is cached per CPU model, number of cores, model and target latency, so later
+    starts on the same machine skip the search.
+
+    Args:
+        model_path (str): Converted model directory.
+        target_latency (float): Seconds a window may take with every worker busy. Defaults to 1.0.
+        cpus (int, optional): Cores of one replica. Defaults to the cores the process may use.
+        compute_types (sequence): Compute types to try. Defaults to `COMPUTE_TYPES`.
+        audio_path (str, optional): Speech sample transcribed by every candidate. Defaults to
+            the built-in `synthetic_speech`; a recording of the expected speech measures the
+            decoder more faithfully.
+        window_seconds (float): The sample is cut or repeated to a window of this length.
+            Defaults to 10.
+        cache_path (str, optional): JSON file of the results, None disables the cache.
+
+    Returns:
+        TuneResult: The selected configuration and its measured latency and throughput.
+
+    Raises:
+        ValueError: If `audio_path` cannot be loaded, even with a cached result.
+        RuntimeError: If no configuration could be measured.
+    """
+    audio = load_sample(audio_path, window_seconds)
+    cpus = cpus or available_cpus()
+    key = f"{cpu_model()}|{cpus}|{model_hash(model_path)}|{target_latency}"
+    cache = load_cache(cache_path) if cache_path else {}
+    if key in cache:
+        result = TuneResult.from_dict(cache[key])
+        logging.info(f"Autotune: cached configuration {result.config}.")
+        return result
+
+    results = []
+    for config in candidate_configs(cpus, compute_types):
+        try:
+            result = measure(model_path, config, audio)
+        except (ValueError, RuntimeError) as e:
+            # e.g. a compute type the CPU does not support
+            logging.warning(f"Autotune: skipping {config}: {e}")
+            continue
+        logging.info(f"Autotune: {config} latency {result.latency:.3f}s, {result.throughput:.2f} audio s/s")
+        results.append(result)
+    if not results:
+        raise RuntimeError("Autotune: no configuration could be measured.")
+
+    result = select(results, target_latency)
+    logging.info(f"Autotune: selected {result.config}.")
+    if cache_path:
+        cache = load_cache(cache_path)
+        cache[key] = result.to_dict()
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file, indent=2)
+    return result
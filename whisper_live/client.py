@@ -13,6 +13,13 @@ import uuid
 import time
 import ffmpeg
 import whisper_live.utils as utils
+from whisper_live.protocol import (
+    PROTOCOL_VERSION,
+    SAMPLE_FORMATS,
+    SAMPLE_FORMAT_INT16,
+    encode_audio_frame,
+    encode_control_frame,
+)
 
 
 class Client:
@@ -30,7 +37,10 @@ class Client:
             srt_file_path="output.srt",
             use_vad=True,
             log_transcription=True,
-            ignore_ssl_cert=False  # New parameter to control SSL verification
+            ignore_ssl_cert=False,  # New parameter to control SSL verification
+            binary_protocol=False,
+            sample_format="int16",
+            priority=None
     ):
         """
         Initializes a Client instance for audio recording and streaming to a server.
@@ -45,7 +55,14 @@ class Client:
             lang (str, optional): The selected language for transcription. Default is None.
             translate (bool, optional): Specifies if the task is translation. Default is False.
             ignore_ssl_cert (bool, optional): Specifies if SSL certificate should be ignored.
-        """
+            binary_protocol (bool, optional): Request binary audio frames instead of base64 JSON
+                packets. Only used if the server acknowledges it in SERVER_READY. Default is False.
+            sample_format (str, optional): PCM format of binary audio frames, "int16" or "float32".
+            priority (str, optional): Scheduling priority class requested from the server,
+                "high", "normal" or "low". Default is None, i.e. the server default.
+        """
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Invalid sample_format {sample_format}. Choose from {list(SAMPLE_FORMATS)}")
         self.recording = False
         self.task = "translate" if translate else "transcribe"
         self.uid = uid
@@ -62,6 +79,12 @@ class Client:
         self.log_transcription = log_transcription
         self.audio_bytes = None
         self.ignore_ssl_cert = ignore_ssl_cert  # Store the SSL flag
+        self.binary_protocol = binary_protocol
+        self.sample_format = SAMPLE_FORMATS[sample_format]
+        self.priority = priority
+        self.use_binary_frames = False
+        self.sequence = 0
+        self.last_control = None
         if translate:
             self.task = "translate"
 
@@ -160,6 +183,7 @@ class Client:
             self.last_response_received = time.time()
             self.recording = True
             self.server_backend = message["backend"]
+            self.use_binary_frames = self.binary_protocol and message.get("protocol") == PROTOCOL_VERSION
             print(f"[INFO]: Server Running with backend {self.server_backend}")
             return
 
@@ -197,17 +221,18 @@ class Client:
 
         """
         print("[INFO]: Opened connection")
-        ws.send(
-            json.dumps(
-                {
-                    "uid": self.uid,
-                    "language": self.language,
-                    "task": self.task,
-                    "model": self.model,
-                    "use_vad": self.use_vad
-                }
-            )
-        )
+        options = {
+            "uid": self.uid,
+            "language": self.language,
+            "task": self.task,
+            "model": self.model,
+            "use_vad": self.use_vad
+        }
+        if self.binary_protocol:
+            options["protocol"] = PROTOCOL_VERSION
+        if self.priority is not None:
+            options["priority"] = self.priority
+        ws.send(json.dumps(options))
 
     def send_packet_to_server(self, message):
         """
@@ -222,6 +247,29 @@ class Client:
         except Exception as e:
             print(e)
 
+    def send_audio_frame(self, audio_array, speaker_lang=None, all_langs=None):
+        """
+        Send an audio packet to the server as a binary frame.
+
+        A control frame is sent first whenever the speaker language settings differ from
+        the ones sent previously.
+
+        Args:
+            audio_array (bytes): float32 audio samples in bytes.
+            speaker_lang (str, optional): Language of the speaker.
+            all_langs (list, optional): Languages to translate into.
+        """
+        if (speaker_lang, all_langs) != self.last_control:
+            self.send_packet_to_server(encode_control_frame(self.sequence, speaker_lang, all_langs))
+            self.sequence += 1
+            self.last_control = (speaker_lang, all_langs)
+
+        samples = np.frombuffer(audio_array, dtype=np.float32)
+        if self.sample_format == SAMPLE_FORMAT_INT16:
+            samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        self.send_packet_to_server(encode_audio_frame(samples, self.sequence, sample_format=self.sample_format))
+        self.sequence += 1
+
     def close_websocket(self):
         """
         Close the WebSocket connection and join the WebSocket thread.
@@ -357,19 +405,45 @@ class TranscriptionTeeClient:
 
         Args:
             packet (bytes): The audio data packet in bytes to be sent.
+            speaker_lang (str, optional): Language of the speaker.
+            all_langs (list, optional): Languages to translate into.
             unconditional (bool, optional): If true, send regardless of whether clients are recording.  Default is False.
+
+        Clients that negotiated the binary protocol get a binary audio frame (and a control frame
+        when the language settings change); all other clients get the base64 JSON packet.
         """
+        json_packet = None
+        for client in self.clients:
+            if not (unconditional or client.recording):
+                continue
+            if client.use_binary_frames:
+                client.send_audio_frame(audio_array, speaker_lang, all_langs)
+                continue
+            if json_packet is None:
+                json_packet = self.json_packet(audio_array, speaker_lang, all_langs)
+            client.send_packet_to_server(json_packet)
+
+    @staticmethod
+    def json_packet(audio_array, speaker_lang, all_langs):
+        """Builds the base64-in-JSON audio packet used by clients without binary frames."""
         audio_base64 = base64.b64encode(audio_array).decode('utf-8')
-        packet = {
+        return json.dumps({
             "speakerLang": speaker_lang,
             "allLangs": all_langs,
             "audio": audio_base64
-        }
+        })
 
-        json_packet = json.dumps(packet)
+    def multicast_end_of_audio(self):
+        """Notifies the server of every client that no more audio will be sent."""
+        end_of_audio = Client.END_OF_AUDIO.encode('utf-8')
+        json_packet = None
         for client in self.clients:
-            if (unconditional or client.recording):
-                client.send_packet_to_server(json_packet)
+            if client.use_binary_frames:
+                client.send_packet_to_server(end_of_audio)
+                continue
+            if json_packet is None:
+                json_packet = self.json_packet(end_of_audio, 'ru', ["en", "fa", "ur", "ru", "no", "ar"])
+            client.send_packet_to_server(json_packet)
 
     def play_file(self, filename):
         """
@@ -410,7 +484,7 @@ class TranscriptionTeeClient:
 
                 for client in self.clients:
                     client.wait_before_disconnect()
-                self.multicast_packet(Client.END_OF_AUDIO.encode('utf-8'), unconditional=True)
+                self.multicast_end_of_audio()
                 self.write_all_clients_srt()
                 self.stream.close()
                 self.close_all_clients()
@@ -671,6 +745,9 @@ class TranscriptionClient(TranscriptionTeeClient):
         save_output_recording (bool, optional): Indicates whether to save recording from microphone.
         output_recording_filename (str, optional): File to save the output recording.
         output_transcription_path (str, optional): File to save the output transcription.
+        binary_protocol (bool, optional): Stream audio as binary frames instead of base64 JSON packets.
+        sample_format (str, optional): PCM format of binary audio frames, "int16" or "float32".
+        priority (str, optional): Scheduling priority class requested from the server.
 
     Attributes:
         client (Client): An instance of the underlying Client class responsible for handling the WebSocket connection.
@@ -695,8 +772,11 @@ class TranscriptionClient(TranscriptionTeeClient):
         output_transcription_path="./output.srt",
         log_transcription=True,
         ignore_ssl_cert=False,
+        binary_protocol=False,
+        sample_format="int16",
+        priority=None,
     ):
-        self.client = Client(host=host, port= port, lang = lang, translate=translate, model=model, srt_file_path=output_transcription_path, use_vad=use_vad, log_transcription=log_transcription,ignore_ssl_cert=ignore_ssl_cert)
+        self.client = Client(host=host, port= port, lang = lang, translate=translate, model=model, srt_file_path=output_transcription_path, use_vad=use_vad, log_transcription=log_transcription,ignore_ssl_cert=ignore_ssl_cert, binary_protocol=binary_protocol, sample_format=sample_format, priority=priority)
         if save_output_recording and not output_recording_filename.endswith(".wav"):
             raise ValueError(f"Please provide a valid `output_recording_filename`: {output_recording_filename}")
         if not output_transcription_path.endswith(".srt"):
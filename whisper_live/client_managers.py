@@ -86,7 +86,17 @@ class ClientManager:
 
 
 class SpeakerManager(ClientManager):
-    pass
+    def remove_client(self, websocket):
+        """
+        Removes a speaker and stops its transcription thread.
+
+        The transcription loop sleeps until it is signalled, so it has to be told explicitly
+        that the client is gone.
+        """
+        client = self.clients.get(websocket)
+        if client:
+            client.cleanup()
+        super().remove_client(websocket)
 
 
 class ListenerManager(ClientManager):
@@ -0,0 +1,165 @@
+import string
+from typing import List, NamedTuple, Optional
+
+COMMIT_POLICIES = ("segments", "local_agreement")
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+class TimedWord(NamedTuple):
+    """A word of a hypothesis with its absolute start and end time in seconds, and its
+    probability if it comes from the word alignment of the transcriber."""
+
+    start: float
+    end: float
+    text: str
+    probability: Optional[float] = None
+
+
+class CommitUpdate(NamedTuple):
+    """Result of `LocalAgreement.update`.
+
+    Attributes:
+      committed: Words committed by this hypothesis, final from now on.
+      tentative: The rest of the hypothesis, which may still change.
+      trim: Absolute time up to which the audio is fully committed and can be dropped from
+        the next window, or None.
+    """
+
+    committed: List[TimedWord]
+    tentative: List[TimedWord]
+    trim: Optional[float]
+
+
+def normalize_word(text: str) -> str:
+    return text.lower().translate(_PUNCTUATION).strip()
+
+
+def segment_words(segment, offset: float, duration: float) -> List[TimedWord]:
+    """
+    Words of a transcribed segment with absolute times. Uses the word timestamps of the
+    segment if it has any, otherwise spreads the segment's time span over its words in
+    proportion to their length.
+
+    Args:
+        segment: A `whisper_live.transcriber.Segment`, times relative to the window.
+        offset (float): Absolute time of the start of the window.
+        duration (float): Duration of the window, segment times are clipped to it.
+    """
+    if getattr(segment, "words", None):
+        return [
+            TimedWord(offset + word.start, offset + min(duration, word.end), word.word, word.probability)
+            for word in segment.words
+        ]
+    words = [" " + word for word in segment.text.split()]
+    start, end = offset + segment.start, offset + min(duration, segment.end)
+    total = sum(len(word) for word in words)
+    timed, position = [], 0
+    for word in words:
+        word_start = start + (end - start) * position / total
+        position += len(word)
+        timed.append(TimedWord(word_start, start + (end - start) * position / total, word))
+    return timed
+
+
+def common_prefix(words: List[TimedWord], other: List[TimedWord]) -> int:
+    """Number of leading words the two hypotheses agree on."""
+    length = 0
+    for word, other_word in zip(words, other):
+        if normalize_word(word.text) != normalize_word(other_word.text):
+            break
+        length += 1
+    return length
+
+
+class LocalAgreement:
+    """
+    Streaming commit policy confirming what consecutive hypotheses agree on.
+
+    Every transcription pass yields a hypothesis for the pending window. The words that the
+    last `agreement` hypotheses share as a common prefix (after the words committed before)
+    are committed at once. Once all words of a segment are committed, the audio up to the
+    end of that segment is trimmed from the window, so the next pass decodes only the audio
+    that is not settled yet. Committed words whose segment is still in the window are
+    skipped in later hypotheses.
+
+    With word timestamps from the transcriber, the audio is also trimmed within a segment,
+    between the last committed word and the next one. Otherwise segment ends are the only
+    trim points: they come from Whisper's timestamp tokens, while word times are only
+    estimated from the segment span.
+
+    Args:
+        agreement (int): Number of consecutive hypotheses that must agree. Defaults to 2.
+    """
+
+    def __init__(self, agreement: int = 2):
+        if agreement < 1:
+            raise ValueError(f"agreement must be at least 1, got {agreement}")
+        self.agreement = agreement
+        self.committed: List[TimedWord] = []  # committed words still in the window
+        self.hypotheses: List[List[TimedWord]] = []  # uncommitted rest of the previous hypotheses
+
+    def reset(self):
+        """Forgets the window, e.g. after audio was skipped."""
+        self.committed = []
+        self.hypotheses = []
+
+    def skip_committed(self, hypothesis: List[TimedWord]) -> int:
+        """Number of leading words of the hypothesis that were committed already."""
+        skipped = common_prefix(hypothesis, self.committed)
+        if skipped < len(self.committed):
+            # the hypothesis rephrased committed words: skip what lies within their time span
+            end = self.committed[-1].end
+            while skipped < len(hypothesis) and (hypothesis[skipped].start + hypothesis[skipped].end) / 2 <= end:
+                skipped += 1
+        return skipped
+
+    def update(self, segments, offset: float, duration: float, final: bool = False) -> CommitUpdate:
+        """
+        Takes the hypothesis of a transcription pass.
+
+        Args:
+            segments (list): Transcribed segments of the window, times relative to it.
+            offset (float): Absolute time of the start of the window.
+            duration (float): Duration of the window.
+            final (bool): Commit the whole hypothesis, e.g. because the speaker stopped talking.
+
+        Returns:
+            CommitUpdate: The newly committed words, the tentative rest and the trim point.
+        """
+        words_per_segment = [segment_words(segment, offset, duration) for segment in segments]
+        hypothesis = [word for words in words_per_segment for word in words]
+        skipped = self.skip_committed(hypothesis)
+        new = hypothesis[skipped:]
+
+        if final:
+            agreed = len(new)
+        elif len(self.hypotheses) < self.agreement - 1:
+            agreed = 0
+        else:
+            agreed = min((common_prefix(new, previous) for previous in self.hypotheses), default=len(new))
+        committed, tentative = new[:agreed], new[agreed:]
+        self.committed.extend(committed)
+        if final:
+            self.hypotheses = []
+        else:
+            hypotheses = [previous[agreed:] for previous in self.hypotheses] + [tentative]
+            self.hypotheses = hypotheses[len(hypotheses) - (self.agreement - 1):]
+
+        # trim at the end of the last segment whose words are all committed, or within the
+        # segment after the last committed word if its words are aligned
+        covered = skipped + agreed
+        trim, trimmed, count = None, 0, 0
+        for segment, words in zip(segments, words_per_segment):
+            if count + len(words) > covered:
+                if getattr(segment, "words", None) and covered > count:
+                    last, following = words[covered - count - 1], words[covered - count]
+                    # never into the next word, which is not committed yet
+                    trim, trimmed = min(following.start, (last.end + following.start) / 2), covered
+                break
+            count += len(words)
+            trim, trimmed = offset + min(duration, segment.end), count
+        if trim is not None:
+            remaining = covered - trimmed
+            self.committed = self.committed[max(0, len(self.committed) - remaining):] if remaining else []
+        return CommitUpdate(committed, tentative, trim)
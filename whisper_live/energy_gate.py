@@ -0,0 +1,93 @@
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class GateOptions(NamedTuple):
+    """Energy gate options.
+
+    Attributes:
+      silence_db: Windows with an RMS energy below this level (dBFS) are always silent.
+      margin_db: Windows at most this far above the noise floor are silent if they are also
+        noise-like, i.e. their spectral flatness is at least `flatness_threshold`.
+      flatness_threshold: Spectral flatness (geometric over arithmetic mean of the power
+        spectrum) from which a window counts as noise. White noise is around 0.56, voiced
+        speech mostly below 0.2.
+      floor_rise_db: Decibels per second the noise floor rises while the energy stays above
+        it, starting from `silence_db`. The floor follows falling energy immediately, down to
+        `silence_db`.
+      hangover_ms: Windows within this time after a window that was not silent are passed on,
+        so the neural VAD sees the onsets and tails of speech.
+    """
+
+    silence_db: float = -60.0
+    margin_db: float = 10.0
+    flatness_threshold: float = 0.3
+    floor_rise_db: float = 2.0
+    hangover_ms: int = 300
+
+
+class EnergyGate:
+    """Cheap first-stage silence detector in front of the neural VAD.
+
+    Classifies every window by its RMS energy and spectral flatness against an adaptive noise
+    floor. Windows it marks silent are certainly silence and need not be scored by Silero nor
+    transcribed; everything else is borderline and left to the neural VAD.
+
+    Args:
+      options: Gate options.
+      window_size_samples: Samples per window, matching the VAD windows.
+      sampling_rate: Sampling rate of the audio.
+    """
+
+    def __init__(
+        self,
+        options: Optional[GateOptions] = None,
+        window_size_samples: int = 512,
+        sampling_rate: int = 16000,
+    ):
+        self.options = options or GateOptions()
+        self.window_size_samples = window_size_samples
+        window_duration = window_size_samples / sampling_rate
+        self.floor_rise = self.options.floor_rise_db * window_duration
+        self.hangover_windows = int(round(self.options.hangover_ms / 1000 / window_duration))
+        self.noise_floor = self.options.silence_db
+        self.hangover = 0
+
+    @staticmethod
+    def features(windows: np.ndarray):
+        """RMS energy in dBFS and spectral flatness of every row of `windows`."""
+        energy_db = 10 * np.log10(np.mean(np.square(windows, dtype=np.float64), axis=1) + 1e-12)
+        power = np.abs(np.fft.rfft(windows, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return energy_db, flatness
+
+    def __call__(self, windows: np.ndarray) -> np.ndarray:
+        """Classifies consecutive windows of the stream.
+
+        Args:
+          windows: Array of shape (n_windows, window_size_samples).
+
+        Returns:
+          Boolean array, True for the windows that are certainly silent.
+        """
+        energy_db, flatness = self.features(windows)
+        silent = np.zeros(len(windows), dtype=bool)
+        for i in range(len(windows)):
+            energy = max(energy_db[i], self.options.silence_db)
+            if energy < self.noise_floor:
+                self.noise_floor = energy
+            else:
+                self.noise_floor = min(energy, self.noise_floor + self.floor_rise)
+
+            quiet = energy_db[i] < self.options.silence_db or (
+                energy_db[i] < self.noise_floor + self.options.margin_db
+                and flatness[i] >= self.options.flatness_threshold
+            )
+            if not quiet:
+                self.hangover = self.hangover_windows
+            elif self.hangover > 0:
+                self.hangover -= 1
+            else:
+                silent[i] = True
+        return silent
@@ -1,21 +1,97 @@
-import torch
+import functools
+
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def hann_window(n_fft: int) -> np.ndarray:
+    """Periodic Hann window of `n_fft` samples, computed once per size."""
+    window = np.hanning(n_fft + 1)[:-1]
+    window.flags.writeable = False
+    return window
 
 
 # Adapted from https://github.com/huggingface/transformers/blob/main/src/transformers/models/whisper/feature_extraction_whisper.py  # noqa: E501
+@functools.lru_cache(maxsize=None)
+def get_mel_filters(sr: int, n_fft: int, n_mels: int = 128) -> np.ndarray:
+    """
+    Implementation of librosa.filters.mel (Slaney scale and norm) in NumPy, computed once
+    per configuration. Returns a read-only float32 array of shape (n_mels, n_fft // 2 + 1).
+    """
+    n_mels = int(n_mels)
+
+    # Center freqs of each FFT bin
+    fftfreqs = np.fft.rfftfreq(n=n_fft, d=1.0 / sr)
+
+    # 'Center freqs' of mel bands - uniformly spaced between limits
+    min_mel = 0.0
+    max_mel = 45.245640471924965
+
+    mels = np.linspace(min_mel, max_mel, n_mels + 2)
+
+    # Fill in the linear scale
+    f_min = 0.0
+    f_sp = 200.0 / 3
+    freqs = f_min + f_sp * mels
+
+    # And now the nonlinear scale
+    min_log_hz = 1000.0  # beginning of log region (Hz)
+    min_log_mel = (min_log_hz - f_min) / f_sp  # same (Mels)
+    logstep = np.log(6.4) / 27.0  # step size for log region
+
+    log_t = mels >= min_log_mel
+    freqs[log_t] = min_log_hz * np.exp(logstep * (mels[log_t] - min_log_mel))
+
+    mel_f = freqs
+
+    fdiff = np.diff(mel_f)
+    ramps = mel_f.reshape(-1, 1) - fftfreqs.reshape(1, -1)
+
+    lower = -ramps[:-2] / fdiff[:-1, None]
+    upper = ramps[2:] / fdiff[1:, None]
+
+    # Intersect them with each other and zero, vectorized across all i
+    weights = np.maximum(0, np.minimum(lower, upper))
+
+    # Slaney-style mel is scaled to be approx constant energy per channel
+    enorm = 2.0 / (mel_f[2 : n_mels + 2] - mel_f[:n_mels])
+    weights *= enorm[:, None]
+
+    weights = weights.astype(np.float32)
+    weights.flags.writeable = False
+    return weights
+
+
 class FeatureExtractor:
+    """
+    Log-mel spectrogram of Whisper, the interface shared by the feature backends.
+
+    The configuration (window, filterbank and the zeros appended to the audio) is computed
+    once per instance and reused by every call. The padding of the input to `chunk_length`
+    seconds is not transformed: frames whose window only covers zeros have a known value, so
+    a backend computes the frames that reach into the audio and the rest is filled in.
+
+    Backends implement `log_mel`; `NumpyFeatureExtractor` reproduces faster_whisper's extractor
+    with one vectorized FFT call, `TorchFeatureExtractor` runs `torch.stft` on CPU or GPU.
+
+    Args:
+        feature_size (int): Number of mel bands. Defaults to 80.
+        sampling_rate (int): Sampling rate of the audio. Defaults to 16000.
+        hop_length (int): Samples between frames. Defaults to 160.
+        chunk_length (int): Seconds of the encoder input. Defaults to 30.
+        n_fft (int): FFT size. Defaults to 400.
+    """
+
+    backend = None
+
     def __init__(
         self,
-        device: str = "auto",
-        feature_size=128,
+        feature_size=80,
         sampling_rate=16000,
         hop_length=160,
         chunk_length=30,
         n_fft=400,
     ):
-        if device == "auto":
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        else:
-            self.device = device
         self.n_fft = n_fft
         self.hop_length = hop_length
         self.chunk_length = chunk_length
@@ -23,92 +99,140 @@ class FeatureExtractor:
         self.nb_max_frames = self.n_samples // hop_length
         self.time_per_frame = hop_length / sampling_rate
         self.sampling_rate = sampling_rate
-        self.mel_filters = self.get_mel_filters(
-            sampling_rate, n_fft, n_mels=feature_size
-        )
+        self.window = hann_window(n_fft)
+        self.mel_filters = get_mel_filters(sampling_rate, n_fft, n_mels=feature_size)
+        self.padding = np.zeros(n_fft, dtype=np.float32)
 
-    @staticmethod
-    def get_mel_filters(sr, n_fft, n_mels=128):
+    def log_mel(self, waveform: np.ndarray, n_frames: int) -> np.ndarray:
         """
-        Implementation of librosa.filters.mel in Pytorch
-        """
-        # Initialize the weights
-        n_mels = int(n_mels)
-
-        # Center freqs of each FFT bin
-        fftfreqs = torch.fft.rfftfreq(n=n_fft, d=1.0 / sr)
-
-        # 'Center freqs' of mel bands - uniformly spaced between limits
-        min_mel = 0.0
-        max_mel = 45.245640471924965
-
-        mels = torch.linspace(min_mel, max_mel, n_mels + 2)
-
-        # Fill in the linear scale
-        f_min = 0.0
-        f_sp = 200.0 / 3
-        freqs = f_min + f_sp * mels
-
-        # And now the nonlinear scale
-        min_log_hz = 1000.0  # beginning of log region (Hz)
-        min_log_mel = (min_log_hz - f_min) / f_sp  # same (Mels)
-        logstep = torch.log(torch.tensor(6.4)) / 27.0  # step size for log region
+        log10 mel power, floored at 1e-10, of the first `n_frames` frames of `waveform`.
 
-        # If we have vector data, vectorize
-        log_t = mels >= min_log_mel
-        freqs[log_t] = min_log_hz * torch.exp(logstep * (mels[log_t] - min_log_mel))
+        Frame `k` is centered on sample `hop_length * k`, reflect padded at both ends.
 
-        mel_f = freqs
-
-        fdiff = torch.diff(mel_f)
-        ramps = mel_f.view(-1, 1) - fftfreqs.view(1, -1)
-
-        lower = -ramps[:-2] / fdiff[:-1].unsqueeze(1)
-        upper = ramps[2:] / fdiff[1:].unsqueeze(1)
-
-        # Intersect them with each other and zero, vectorized across all i
-        weights = torch.maximum(torch.zeros_like(lower), torch.minimum(lower, upper))
-
-        # Slaney-style mel is scaled to be approx constant energy per channel
-        enorm = 2.0 / (mel_f[2 : n_mels + 2] - mel_f[:n_mels])
-        weights *= enorm.unsqueeze(1)
-
-        return weights
+        Returns:
+            np.ndarray: float32 array of shape (n_mels, n_frames).
+        """
+        raise NotImplementedError
 
-    def __call__(self, waveform, padding=True, chunk_length=None, to_cpu=False):
+    def __call__(self, waveform, padding=True, chunk_length=None) -> np.ndarray:
         """
         Compute the log-Mel spectrogram of the provided audio.
-        """
 
+        Args:
+            waveform (np.ndarray): One dimensional float audio.
+            padding (bool): Whether `chunk_length` seconds of zeros are appended, as for the
+                encoder input. Defaults to True.
+            chunk_length (int, optional): Overrides the chunk length of the configuration.
+
+        Returns:
+            np.ndarray: float32 features of shape (n_mels, frames).
+        """
         if chunk_length is not None:
             self.n_samples = chunk_length * self.sampling_rate
             self.nb_max_frames = self.n_samples // self.hop_length
 
-        if waveform.dtype is not torch.float32:
-            waveform = waveform.to(torch.float32)
-
-        waveform = (
-            waveform.to(self.device)
-            if self.device == "cuda" and not waveform.is_cuda
-            else waveform
-        )
-
-        if padding:
-            waveform = torch.nn.functional.pad(waveform, (0, self.n_samples))
-
-        window = torch.hann_window(self.n_fft).to(waveform.device)
-
-        stft = torch.stft(
-            waveform, self.n_fft, self.hop_length, window=window, return_complex=True
-        )
-        magnitudes = stft[..., :-1].abs() ** 2
-
-        mel_spec = self.mel_filters.to(waveform.device) @ magnitudes
-
-        log_spec = torch.clamp(mel_spec, min=1e-10).log10()
-        log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
-        log_spec = (log_spec + 4.0) / 4.0
-
-        # When the model is running on multiple GPUs, the output should be moved
-        # to the CPU since we don't know which GPU will handle the next job.
-        return log_spec.cpu() if to_cpu else log_spec
\ No newline at end of file
+        waveform = np.asarray(waveform, dtype=np.float32)
+        if not padding:
+            log_spec = self.log_mel(waveform, waveform.shape[0] // self.hop_length)
+        else:
+            total_frames = (waveform.shape[0] + self.n_samples) // self.hop_length
+            # frames after these only cover zeros of the padding
+            n_frames = min(total_frames, (waveform.shape[0] + self.n_fft // 2 - 1) // self.hop_length + 1)
+            log_spec = np.full((len(self.mel_filters), total_frames), -10.0, dtype=np.float32)
+            log_spec[:, :n_frames] = self.log_mel(np.concatenate([waveform, self.padding]), n_frames)
+
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+
+class NumpyFeatureExtractor(FeatureExtractor):
+    """
+    NumPy (pocketfft) backend. The frames are strided views of the audio transformed by one
+    `np.fft.rfft` call; the frames at the edges are reflect padded like faster_whisper's
+    `fram_wave`, so the output matches faster_whisper's extractor.
+    """
+
+    backend = "numpy"
+
+    def _edge_frame(self, waveform: np.ndarray, center: int) -> np.ndarray:
+        half_window = (self.n_fft - 1) // 2 + 1
+        start = max(0, center - half_window)
+        end = min(waveform.shape[0], center + half_window)
+        frame = waveform[start:end]
+        if start == 0:
+            frame = np.pad(frame, (half_window - center, 0), mode="reflect")
+        if end == waveform.shape[0]:
+            frame = np.pad(frame, (0, center - waveform.shape[0] + half_window), mode="reflect")
+        return frame
+
+    def log_mel(self, waveform, n_frames):
+        half_window = (self.n_fft - 1) // 2 + 1
+        centers = np.arange(n_frames) * self.hop_length
+        interior = (centers > half_window) & (centers < waveform.shape[0] - half_window)
+
+        frames = np.empty((n_frames, self.n_fft), dtype=np.float32)
+        if interior.any():
+            windows = np.lib.stride_tricks.sliding_window_view(waveform, self.n_fft)
+            frames[interior] = windows[centers[interior] - half_window]
+        for frame in np.flatnonzero(~interior):
+            frames[frame] = self._edge_frame(waveform, centers[frame])
+
+        spectrum = np.fft.rfft(frames * self.window, axis=1).astype(np.complex64)
+        mel = (np.abs(spectrum) ** 2) @ self.mel_filters.T
+        return np.log10(np.maximum(mel, 1e-10)).T
+
+
+class TorchFeatureExtractor(FeatureExtractor):
+    """
+    torch backend running `torch.stft` on `device`. The window and the filterbank are moved
+    to the device once.
+
+    Args:
+        device (str): "cpu", "cuda" or "auto" for the GPU if available. Defaults to "auto".
+        **kwargs: The configuration, see `FeatureExtractor`.
+    """
+
+    backend = "torch"
+
+    def __init__(self, device="auto", **kwargs):
+        try:
+            import torch
+        except ImportError as e:
+            raise RuntimeError("The torch feature backend requires torch to be installed.") from e
+        super().__init__(**kwargs)
+        self.torch = torch
+        if device == "auto":
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = device
+        self.window_tensor = torch.hann_window(self.n_fft, device=device)
+        self.mel_filters_tensor = torch.from_numpy(np.array(self.mel_filters)).to(device)
+
+    def log_mel(self, waveform, n_frames):
+        torch = self.torch
+        with torch.inference_mode():
+            waveform = torch.from_numpy(waveform).to(self.device)
+            stft = torch.stft(
+                waveform, self.n_fft, self.hop_length, window=self.window_tensor, return_complex=True
+            )
+            magnitudes = stft[..., :n_frames].abs() ** 2
+            mel_spec = self.mel_filters_tensor @ magnitudes
+            return torch.clamp(mel_spec, min=1e-10).log10().cpu().numpy()
+
+
+FEATURE_BACKENDS = {
+    NumpyFeatureExtractor.backend: NumpyFeatureExtractor,
+    TorchFeatureExtractor.backend: TorchFeatureExtractor,
+}
+
+
+def get_feature_extractor(backend="numpy", **kwargs) -> FeatureExtractor:
+    """
+    Creates the feature extractor of a backend.
+
+    Args:
+        backend (str): One of `FEATURE_BACKENDS`, "numpy" or "torch". Defaults to "numpy".
+        **kwargs: The configuration, see `FeatureExtractor` (and `device` for torch).
+    """
+    if backend not in FEATURE_BACKENDS:
+        raise ValueError(f"Unknown feature backend {backend!r}, choose from {list(FEATURE_BACKENDS)}")
+    return FEATURE_BACKENDS[backend](**kwargs)
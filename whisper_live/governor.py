@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+
+class DecodingLevel(NamedTuple):
+    """Decoding options of one quality level, passed to `WhisperModel.transcribe(_batch)`."""
+
+    name: str
+    beam_size: int
+    best_of: int
+    patience: float
+    temperatures: Tuple[float, ...]
+    max_new_tokens: Optional[int]
+
+
+# from the transcriber defaults down to greedy decoding without fallback
+DECODING_LEVELS = (
+    DecodingLevel("full", 3, 3, 1.5, (0.0, 0.2, 0.4, 0.6, 0.8, 1.0), None),
+    DecodingLevel("reduced", 2, 2, 1.0, (0.0, 0.4, 0.8), None),
+    DecodingLevel("greedy", 1, 1, 1.0, (0.0, 0.6), 128),
+    DecodingLevel("minimal", 1, 1, 1.0, (0.0,), 64),
+)
+
+
+class GovernorOptions(NamedTuple):
+    """Decoding governor options.
+
+    Attributes:
+      high_lag: Seconds a session may lag behind real time before decoding steps down.
+      low_lag: Lag every session must stay below for decoding to step back up.
+      high_utilization: Busy share of the model (busy seconds per wall second and replica,
+        i.e. its aggregate real-time factor) from which decoding steps down.
+      low_utilization: Busy share below which decoding may step back up.
+      high_queue: Queued windows per replica from which decoding steps down.
+      interval: Minimum seconds between two load samples and between two step-downs.
+      recovery: Seconds the load must stay low before decoding steps back up.
+    """
+
+    high_lag: float = 3.0
+    low_lag: float = 1.0
+    high_utilization: float = 0.9
+    low_utilization: float = 0.6
+    high_queue: float = 2.0
+    interval: float = 2.0
+    recovery: float = 10.0
+
+
+class LoadSample(NamedTuple):
+    """Load of the server when it is sampled.
+
+    Attributes:
+      max_lag: Largest lag behind real time of the sessions, in seconds.
+      queued: Windows waiting for the model.
+      busy_seconds: Seconds the replicas spent busy since the server started, summed.
+    """
+
+    max_lag: float
+    queued: int
+    busy_seconds: float
+
+
+class DecodingGovernor:
+    """
+    Trades decoding quality for throughput according to the load of the server.
+
+    Every `interval` seconds the governor samples the load: the largest session lag, the
+    number of queued windows and how busy the model replicas were since the last sample.
+    When any of them is above its high threshold, decoding steps down one level (smaller
+    beam and `best_of`, fewer fallback temperatures, fewer new tokens), and the reason is
+    logged. Once all of them stayed below their low thresholds for `recovery` seconds, it
+    steps back up one level.
+
+    Args:
+        sample_load (callable): Returns the current `LoadSample`.
+        capacity (int): Number of model replicas. Defaults to 1.
+        options (GovernorOptions, optional): Thresholds.
+        levels (tuple): Decoding levels from the best to the cheapest. Defaults to `DECODING_LEVELS`.
+    """
+
+    def __init__(
+        self,
+        sample_load: Callable[[], LoadSample],
+        capacity: int = 1,
+        options: Optional[GovernorOptions] = None,
+        levels: Tuple[DecodingLevel, ...] = DECODING_LEVELS,
+    ):
+        self.sample_load = sample_load
+        self.capacity = max(1, capacity)
+        self.options = options or GovernorOptions()
+        self.levels = levels
+        self.level = 0
+        self.lock = threading.Lock()
+        self.last_sample_time = None
+        self.next_sample_time = float("-inf")
+        self.last_busy_seconds = 0.0
+        self.last_change = float("-inf")
+        self.low_since = None
+        self.utilization = 0.0
+        self.last_sample: Optional[LoadSample] = None
+        self.step_downs = 0
+        self.step_ups = 0
+
+    @property
+    def current(self) -> DecodingLevel:
+        return self.levels[self.level]
+
+    def overload_reasons(self, sample: LoadSample, utilization: float) -> List[str]:
+        """The high thresholds the sample exceeds."""
+        reasons = []
+        if sample.max_lag > self.options.high_lag:
+            reasons.append(f"session lag {sample.max_lag:.1f}s > {self.options.high_lag:.1f}s")
+        if utilization > self.options.high_utilization:
+            reasons.append(f"model utilization {utilization:.2f} > {self.options.high_utilization:.2f}")
+        queue = sample.queued / self.capacity
+        if queue > self.options.high_queue:
+            reasons.append(f"{queue:.1f} queued windows per replica > {self.options.high_queue:.1f}")
+        return reasons
+
+    def update(self, sample: LoadSample, now: Optional[float] = None) -> int:
+        """
+        Takes a load sample and steps the decoding level.
+
+        Returns:
+            int: -1 if decoding stepped down, 1 if it stepped up, 0 otherwise.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            if self.last_sample_time is not None and now > self.last_sample_time:
+                busy = sample.busy_seconds - self.last_busy_seconds
+                self.utilization = busy / ((now - self.last_sample_time) * self.capacity)
+            self.last_sample_time = now
+            self.last_busy_seconds = sample.busy_seconds
+            self.last_sample = sample
+
+            reasons = self.overload_reasons(sample, self.utilization)
+            if reasons:
+                self.low_since = None
+                if self.level + 1 < len(self.levels) and now - self.last_change >= self.options.interval:
+                    self.level += 1
+                    self.last_change = now
+                    self.step_downs += 1
+                    logging.warning(
+                        f"Decoding stepped down to level '{self.current.name}': {', '.join(reasons)}"
+                    )
+                    return -1
+                return 0
+
+            low = (
+                sample.max_lag < self.options.low_lag
+                and self.utilization < self.options.low_utilization
+                and sample.queued == 0
+            )
+            if not low:
+                self.low_since = None
+                return 0
+            if self.low_since is None:
+                self.low_since = now
+            if self.level > 0 and now - self.low_since >= self.options.recovery:
+                self.level -= 1
+                self.last_change = now
+                self.low_since = now
+                self.step_ups += 1
+                logging.info(f"Decoding stepped up to level '{self.current.name}': load is low again")
+                return 1
+            return 0
+
+    def decode_options(self, now: Optional[float] = None) -> dict:
+        """
+        Decoding options of the current level, sampling the load first if `interval`
+        seconds have passed since the last sample.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            due = now >= self.next_sample_time
+            if due:
+                self.next_sample_time = now + self.options.interval
+        if due:
+            self.update(self.sample_load(), now)
+        level = self.current
+        return {
+            "beam_size": level.beam_size,
+            "best_of": level.best_of,
+            "patience": level.patience,
+            "temperature": list(level.temperatures),
+            "max_new_tokens": level.max_new_tokens,
+        }
+
+    def get_status(self):
+        with self.lock:
+            sample = self.last_sample
+            return {
+                "level": self.current.name,
+                "step_downs": self.step_downs,
+                "step_ups": self.step_ups,
+                "utilization": round(self.utilization, 3),
+                "max_lag": round(sample.max_lag, 3) if sample else 0.0,
+                "queued": sample.queued if sample else 0,
+            }
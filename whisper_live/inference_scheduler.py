@@ -0,0 +1,256 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple, Optional
+
+from whisper_live.transcriber import TranscriptionRequest
+
+# latency target in seconds of every priority class: a window is due this long after the
+# oldest audio it contains was received
+PRIORITY_CLASSES = {
+    "high": 2.0,
+    "normal": 5.0,
+    "low": 15.0,
+}
+DEFAULT_PRIORITY = "normal"
+
+
+class PendingRequest(NamedTuple):
+    deadline: float
+    order: int
+    request: TranscriptionRequest
+    future: Future
+    session_uid: Optional[str]
+    submitted: float
+
+
+class SessionStats:
+    """
+    Scheduling counters of one session.
+
+    Attributes:
+        priority (str): Priority class of the session, see `PRIORITY_CLASSES`.
+        lag (float): Seconds of audio the session was behind real time at its last window.
+        max_lag (float): Largest lag seen.
+        windows (int): Windows transcribed.
+        wait_time (float): Total seconds its windows spent queued.
+        deadline_misses (int): Windows that started after their deadline.
+        skipped_batches (int): Batches that ran while a window of the session stayed queued.
+        dropped_audio (float): Seconds of audio the session discarded because it fell behind.
+    """
+
+    def __init__(self, priority=DEFAULT_PRIORITY):
+        self.priority = priority
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.windows = 0
+        self.wait_time = 0.0
+        self.deadline_misses = 0
+        self.skipped_batches = 0
+        self.dropped_audio = 0.0
+
+    def to_dict(self):
+        return {
+            "priority": self.priority,
+            "lag": round(self.lag, 3),
+            "max_lag": round(self.max_lag, 3),
+            "windows": self.windows,
+            "mean_wait": round(self.wait_time / self.windows, 4) if self.windows else 0.0,
+            "deadline_misses": self.deadline_misses,
+            "skipped_batches": self.skipped_batches,
+            "dropped_audio": round(self.dropped_audio, 3),
+        }
+
+
+class InferenceScheduler:
+    """
+    Runs the transcription windows of all sessions through one shared model in batches.
+
+    Session threads submit a `TranscriptionRequest` and block on the returned future. A
+    worker thread takes the pending window with the earliest deadline, waits up to `max_wait`
+    seconds for more to arrive, and transcribes the (up to `max_batch_size`) earliest-deadline
+    windows with one `WhisperModel.transcribe_batch` call, i.e. one encoder and one decoder call
+    per step instead of one per session. Results are routed back through the futures.
+
+    A window's deadline is the time its oldest audio was received (now minus the session's
+    lag behind real time) plus the latency target of the session's priority class, so a
+    session that falls behind is served before sessions that are keeping up.
+
+    With a `ModelPool`, one worker per parallel slot of the pool runs batches concurrently,
+    each on the least-loaded replica.
+
+    Args:
+        transcriber (WhisperModel): The shared model.
+        max_batch_size (int): Maximum number of windows per model call. Defaults to 8.
+        max_wait (float): Seconds to wait for further windows once one is pending. Defaults to 0.01.
+        transcribe_options (dict, optional): Extra keyword arguments for `transcribe_batch`.
+        num_workers (int, optional): Worker threads running batches. Defaults to the capacity of
+            the transcriber if it is a `ModelPool`, 1 otherwise.
+        governor (DecodingGovernor, optional): Supplies the decoding options of every batch
+            according to the load of the server.
+    """
+
+    def __init__(self, transcriber, max_batch_size=8, max_wait=0.01, transcribe_options=None, num_workers=None,
+                 governor=None):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        self.transcriber = transcriber
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.transcribe_options = transcribe_options or {}
+        self.governor = governor
+        self.pending: List[PendingRequest] = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.num_workers = num_workers or getattr(transcriber, "capacity", 1)
+        self.threads = []
+        self.sessions: Dict[str, SessionStats] = {}
+        self.batches = 0
+        self.requests = 0
+
+    def start(self):
+        if self.threads:
+            return
+        self.stop_event.clear()
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(self.num_workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        self.cancel_pending()
+
+    def register_session(self, session_uid, priority=DEFAULT_PRIORITY):
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class {priority!r}, choose from {list(PRIORITY_CLASSES)}")
+        with self.condition:
+            self.sessions[session_uid] = SessionStats(priority)
+
+    def unregister_session(self, session_uid):
+        with self.condition:
+            self.sessions.pop(session_uid, None)
+
+    def record_dropped_audio(self, session_uid, seconds):
+        with self.condition:
+            stats = self.sessions.get(session_uid)
+            if stats is not None:
+                stats.dropped_audio += seconds
+
+    def submit(self, request: TranscriptionRequest, session_uid=None, lag=0.0) -> Future:
+        """
+        Queues a window for one of the next batches.
+
+        Args:
+            request (TranscriptionRequest): The window.
+            session_uid (str, optional): Session the window belongs to, used for its priority
+                class and counters.
+            lag (float): Seconds the session is behind real time, i.e. the age of the oldest
+                audio in the window.
+
+        Returns:
+            Future: Resolves to the (segments, info) tuple of the window.
+        """
+        future = Future()
+        now = time.monotonic()
+        with self.condition:
+            stats = self.sessions.get(session_uid)
+            priority = stats.priority if stats is not None else DEFAULT_PRIORITY
+            if stats is not None:
+                stats.lag = lag
+                stats.max_lag = max(stats.max_lag, lag)
+            deadline = now - lag + PRIORITY_CLASSES[priority]
+            heapq.heappush(
+                self.pending,
+                PendingRequest(deadline, next(self.counter), request, future, session_uid, now),
+            )
+            self.condition.notify()
+        return future
+
+    def transcribe(self, request: TranscriptionRequest, session_uid=None, lag=0.0, timeout=None):
+        """Submits a window and blocks until its (segments, info) tuple is available."""
+        return self.submit(request, session_uid, lag).result(timeout=timeout)
+
+    def next_batch(self) -> List[PendingRequest]:
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.pending or self.stop_event.is_set(), timeout=0.1):
+                return []
+            if self.stop_event.is_set():
+                return []
+
+            deadline = time.monotonic() + self.max_wait
+            while len(self.pending) < self.max_batch_size and not self.stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+            batch = [heapq.heappop(self.pending) for _ in range(min(self.max_batch_size, len(self.pending)))]
+
+            now = time.monotonic()
+            for pending in batch:
+                stats = self.sessions.get(pending.session_uid)
+                if stats is None:
+                    continue
+                stats.windows += 1
+                stats.wait_time += now - pending.submitted
+                if now > pending.deadline:
+                    stats.deadline_misses += 1
+            for session_uid in {pending.session_uid for pending in self.pending}:
+                stats = self.sessions.get(session_uid)
+                if stats is not None:
+                    stats.skipped_batches += 1
+        return batch
+
+    def run(self):
+        while not self.stop_event.is_set():
+            batch = [pending for pending in self.next_batch() if pending.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            transcribe_options = self.transcribe_options
+            if self.governor is not None:
+                transcribe_options = {**self.governor.decode_options(), **transcribe_options}
+            try:
+                # the temperature fallback of a window stops at its deadline
+                results = self.transcriber.transcribe_batch(
+                    [pending.request._replace(deadline=pending.deadline) for pending in batch],
+                    **transcribe_options,
+                )
+            except Exception as e:
+                logging.error(f"Batched transcription of {len(batch)} windows failed: {e}")
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+
+            with self.condition:
+                self.batches += 1
+                self.requests += len(batch)
+            for pending, result in zip(batch, results):
+                pending.future.set_result(result)
+
+    def cancel_pending(self):
+        with self.condition:
+            pending, self.pending = self.pending, []
+        for item in pending:
+            item.future.cancel()
+
+    def get_status(self):
+        """Returns the batching counters and the scheduling counters of every session."""
+        with self.condition:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait": self.max_wait,
+                "workers": self.num_workers,
+                "batches": self.batches,
+                "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "queued": len(self.pending),
+                "sessions": {uid: stats.to_dict() for uid, stats in self.sessions.items()},
+            }
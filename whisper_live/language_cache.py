@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class LanguageCache:
+    """
+    Language decision of one session, taken once the detections of its windows converge.
+
+    Every transcription pass without a language detects one from its encoder output. The
+    cache averages the language probabilities of these windows and settles on a language
+    when the leading one has a mean probability of at least `threshold` over `min_windows`
+    windows (or a single window is at least `confident`). After `max_windows` undecided
+    windows the leading language is taken. Once settled, the session passes the language to
+    the transcriber and no further detection runs.
+
+    Args:
+        threshold (float): Mean probability the leading language needs. Defaults to 0.5.
+        min_windows (int): Windows averaged before deciding. Defaults to 3.
+        confident (float): Probability of a single window that decides at once. Defaults to 0.9.
+        max_windows (int): Windows after which the leading language is taken. Defaults to 10.
+    """
+
+    def __init__(self, threshold=0.5, min_windows=3, confident=0.9, max_windows=10):
+        self.threshold = threshold
+        self.min_windows = min_windows
+        self.confident = confident
+        self.max_windows = max_windows
+        self.language: Optional[str] = None
+        self.probability = 0.0
+        self.windows = 0
+        self.last_probability = 0.0
+        self.totals: Dict[str, float] = {}
+
+    def leading(self) -> Tuple[Optional[str], float]:
+        """The language with the highest mean probability so far and that probability."""
+        if not self.totals:
+            return None, 0.0
+        language = max(self.totals, key=self.totals.get)
+        return language, self.totals[language] / self.windows
+
+    def update(
+        self,
+        language: str,
+        language_probability: float,
+        all_language_probs: Optional[List[Tuple[str, float]]] = None,
+    ) -> Optional[str]:
+        """
+        Adds the detection of one window.
+
+        Args:
+            language (str): Detected language of the window.
+            language_probability (float): Its probability.
+            all_language_probs (list, optional): (language, probability) pairs of all languages.
+                Without them, the language was given rather than detected and is taken as is.
+
+        Returns:
+            str: The language if this window settled it, None otherwise.
+        """
+        if self.language is not None:
+            return None
+        self.last_probability = language_probability
+        if all_language_probs is None:
+            self.language, self.probability = language, language_probability
+            return self.language
+
+        self.windows += 1
+        for candidate, probability in all_language_probs:
+            self.totals[candidate] = self.totals.get(candidate, 0.0) + probability
+        if language_probability >= self.confident:
+            self.language, self.probability = language, language_probability
+            return self.language
+
+        leading, probability = self.leading()
+        if (self.windows >= self.min_windows and probability >= self.threshold) or self.windows >= self.max_windows:
+            self.language, self.probability = leading, probability
+            return self.language
+        return None
+
+    def to_dict(self):
+        leading, probability = self.leading()
+        return {
+            "language": self.language,
+            "probability": round(self.probability if self.language else probability, 3),
+            "candidate": leading,
+            "windows": self.windows,
+        }
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from whisper_live.resource_plan import pinned
+from whisper_live.transcriber import WhisperModel
+
+
+class ModelReplica:
+    """
+    One `WhisperModel` of a `ModelPool` and its load counters.
+
+    Attributes:
+        model (WhisperModel): The model.
+        index (int): Position of the replica in the pool.
+        cpu_threads (int): Intra-op CPU threads of the replica.
+        num_workers (int): Concurrent calls the replica runs in parallel.
+        active (int): Calls currently running on the replica.
+        calls (int): Calls completed.
+        busy_time (float): Seconds during which at least one call was running.
+    """
+
+    def __init__(self, model, index, cpu_threads, num_workers):
+        self.model = model
+        self.index = index
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.active = 0
+        self.calls = 0
+        self.busy_time = 0.0
+        self.busy_since = None
+
+    @property
+    def load(self):
+        return self.active / self.num_workers
+
+
+class ModelPool:
+    """
+    Pool of `WhisperModel` replicas sharing the CPU (or GPUs) of the server.
+
+    Every replica is a separate CTranslate2 model with its own `cpu_threads` budget and
+    `num_workers` parallel workers. Calls are dispatched to the least-loaded replica, so
+    concurrent transcriptions run in parallel instead of queuing on one model. The pool
+    exposes `transcribe` and `transcribe_batch` like a single `WhisperModel`.
+
+    Args:
+        model_size_or_path (str): Model size or path, see `WhisperModel`.
+        replicas (int): Number of model replicas. Defaults to 1.
+        cpu_threads (int): Intra-op threads per replica, 0 for the CTranslate2 default. Defaults to 0.
+        num_workers (int): Parallel workers (CTranslate2 `inter_threads`) per replica. Defaults to 1.
+        core_sets (list, optional): CPU ids of every replica. The threads of a replica are created
+            on its cores, see `whisper_live.resource_plan.pinned`. Defaults to None, i.e. all cores.
+        **model_kwargs: Further arguments for every `WhisperModel`, e.g. device and compute_type.
+    """
+
+    def __init__(self, model_size_or_path, replicas=1, cpu_threads=0, num_workers=1, core_sets=None, **model_kwargs):
+        if replicas < 1:
+            raise ValueError(f"replicas must be at least 1, got {replicas}")
+        self.replicas = []
+        for index in range(replicas):
+            with pinned(core_sets[index] if core_sets is not None else None):
+                model = WhisperModel(
+                    model_size_or_path,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                    **model_kwargs,
+                )
+            self.replicas.append(ModelReplica(model, index, cpu_threads, num_workers))
+        logging.info(
+            f"Loaded {replicas} model replica(s) with {cpu_threads or 'default'} CPU threads "
+            f"and {num_workers} worker(s) each."
+        )
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+    @property
+    def capacity(self):
+        """Number of calls the pool runs in parallel."""
+        return sum(replica.num_workers for replica in self.replicas)
+
+    @contextmanager
+    def acquire(self):
+        """Reserves the least-loaded replica for the duration of the block and yields its model."""
+        with self.lock:
+            replica = min(self.replicas, key=lambda replica: (replica.load, replica.busy_time))
+            if replica.active == 0:
+                replica.busy_since = time.monotonic()
+            replica.active += 1
+        try:
+            yield replica.model
+        finally:
+            with self.lock:
+                replica.active -= 1
+                replica.calls += 1
+                if replica.active == 0:
+                    replica.busy_time += time.monotonic() - replica.busy_since
+                    replica.busy_since = None
+
+    def transcribe(self, audio, **kwargs):
+        """`WhisperModel.transcribe` on the least-loaded replica; the segments are returned as a list."""
+        with self.acquire() as model:
+            segments, info = model.transcribe(audio, **kwargs)
+            if segments is not None:
+                segments = list(segments)
+        return segments, info
+
+    def transcribe_batch(self, requests, **kwargs):
+        """`WhisperModel.transcribe_batch` on the least-loaded replica."""
+        with self.acquire() as model:
+            return model.transcribe_batch(requests, **kwargs)
+
+    @property
+    def feature_extractor(self):
+        """Feature extractor of the replicas, which share one configuration."""
+        return self.replicas[0].model.feature_extractor
+
+    def create_feature_stream(self, **kwargs):
+        """Streaming log-mel extractor for the replicas, which share one configuration."""
+        return self.replicas[0].model.create_feature_stream(**kwargs)
+
+    def get_busy_seconds(self):
+        """Seconds the replicas spent busy since the pool was created, summed over the replicas."""
+        now = time.monotonic()
+        with self.lock:
+            return sum(
+                replica.busy_time + (now - replica.busy_since if replica.busy_since is not None else 0.0)
+                for replica in self.replicas
+            )
+
+    def get_fallback_stats(self):
+        """Temperature fallback counters of `WhisperModel.get_fallback_stats`, summed over the replicas."""
+        total = {"temperatures": {}, "fallback_seconds": 0.0, "deadline_stops": 0, "attempt_cap_stops": 0}
+        for replica in self.replicas:
+            stats = replica.model.get_fallback_stats()
+            for temperature, count in stats["temperatures"].items():
+                total["temperatures"][temperature] = total["temperatures"].get(temperature, 0) + count
+            for key in ("fallback_seconds", "deadline_stops", "attempt_cap_stops"):
+                total[key] += stats[key]
+        total["fallback_seconds"] = round(total["fallback_seconds"], 3)
+        return total
+
+    def get_status(self):
+        """Returns the load and utilization (share of wall time spent busy) of every replica."""
+        now = time.monotonic()
+        elapsed = max(now - self.started, 1e-9)
+        status = []
+        with self.lock:
+            for replica in self.replicas:
+                busy_time = replica.busy_time
+                if replica.busy_since is not None:
+                    busy_time += now - replica.busy_since
+                status.append({
+                    "replica": replica.index,
+                    "cpu_threads": replica.cpu_threads,
+                    "num_workers": replica.num_workers,
+                    "active": replica.active,
+                    "calls": replica.calls,
+                    "busy_seconds": round(busy_time, 3),
+                    "utilization": round(busy_time / elapsed, 4),
+                })
+        return status
@@ -0,0 +1,339 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from faster_whisper.audio import decode_audio
+from whisper_live.srt_writer import SRTWriter
+from whisper_live.transcriber import Segment, TranscriptionRequest
+from whisper_live.vad_silero import VadOptions, get_speech_timestamps
+
+OUTPUT_FORMATS = ("srt", "json")
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".m4a", ".ogg", ".opus", ".webm", ".mp4", ".mkv", ".aac")
+
+
+class AudioChunk(NamedTuple):
+    """A chunk of a file transcribed as one window.
+
+    Attributes:
+      start: First sample of the chunk in the file.
+      end: Sample after the last one of the chunk.
+      speech_chunks: The speech of the chunk, in samples relative to its start.
+    """
+
+    start: int
+    end: int
+    speech_chunks: List[dict]
+
+
+class FileTranscript(NamedTuple):
+    """Transcription of one file.
+
+    Attributes:
+      path: The audio file.
+      duration: Duration of the audio in seconds.
+      duration_after_vad: Seconds of speech that were transcribed.
+      language: Language of most of the speech, None if the file has no speech.
+      segments: The segments, times in seconds from the start of the file.
+    """
+
+    path: str
+    duration: float
+    duration_after_vad: float
+    language: Optional[str]
+    segments: List[Segment]
+
+
+def split_speech(speech_timestamps: List[dict], chunk_length: float = 30.0, sampling_rate: int = 16000) -> List[AudioChunk]:
+    """
+    Groups the speech of a file into chunks of at most `chunk_length` seconds of speech.
+
+    Consecutive speech timestamps are added to a chunk while its speech fits, and speech
+    longer than a chunk is cut into pieces. The silence between the speech of a chunk is
+    dropped by the VAD collection of the transcriber, so it does not count.
+
+    Args:
+        speech_timestamps (list): Speech of the file in samples, as from `get_speech_timestamps`.
+        chunk_length (float): Maximum seconds of speech per chunk.
+        sampling_rate (int): Sampling rate of the audio.
+    """
+    max_samples = int(chunk_length * sampling_rate)
+    pieces = []
+    for speech in speech_timestamps:
+        for start in range(speech["start"], speech["end"], max_samples):
+            pieces.append((start, min(speech["end"], start + max_samples)))
+
+    chunks, group, speech = [], [], 0
+    for start, end in pieces:
+        if group and speech + end - start > max_samples:
+            chunks.append(group)
+            group, speech = [], 0
+        group.append((start, end))
+        speech += end - start
+    if group:
+        chunks.append(group)
+
+    return [
+        AudioChunk(
+            group[0][0],
+            group[-1][1],
+            [{"start": start - group[0][0], "end": end - group[0][0]} for start, end in group],
+        )
+        for group in chunks
+    ]
+
+
+def shift_segment(segment: Segment, offset: float) -> Segment:
+    """The segment with its times and the times of its words moved by `offset` seconds."""
+    words = segment.words
+    if words:
+        words = [word._replace(start=word.start + offset, end=word.end + offset) for word in words]
+    return segment._replace(start=segment.start + offset, end=segment.end + offset, words=words)
+
+
+def write_srt(segments: Iterable[Segment], output_file: str):
+    """Writes the segments to a new SRT file, replacing an existing one."""
+    with open(output_file, "w", encoding="utf-8") as srt_file:
+        for number, segment in enumerate(segments, start=1):
+            srt_file.write(f"{number}\n")
+            srt_file.write(f"{SRTWriter.format_time(segment.start)} --> {SRTWriter.format_time(segment.end)}\n")
+            srt_file.write(f"{segment.text.strip()}\n\n")
+
+
+def write_json(transcript: FileTranscript, output_file: str):
+    """Writes the transcript with its segments and their words, if aligned, to a JSON file."""
+    segments = []
+    for segment in transcript.segments:
+        entry = {"start": round(segment.start, 3), "end": round(segment.end, 3), "text": segment.text.strip()}
+        if segment.words:
+            entry["words"] = [
+                {
+                    "start": round(word.start, 3),
+                    "end": round(word.end, 3),
+                    "word": word.word,
+                    "probability": round(word.probability, 4),
+                }
+                for word in segment.words
+            ]
+        segments.append(entry)
+    with open(output_file, "w", encoding="utf-8") as json_file:
+        json.dump(
+            {
+                "file": transcript.path,
+                "duration": transcript.duration,
+                "duration_after_vad": transcript.duration_after_vad,
+                "language": transcript.language,
+                "segments": segments,
+            },
+            json_file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def write_outputs(transcript: FileTranscript, output_dir: str, formats: Iterable[str] = OUTPUT_FORMATS) -> List[str]:
+    """Writes the transcript in the formats next to each other in output_dir, named after the file."""
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(transcript.path))[0]
+    written = []
+    for output_format in formats:
+        output_file = os.path.join(output_dir, f"{name}.{output_format}")
+        if output_format == "srt":
+            write_srt(transcript.segments, output_file)
+        elif output_format == "json":
+            write_json(transcript, output_file)
+        else:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        written.append(output_file)
+    return written
+
+
+def find_audio_files(paths: Iterable[str]) -> List[str]:
+    """The audio files among the paths and in the directories among them, recursively."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, _, names in sorted(os.walk(path)):
+            files.extend(
+                os.path.join(root, name) for name in sorted(names) if name.lower().endswith(AUDIO_EXTENSIONS)
+            )
+    return files
+
+
+class _PendingFile:
+    """A file whose chunks are being transcribed."""
+
+    def __init__(self, path, audio, chunks, sampling_rate):
+        self.path = path
+        self.audio = audio
+        self.chunks = chunks
+        self.sampling_rate = sampling_rate
+        self.results = [None] * len(chunks)
+        self.remaining = len(chunks)
+
+    def transcript(self) -> FileTranscript:
+        segments, speech_per_language = [], {}
+        duration_after_vad = 0.0
+        for chunk, (chunk_segments, info) in zip(self.chunks, self.results):
+            if chunk_segments is None:
+                continue
+            offset = chunk.start / self.sampling_rate
+            segments.extend(shift_segment(segment, offset) for segment in chunk_segments)
+            duration_after_vad += info.duration_after_vad
+            speech_per_language[info.language] = speech_per_language.get(info.language, 0.0) + info.duration_after_vad
+        language = max(speech_per_language, key=speech_per_language.get) if speech_per_language else None
+        for index, segment in enumerate(segments):
+            segments[index] = segment._replace(id=index + 1)
+        return FileTranscript(
+            self.path, len(self.audio) / self.sampling_rate, duration_after_vad, language, segments
+        )
+
+
+class OfflineTranscriber:
+    """
+    Transcribes audio files in batches of chunks of up to 30 seconds.
+
+    A pool of worker threads decodes the files in process and splits their speech with the
+    VAD into chunks, see `split_speech`. The chunks of as many files as needed fill batches
+    of `batch_size` windows, each transcribed with one `WhisperModel.transcribe_batch` call,
+    so that the encoder and the decoder run on the whole batch. Files are loaded ahead of
+    the transcription by at most `workers` files, and yielded as soon as all their chunks
+    are transcribed.
+
+    Every chunk is transcribed on its own: the text of the previous chunk is not used as a
+    prompt, and without a given language it is detected per chunk.
+
+    Args:
+        model (WhisperModel): The model transcribing the chunks.
+        batch_size (int): Chunks per model call. Defaults to 16.
+        chunk_length (float): Maximum seconds of speech per chunk. Defaults to 30.
+        workers (int): Threads decoding and splitting the files. Defaults to 4.
+        language (str, optional): Language of the files, detected if not given.
+        task (str): "transcribe" or "translate".
+        vad_parameters (dict or VadOptions, optional): VAD options of the split.
+        transcribe_options (dict, optional): Decoding options of `transcribe_batch`.
+    """
+
+    def __init__(
+        self,
+        model,
+        batch_size: int = 16,
+        chunk_length: float = 30.0,
+        workers: int = 4,
+        language: Optional[str] = None,
+        task: str = "transcribe",
+        vad_parameters: Optional[Union[dict, VadOptions]] = None,
+        transcribe_options: Optional[dict] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        self.model = model
+        self.batch_size = batch_size
+        self.chunk_length = chunk_length
+        self.workers = max(1, workers)
+        self.language = language
+        self.task = task
+        if vad_parameters is None:
+            # shorter silences separate the speech, and no speech outgrows a chunk
+            vad_parameters = VadOptions(min_silence_duration_ms=500, max_speech_duration_s=chunk_length - 1)
+        elif isinstance(vad_parameters, dict):
+            vad_parameters = VadOptions(**vad_parameters)
+        self.vad_parameters = vad_parameters
+        self.transcribe_options = transcribe_options or {}
+        self.sampling_rate = model.feature_extractor.sampling_rate
+
+    def load(self, path: str) -> _PendingFile:
+        """Decodes a file and splits its speech into chunks."""
+        audio = decode_audio(path, sampling_rate=self.sampling_rate)
+        peak = max(float(audio.max()), -float(audio.min())) if audio.shape[0] else 0.0
+        # the VAD runs on the normalized audio, the transcriber normalizes every chunk itself
+        speech_timestamps = get_speech_timestamps(audio / peak, self.vad_parameters) if peak > 0 else []
+        chunks = split_speech(speech_timestamps, self.chunk_length, self.sampling_rate)
+        return _PendingFile(path, audio, chunks, self.sampling_rate)
+
+    def transcribe_batch(self, batch):
+        requests = [
+            TranscriptionRequest(
+                audio=pending.audio[chunk.start:chunk.end],
+                language=self.language,
+                task=self.task,
+                vad_filter=True,
+                vad_parameters=self.vad_parameters,
+                speech_chunks=chunk.speech_chunks,
+            )
+            for pending, index, chunk in batch
+        ]
+        results = self.model.transcribe_batch(requests, **self.transcribe_options)
+        for (pending, index, _), result in zip(batch, results):
+            pending.results[index] = result
+            pending.remaining -= 1
+
+    def transcribe_files(self, paths: Iterable[str]) -> Iterator[FileTranscript]:
+        """
+        Transcribes the files, yielding their transcripts in the order of the paths.
+
+        A file that cannot be decoded is logged and skipped.
+        """
+        paths = iter(paths)
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="offline-load") as executor:
+            loading = deque()
+            waiting = deque()  # loaded files in order, until all their chunks are transcribed
+            queue = deque()  # chunks not transcribed yet
+
+            def load_ahead():
+                while len(loading) < self.workers:
+                    path = next(paths, None)
+                    if path is None:
+                        return
+                    loading.append((path, executor.submit(self.load, path)))
+
+            def take_loaded():
+                path, future = loading.popleft()
+                load_ahead()
+                try:
+                    pending = future.result()
+                except Exception as e:
+                    logging.error(f"Failed to load '{path}': {e}")
+                    return
+                waiting.append(pending)
+                queue.extend((pending, index, chunk) for index, chunk in enumerate(pending.chunks))
+
+            load_ahead()
+            while loading or queue:
+                while loading and len(queue) < self.batch_size:
+                    take_loaded()
+                if queue:
+                    self.transcribe_batch([queue.popleft() for _ in range(min(self.batch_size, len(queue)))])
+                while waiting and waiting[0].remaining == 0:
+                    yield waiting.popleft().transcript()
+
+
+class OfflineStats:
+    """Throughput of an offline run, in audio hours per wall-clock hour."""
+
+    def __init__(self):
+        self.start_time = time.monotonic()
+        self.files = 0
+        self.audio_seconds = 0.0
+        self.speech_seconds = 0.0
+
+    def record(self, transcript: FileTranscript):
+        self.files += 1
+        self.audio_seconds += transcript.duration
+        self.speech_seconds += transcript.duration_after_vad
+
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        elapsed = (time.monotonic() if now is None else now) - self.start_time
+        return {
+            "files": self.files,
+            "audio_hours": round(self.audio_seconds / 3600, 4),
+            "speech_hours": round(self.speech_seconds / 3600, 4),
+            "wall_seconds": round(elapsed, 3),
+            "audio_hours_per_hour": round(self.audio_seconds / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
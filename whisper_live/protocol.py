@@ -0,0 +1,152 @@
+import json
+import struct
+
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+
+# Version of the binary audio framing negotiated in the handshake. Clients
+# advertise it with the "protocol" option and the server echoes it back in the
+# SERVER_READY message when it accepts binary frames.
+PROTOCOL_VERSION = 1
+
+FRAME_MAGIC = b"WL"
+
+FRAME_KIND_AUDIO = 1
+FRAME_KIND_CONTROL = 2
+
+SAMPLE_FORMAT_INT16 = 1
+SAMPLE_FORMAT_FLOAT32 = 2
+
+SAMPLE_FORMATS = {
+    "int16": SAMPLE_FORMAT_INT16,
+    "float32": SAMPLE_FORMAT_FLOAT32,
+}
+
+_SAMPLE_DTYPES = {
+    SAMPLE_FORMAT_INT16: np.dtype("<i2"),
+    SAMPLE_FORMAT_FLOAT32: np.dtype("<f4"),
+}
+
+# magic, version, frame kind, sample format, 3 pad bytes, sequence number, sample rate.
+# 16 bytes keeps the PCM payload 4-byte aligned for np.frombuffer.
+FRAME_HEADER = struct.Struct("<2sBBB3xII")
+
+
+class ProtocolError(ValueError):
+    """Raised when a binary frame cannot be decoded."""
+
+
+class AudioFrame(NamedTuple):
+    sequence: int
+    sample_format: int
+    sample_rate: int
+    samples: np.ndarray
+
+
+class ControlFrame(NamedTuple):
+    sequence: int
+    speaker_lang: Optional[str]
+    all_langs: Optional[list]
+
+
+def is_binary_frame(data) -> bool:
+    """Returns True if `data` starts with the binary frame magic."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:2]) == FRAME_MAGIC
+
+
+def encode_audio_frame(
+    samples: np.ndarray,
+    sequence: int,
+    sample_rate: int = 16000,
+    sample_format: Optional[int] = None,
+) -> bytes:
+    """
+    Builds a binary audio frame from raw PCM samples.
+
+    Args:
+        samples (np.ndarray): Mono PCM samples, int16 or float32.
+        sequence (int): Monotonic packet counter, wraps at 2**32.
+        sample_rate (int): Sample rate of `samples`.
+        sample_format (int, optional): One of the SAMPLE_FORMAT_* constants. Inferred
+            from the dtype of `samples` when not given.
+
+    Returns:
+        bytes: Header followed by the little-endian PCM payload.
+    """
+    if sample_format is None:
+        sample_format = (
+            SAMPLE_FORMAT_INT16 if samples.dtype == np.int16 else SAMPLE_FORMAT_FLOAT32
+        )
+    dtype = _SAMPLE_DTYPES.get(sample_format)
+    if dtype is None:
+        raise ProtocolError(f"Unsupported sample format {sample_format}")
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC, PROTOCOL_VERSION, FRAME_KIND_AUDIO, sample_format,
+        sequence & 0xFFFFFFFF, sample_rate,
+    )
+    return header + np.ascontiguousarray(samples, dtype=dtype).tobytes()
+
+
+def encode_control_frame(sequence: int, speaker_lang=None, all_langs=None) -> bytes:
+    """
+    Builds a binary control frame carrying the speaker language settings.
+
+    Control frames are only sent when `speaker_lang` or `all_langs` change, so
+    audio frames stay header + PCM.
+    """
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC, PROTOCOL_VERSION, FRAME_KIND_CONTROL, 0, sequence & 0xFFFFFFFF, 0,
+    )
+    payload = json.dumps({"speakerLang": speaker_lang, "allLangs": all_langs})
+    return header + payload.encode("utf-8")
+
+
+def decode_frame(data: Union[bytes, bytearray, memoryview]) -> Union[AudioFrame, ControlFrame]:
+    """
+    Decodes a binary frame.
+
+    Audio payloads are wrapped with `np.frombuffer`, so float32 frames are returned
+    as read-only views over the received message without copying.
+
+    Raises:
+        ProtocolError: If the header is malformed or uses an unknown version.
+    """
+    if len(data) < FRAME_HEADER.size:
+        raise ProtocolError(f"Frame too short ({len(data)} bytes)")
+    magic, version, kind, sample_format, sequence, sample_rate = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise ProtocolError("Invalid frame magic")
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+
+    if kind == FRAME_KIND_AUDIO:
+        dtype = _SAMPLE_DTYPES.get(sample_format)
+        if dtype is None:
+            raise ProtocolError(f"Unsupported sample format {sample_format}")
+        payload_size = len(data) - FRAME_HEADER.size
+        if payload_size % dtype.itemsize:
+            raise ProtocolError(f"Payload size {payload_size} is not a multiple of {dtype.itemsize}")
+        samples = np.frombuffer(data, dtype=dtype, offset=FRAME_HEADER.size)
+        return AudioFrame(sequence, sample_format, sample_rate, samples)
+
+    if kind == FRAME_KIND_CONTROL:
+        try:
+            payload = json.loads(bytes(data[FRAME_HEADER.size:]).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ProtocolError(f"Invalid control frame payload: {e}") from e
+        return ControlFrame(sequence, payload.get("speakerLang"), payload.get("allLangs"))
+
+    raise ProtocolError(f"Unknown frame kind {kind}")
+
+
+def to_float32(frame: AudioFrame) -> np.ndarray:
+    """
+    Returns the samples of an audio frame as float32 in [-1, 1].
+
+    float32 payloads are returned as-is; int16 payloads are scaled into a new array.
+    """
+    if frame.sample_format == SAMPLE_FORMAT_FLOAT32:
+        return frame.samples
+    return frame.samples.astype(np.float32) / 32768.0
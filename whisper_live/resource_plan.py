@@ -0,0 +1,183 @@
+import logging
+import os
+from contextlib import contextmanager
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class EngineResources(NamedTuple):
+    """Cores and thread count assigned to one engine.
+
+    Attributes:
+      cores: CPU ids the threads of the engine may run on.
+      threads: Threads of every instance of the engine (model replica, ONNX session, ...).
+      workers: Parallel workers of a model replica, each with `threads` threads; 1 for the
+        other engines.
+    """
+
+    cores: Tuple[int, ...]
+    threads: int
+    workers: int = 1
+
+    def to_dict(self):
+        return {"cores": list(self.cores), "threads": self.threads, "workers": self.workers}
+
+
+def combined(engines: Sequence[EngineResources]) -> EngineResources:
+    """The cores of all `engines`, with the thread and worker counts all of them can run."""
+    return EngineResources(
+        tuple(core for engine in engines for core in engine.cores),
+        min(engine.threads for engine in engines),
+        min(engine.workers for engine in engines),
+    )
+
+
+class ResourcePlan(NamedTuple):
+    """
+    Partition of the cores between the engines of the server, so their thread pools do not
+    compete for the same cores.
+
+    Attributes:
+      replicas: Resources of every Whisper replica (CTranslate2 intra-op threads per worker).
+      vad: Resources of the Silero sessions (intra-op threads per session) and the VAD engine.
+      translation: Resources of the local translation model (intra-op threads).
+      features: Resources of the session threads, which compute the streaming log-mel
+        features, and of the torch feature backend.
+      drafts: Resources of every replica of the draft model of a cascade, empty without one.
+    """
+
+    replicas: Tuple[EngineResources, ...]
+    vad: EngineResources
+    translation: EngineResources
+    features: EngineResources
+    drafts: Tuple[EngineResources, ...] = ()
+
+    @property
+    def asr(self) -> EngineResources:
+        """All cores of the Whisper replicas, e.g. for the scheduler threads."""
+        return combined(self.replicas)
+
+    @property
+    def draft(self) -> Optional[EngineResources]:
+        """All cores of the draft replicas, None without a cascade."""
+        return combined(self.drafts) if self.drafts else None
+
+    def with_replica_config(self, threads: int, workers: int) -> "ResourcePlan":
+        """The plan with the thread and worker counts the Whisper replicas are created with."""
+        return self._replace(replicas=tuple(replica._replace(threads=threads, workers=workers) for replica in self.replicas))
+
+    def to_dict(self):
+        return {
+            "replicas": [replica.to_dict() for replica in self.replicas],
+            "drafts": [draft.to_dict() for draft in self.drafts],
+            "vad": self.vad.to_dict(),
+            "translation": self.translation.to_dict(),
+            "features": self.features.to_dict(),
+        }
+
+
+def available_cores() -> List[int]:
+    """CPU ids the process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_resources(
+    replicas: int = 1,
+    num_workers: int = 1,
+    vad_sessions: int = 1,
+    vad_cores: int = 1,
+    translation_cores: int = 0,
+    feature_cores: int = 0,
+    cascade: bool = False,
+    cores: Optional[Sequence[int]] = None,
+) -> ResourcePlan:
+    """
+    Splits the cores between the engines. VAD, translation and features get the requested
+    number of cores from the end of the list, the Whisper replicas the rest in equal
+    contiguous blocks, with their threads divided between the workers of a replica. In a
+    cascade, every block is halved between the replica and its draft replica (a block of
+    one core is shared by both). The translation model and the features share the Whisper
+    cores with a single thread when given 0 cores of their own.
+
+    Args:
+        replicas (int): Number of Whisper replicas. Defaults to 1.
+        num_workers (int): Parallel workers of every replica. Defaults to 1.
+        vad_sessions (int): Number of Silero sessions. Defaults to 1.
+        vad_cores (int): Cores of the VAD. Defaults to 1.
+        translation_cores (int): Cores of the translation model. Defaults to 0.
+        feature_cores (int): Cores of the session threads. Defaults to 0.
+        cascade (bool): Whether the replicas have draft replicas. Defaults to False.
+        cores (sequence, optional): Cores to split. Defaults to those the process may run on.
+
+    Raises:
+        ValueError: If no core is left for every replica, or a replica has fewer cores than
+            workers.
+    """
+    cores = list(cores) if cores is not None else available_cores()
+    reserved = vad_cores + translation_cores + feature_cores
+    if vad_cores < 1 or translation_cores < 0 or feature_cores < 0:
+        raise ValueError("vad_cores must be at least 1, translation_cores and feature_cores at least 0")
+    if len(cores) - reserved < replicas:
+        raise ValueError(
+            f"{len(cores)} cores cannot hold {replicas} replica(s) next to {reserved} cores for VAD, "
+            "translation and features"
+        )
+
+    asr_cores, rest = cores[:len(cores) - reserved], cores[len(cores) - reserved:]
+    features, rest = rest[:feature_cores], rest[feature_cores:]
+    translation, vad = rest[:translation_cores], rest[translation_cores:]
+    blocks = [
+        tuple(asr_cores[len(asr_cores) * index // replicas:len(asr_cores) * (index + 1) // replicas])
+        for index in range(replicas)
+    ]
+    if cascade:
+        middles = [len(block) - len(block) // 2 for block in blocks]
+        draft_blocks = [block[middle:] or block for block, middle in zip(blocks, middles)]
+        blocks = [block[:middle] for block, middle in zip(blocks, middles)]
+    else:
+        draft_blocks = []
+    smallest = min(len(block) for block in blocks + draft_blocks)
+    if num_workers > smallest:
+        raise ValueError(f"{num_workers} workers do not fit in a replica of {smallest} core(s)")
+
+    def replica(block):
+        return EngineResources(block, len(block) // num_workers, num_workers)
+
+    def shared(own):
+        return EngineResources(tuple(own), len(own)) if own else EngineResources(tuple(asr_cores), 1)
+
+    return ResourcePlan(
+        replicas=tuple(replica(block) for block in blocks),
+        vad=EngineResources(tuple(vad), max(1, len(vad) // vad_sessions)),
+        translation=shared(translation),
+        features=shared(features),
+        drafts=tuple(replica(block) for block in draft_blocks),
+    )
+
+
+def set_thread_affinity(cores: Iterable[int]):
+    """Restricts the calling thread, and the threads it starts from now on, to `cores`."""
+    if not hasattr(os, "sched_setaffinity"):
+        logging.warning("CPU affinity is not supported on this platform.")
+        return
+    # on Linux, pid 0 is the calling thread rather than the whole process
+    os.sched_setaffinity(0, set(cores))
+
+
+@contextmanager
+def pinned(cores: Optional[Iterable[int]]):
+    """
+    Runs the block on `cores`. Thread pools created within the block (CTranslate2 workers,
+    ONNX Runtime sessions, Python threads) inherit the affinity and keep it afterwards, while
+    the calling thread gets its previous affinity back. A no-op for None.
+    """
+    if cores is None or not hasattr(os, "sched_setaffinity"):
+        yield
+        return
+    previous = os.sched_getaffinity(0)
+    set_thread_affinity(cores)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous)
@@ -0,0 +1,77 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity circular buffer of float32 audio with absolute sample indexing.
+
+    Every sample ever appended has an absolute index; the buffer retains the most recent
+    `capacity` of them, i.e. the absolute range [start, end). Samples are written twice,
+    at `i % capacity` and `i % capacity + capacity`, so any retained range is available
+    as one contiguous read-only view without copying, and appending costs O(packet)
+    regardless of how much audio is retained.
+
+    Args:
+        capacity (int): Number of samples to retain.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._buffer = np.zeros(2 * capacity, dtype=np.float32)
+        self.end = 0
+
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest retained sample."""
+        return max(0, self.end - self.capacity)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def append(self, samples: np.ndarray):
+        """
+        Appends samples to the buffer, overwriting the oldest ones once it is full.
+
+        Args:
+            samples (np.ndarray): One dimensional audio samples.
+        """
+        n = samples.shape[0]
+        if n == 0:
+            return
+        if n > self.capacity:
+            self.end += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+
+        pos = self.end % self.capacity
+        head = min(n, self.capacity - pos)
+        self._buffer[pos:pos + head] = samples[:head]
+        self._buffer[pos + self.capacity:pos + self.capacity + head] = samples[:head]
+        if head < n:
+            tail = n - head
+            self._buffer[:tail] = samples[head:]
+            self._buffer[self.capacity:self.capacity + tail] = samples[head:]
+        self.end += n
+
+    def view(self, start: int, end: int = None) -> np.ndarray:
+        """
+        Returns a contiguous read-only view of the absolute sample range [start, end).
+
+        The range is clamped to the retained samples. The view aliases the buffer, so it
+        stays valid only until `capacity - (end - start)` more samples have been appended.
+
+        Args:
+            start (int): Absolute index of the first sample.
+            end (int, optional): Absolute index past the last sample. Defaults to `self.end`.
+        """
+        if end is None or end > self.end:
+            end = self.end
+        start = max(start, self.start)
+        if end <= start:
+            return self._buffer[:0]
+        pos = start % self.capacity
+        view = self._buffer[pos:pos + end - start]
+        view.flags.writeable = False
+        return view
@@ -2,21 +2,21 @@ import json
 import logging
 import threading
 
-import numpy as np
+from whisper_live.ring_buffer import AudioRingBuffer
 
 
 class ServeClientBase(object):
     RATE = 16000
     SERVER_READY = "SERVER_READY"
     DISCONNECT = "DISCONNECT"
+    MAX_BUFFER_DURATION = 60  # seconds of audio retained per client
 
     def __init__(self, client_uid, websocket, server):
         self.client_uid = client_uid
         self.websocket = websocket
         self.frames = b""
         self.timestamp_offset = 0.0
-        self.frames_np = None
-        self.frames_offset = 0.0
+        self.audio_buffer = AudioRingBuffer(self.MAX_BUFFER_DURATION * self.RATE)
         self.text = []
         self.current_out = ''
         self.prev_out = ''
@@ -31,11 +31,27 @@ class ServeClientBase(object):
         self.speaker_lang = None
         self.server = server
 
+        # binary audio framing, see whisper_live.protocol
+        self.protocol = None
+        self.last_sequence = None
+        self.lost_packets = 0
+        self.dropped_audio_duration = 0.0  # seconds clipped by clip_audio_if_no_valid_segment
+        self.skipped_silence_duration = 0.0  # seconds skipped by skip_silence without transcribing
+
         # text formatting
         self.pick_previous_segments = 2
 
         # threading
         self.lock = threading.Lock()
+        # signalled by add_frames, on_vad_scored and signal_stop to wake the transcription loop
+        self.frames_available = threading.Condition(self.lock)
+        self.min_audio_duration = 1.0  # minimum pending audio before transcribing
+        self.min_new_audio_duration = 0.25  # minimum new audio since the previous pass
+        self.processed_end = 0  # buffer end (absolute sample) at the previous pass
+        self.endpoint_detected = False
+        self.at_endpoint = False  # whether the current pass was started by a speech endpoint
+        self.vad = None  # optional vad_silero.StreamingVAD fed by add_frames
+        self.features = None  # optional streaming_features.StreamingFeatureExtractor fed by add_frames
 
     def speech_to_text(self):
         raise NotImplementedError
@@ -54,51 +70,212 @@ class ServeClientBase(object):
         if all_langs:
             self.all_langs = all_langs
 
+    def track_sequence(self, sequence):
+        """
+        Records the sequence number of a binary frame and counts gaps in the sequence.
+
+        Args:
+            sequence (int): The 32-bit sequence number from the frame header.
+        """
+        if self.last_sequence is not None:
+            gap = (sequence - self.last_sequence - 1) & 0xFFFFFFFF
+            if gap and gap < 0x80000000:
+                self.lost_packets += gap
+                logging.warning(f"Client {self.client_uid} skipped {gap} audio frame(s).")
+        self.last_sequence = sequence
+
+    @property
+    def frames_offset(self):
+        """Time in seconds of the oldest sample still held in the audio buffer."""
+        return self.audio_buffer.start / self.RATE
+
     def add_frames(self, frame_np):
         """
         Add audio frames to the ongoing audio stream buffer.
 
-        This method is responsible for maintaining the audio stream buffer, allowing the continuous addition
-        of audio frames as they are received. It also ensures that the buffer does not exceed a specified size
-        to prevent excessive memory usage.
+        The frames are written into a fixed-capacity ring buffer holding the last
+        `MAX_BUFFER_DURATION` seconds of audio, so adding a packet costs O(packet) no matter
+        how long the stream has been running. Once the buffer wraps around, the oldest audio
+        is overwritten and `frames_offset` advances accordingly.
 
-        If the buffer size exceeds a threshold (60 seconds of audio data), it discards the oldest 30 seconds
-        of audio data to maintain a reasonable buffer size. If the buffer is empty, it initializes it with the provided
-        audio frame. The audio stream buffer is used for real-time processing of audio data for transcription.
+        With a streaming VAD, the new audio is scored once, here or by the batched VAD engine,
+        see `on_vad_scored`. With a streaming feature extractor, the log-mel frames of the new
+        audio are computed once as well.
 
         Args:
             frame_np (numpy.ndarray): The audio frame data as a NumPy array.
 
         """
-        self.lock.acquire()
-        try:
-            # If the buffer exists and exceeds 60 seconds:
-            if self.frames_np is not None and self.frames_np.shape[0] > 60 * self.RATE:
-                self.frames_offset += 30.0
-                self.frames_np = self.frames_np[int(30 * self.RATE):]
+        with self.frames_available:
+            self.audio_buffer.append(frame_np)
+
+            # Ensure timestamp_offset doesn't fall behind frames_offset
+            if self.timestamp_offset < self.frames_offset:
+                self.timestamp_offset = self.frames_offset
+
+            if self.is_audio_ready():
+                self.frames_available.notify()
+
+        if self.vad is not None:
+            self.vad.accept(frame_np)
+        if self.features is not None:
+            self.features.accept(frame_np)
 
-                # Ensure timestamp_offset doesn't fall behind frames_offset
-                if self.timestamp_offset < self.frames_offset:
-                    self.timestamp_offset = self.frames_offset
+    def on_vad_scored(self):
+        """
+        Called by the streaming VAD once newly added audio is scored, from the ingest thread or
+        from the batched VAD engine. Signals the end of an utterance and wakes the transcription
+        loop if speech is now pending.
+        """
+        with self.frames_available:
+            if self.vad.end_of_speech():
+                self.endpoint_detected = True
+            if self.is_audio_ready():
+                self.frames_available.notify()
+
+    def is_audio_ready(self):
+        """
+        Checks whether the transcription loop has work to do. Must be called with `self.lock` held.
+
+        Returns:
+            bool: True if the client is exiting, if a speech endpoint was signalled while audio is
+                  pending, or if at least `min_audio_duration` seconds are pending of which at least
+                  `min_new_audio_duration` seconds arrived after the previous pass. With a streaming
+                  VAD, pending audio without speech is not transcribed.
+        """
+        if self.exit:
+            return True
+        end = self.audio_buffer.end
+        start = int(self.timestamp_offset * self.RATE)
+        pending = end - start
+        if self.endpoint_detected and pending > 0:
+            return True
+        if self.vad is not None and not self.vad.has_speech(start):
+            return False
+        return (
+            pending >= self.min_audio_duration * self.RATE
+            and end - self.processed_end >= self.min_new_audio_duration * self.RATE
+        )
+
+    def wait_for_audio(self, timeout=None):
+        """
+        Blocks the transcription loop until there is audio to process or the client is stopped.
 
-            # If no buffer yet, initialize it with the new frame
-            if self.frames_np is None:
-                self.frames_np = frame_np.copy()
+        Args:
+            timeout (float, optional): Maximum time to wait in seconds. Defaults to None (no limit).
+
+        Returns:
+            bool: False if the client is exiting, True otherwise.
+        """
+        with self.frames_available:
+            self.frames_available.wait_for(self.is_audio_ready, timeout)
+            if self.exit:
+                return False
+            self.processed_end = self.audio_buffer.end
+            self.at_endpoint = self.endpoint_detected
+            self.endpoint_detected = False
+            return True
+
+    def signal_stop(self):
+        """Marks the client as exiting and wakes the transcription loop so it can terminate."""
+        with self.frames_available:
+            self.exit = True
+            self.frames_available.notify_all()
+
+    def skip_silence(self):
+        """
+        Moves `timestamp_offset` past the silence at the start of the pending audio, using the
+        speech chunks of the streaming VAD. Keeps the VAD padding before the first speech chunk.
+        """
+        if self.vad is None:
+            return
+        with self.lock:
+            start = int(self.timestamp_offset * self.RATE)
+            end = min(self.audio_buffer.end, self.vad.end)
+            if end <= start:
+                return
+            speech_chunks = self.vad.get_speech_chunks(start, end)
+            if speech_chunks:
+                skip = speech_chunks[0]["start"]
             else:
-                # Otherwise, append the new frame to the existing buffer
-                self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
-        finally:
-            self.lock.release()
+                skip = end - start - int(self.vad.vad_options.speech_pad_ms * self.RATE / 1000)
+            if skip > 0:
+                self.timestamp_offset += skip / self.RATE
+                self.skipped_silence_duration += skip / self.RATE
+
+    def get_filtered_audio(self):
+        """
+        Seconds of audio filtered out as silence by each stage: the energy gate and the neural
+        VAD (windows classified as silent), and the transcription loop (audio skipped without
+        being sent to Whisper).
+        """
+        filtered = {}
+        if self.vad is not None:
+            filtered.update(self.vad.get_filtered_seconds())
+        filtered["transcription"] = round(self.skipped_silence_duration, 3)
+        return filtered
+
+    def get_speech_chunks(self, input_bytes):
+        """
+        Speech chunks of the pending audio returned by `get_audio_chunk_for_processing`, from
+        the probabilities cached by the streaming VAD, or None without a streaming VAD.
+
+        With a streaming feature extractor, the chunks are shrunk to the frame grid of the
+        stream (by less than one hop at either side), so their features can be served from
+        the frame cache, see `get_features`.
+        """
+        if self.vad is None:
+            return None
+        with self.lock:
+            start = int(self.timestamp_offset * self.RATE)
+            speech_chunks = self.vad.get_speech_chunks(start, start + input_bytes.shape[0])
+        if self.features is None:
+            return speech_chunks
+
+        hop = self.features.hop_length
+        aligned = []
+        for i, chunk in enumerate(speech_chunks):
+            chunk_start = -(-(start + chunk["start"]) // hop) * hop - start
+            chunk_end = chunk["end"]
+            if i < len(speech_chunks) - 1:
+                chunk_end -= (chunk_end - chunk_start) % hop
+            if chunk_end > chunk_start:
+                aligned.append({"start": chunk_start, "end": chunk_end})
+        return aligned
+
+    def get_features(self, input_bytes, speech_chunks=None):
+        """
+        Log-mel features of the pending audio (of its speech chunks, if given) built from the
+        frames cached by the streaming feature extractor. None without a streaming feature
+        extractor, or if the window is not aligned to its frames; the transcriber then
+        computes the features itself.
+        """
+        if self.features is None:
+            return None
+        with self.lock:
+            start = int(self.timestamp_offset * self.RATE)
+        return self.features.get_features(input_bytes, start, speech_chunks)
 
     def clip_audio_if_no_valid_segment(self):
         """
         Update the timestamp offset based on audio buffer status.
-        Clip audio if the current chunk exceeds 30 seconds, this basically implies that
-        no valid segment for the last 30 seconds from whisper
+        Clip audio if the current chunk exceeds 25 seconds, this basically implies that
+        no valid segment for the last 25 seconds from whisper
         """
-        if self.frames_np[int((self.timestamp_offset - self.frames_offset) * self.RATE):].shape[0] > 25 * self.RATE:
-            duration = self.frames_np.shape[0] / self.RATE
-            self.timestamp_offset = self.frames_offset + duration - 5
+        pending = self.audio_buffer.end - int(self.timestamp_offset * self.RATE)
+        if pending > 25 * self.RATE:
+            offset = self.audio_buffer.end / self.RATE - 5
+            dropped = offset - self.timestamp_offset
+            self.timestamp_offset = offset
+            self.dropped_audio_duration += dropped
+            logging.warning(f"[{self.client_uid}] Dropped {dropped:.2f}s of audio without a valid segment.")
+            scheduler = getattr(self.server, "inference_scheduler", None)
+            if scheduler is not None:
+                scheduler.record_dropped_audio(self.client_uid, dropped)
+
+    def get_lag(self):
+        """Seconds of received audio that are not transcribed yet, i.e. how far the session is behind real time."""
+        return max(0.0, self.audio_buffer.end / self.RATE - self.timestamp_offset)
 
     def get_audio_chunk_for_processing(self):
         """
@@ -109,13 +286,15 @@ class ServeClientBase(object):
         the audio sample rate (RATE). It then returns this chunk of audio data along with its
         duration in seconds.
 
+        The chunk is a read-only view into the audio buffer, it is not copied.
+
         Returns:
             tuple: A tuple containing:
                 - input_bytes (np.ndarray): The next chunk of audio data to be processed.
                 - duration (float): The duration of the audio chunk in seconds.
         """
-        samples_take = max(0, (self.timestamp_offset - self.frames_offset) * self.RATE)
-        input_bytes = self.frames_np[int(samples_take):].copy()
+        with self.lock:
+            input_bytes = self.audio_buffer.view(int(self.timestamp_offset * self.RATE))
         duration = input_bytes.shape[0] / self.RATE
         return input_bytes, duration
 
@@ -214,4 +393,9 @@ class ServeClientBase(object):
 
         """
         logging.info("Cleaning up.")
-        self.exit = True
\ No newline at end of file
+        self.signal_stop()
+        scheduler = getattr(self.server, "inference_scheduler", None)
+        if scheduler is not None:
+            scheduler.unregister_session(self.client_uid)
+        if self.vad is not None and self.vad.engine is not None:
+            self.vad.engine.remove(self.vad)
\ No newline at end of file
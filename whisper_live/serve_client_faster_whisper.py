@@ -5,7 +5,15 @@ import time
 import string
 import asyncio
 
+from whisper_live.commit_policy import LocalAgreement
+from whisper_live.energy_gate import EnergyGate
+from whisper_live.inference_scheduler import PRIORITY_CLASSES
+from whisper_live.language_cache import LanguageCache
+from whisper_live.model_pool import ModelPool
+from whisper_live.resource_plan import set_thread_affinity
 from whisper_live.serve_client_base import ServeClientBase
+from whisper_live.transcriber import TranscriptionRequest
+from whisper_live.vad_silero import StreamingVAD, VadOptions
 from whisper_live.sentence_accumulator import SentenceAccumulator
 from whisper_live.sentence_accumulator_arabic import SentenceAccumulatorArabic
 
@@ -23,7 +31,12 @@ class ServeClientFasterWhisper(ServeClientBase):
             use_vad=True,
             translator=None,
             transcriber=None,
-            server=None
+            draft_transcriber=None,
+            server=None,
+            protocol=None,
+            min_audio_duration=1.0,
+            min_new_audio_duration=0.25,
+            priority="normal"
     ):
         """
         Initialize a ServeClient instance.
@@ -39,18 +52,58 @@ class ServeClientFasterWhisper(ServeClientBase):
             client_uid (str, optional): A unique identifier for the client. Defaults to None.
             model (str, optional): The whisper model size. Defaults to 'small.en'
             initial_prompt (str, optional): Prompt for whisper inference. Defaults to None.
+            protocol (int, optional): Binary audio protocol version accepted for this client.
+                Defaults to None, i.e. JSON audio packets.
+            min_audio_duration (float, optional): Seconds of pending audio required before a
+                transcription pass. Defaults to 1.0.
+            min_new_audio_duration (float, optional): Seconds of audio that must arrive after a pass
+                before the next one is started. Defaults to 0.25.
+            priority (str, optional): Scheduling priority class of the session, see
+                `whisper_live.inference_scheduler.PRIORITY_CLASSES`. Defaults to "normal".
+            draft_transcriber (optional): Fast model of a model cascade. It transcribes every pass
+                for the tentative text, and `transcriber` only the audio whose text is about to
+                be committed. Defaults to None, i.e. `transcriber` transcribes every pass.
         """
         super().__init__(client_uid, websocket, server)
+        self.protocol = protocol
+        self.min_audio_duration = min_audio_duration
+        self.min_new_audio_duration = min_new_audio_duration
+        self.priority = priority
         self.translator = translator
         self.transcriber = transcriber
+        self.draft_transcriber = draft_transcriber
         self.server = server
         self.language = language
+        self.language_cache = LanguageCache()
         self.task = task
         self.initial_prompt = initial_prompt
         self.vad_parameters = vad_parameters or {"threshold": 0.5}
         self.no_speech_thresh = 0.45
+        if getattr(self.server, "commit_policy", "local_agreement") == "local_agreement":
+            self.commit_policy = LocalAgreement()
+        else:
+            self.commit_policy = None
         self.call_count = 0
         self.use_vad = use_vad
+        if self.use_vad:
+            gate_options = getattr(self.server, "energy_gate_options", None)
+            self.vad = StreamingVAD(
+                VadOptions(**self.vad_parameters),
+                max_windows=self.MAX_BUFFER_DURATION * self.RATE // StreamingVAD.window_size_samples,
+                engine=getattr(self.server, "vad_engine", None),
+                on_scored=self.on_vad_scored,
+                gate=EnergyGate(gate_options) if gate_options is not None else None,
+            )
+        if getattr(self.server, "streaming_features", False) and hasattr(self.transcriber, "create_feature_stream"):
+            self.features = self.transcriber.create_feature_stream(
+                max_frames=self.MAX_BUFFER_DURATION * self.RATE // 160
+            )
+        # the draft model takes the streamed features if it has as many mel bands as the final one
+        self.draft_features = (
+            self.features is not None
+            and self.draft_transcriber is not None
+            and self.draft_transcriber.feature_extractor.mel_filters.shape == self.features.mel_filters.shape
+        )
         self.sa = SentenceAccumulator()
         self.sa_arabic = SentenceAccumulatorArabic()
         self.stop_event = threading.Event()
@@ -63,19 +116,22 @@ class ServeClientFasterWhisper(ServeClientBase):
         self.translation_end_time = "0.0"
         
 
+        scheduler = getattr(self.server, "inference_scheduler", None)
+        if scheduler is not None:
+            scheduler.register_session(self.client_uid, self.priority)
+
         # threading
         self.trans_thread = threading.Thread(target=self.speech_to_text,daemon=True)
         self.trans_thread.start()
 
-        self.websocket.send(
-            json.dumps(
-                {
-                    "uid": self.client_uid,
-                    "message": self.SERVER_READY,
-                    "backend": "faster_whisper"
-                }
-            )
-        )
+        server_ready = {
+            "uid": self.client_uid,
+            "message": self.SERVER_READY,
+            "backend": "faster_whisper"
+        }
+        if self.protocol is not None:
+            server_ready["protocol"] = self.protocol
+        self.websocket.send(json.dumps(server_ready))
 
     def check_valid_model(self, model_size):
         """
@@ -102,40 +158,94 @@ class ServeClientFasterWhisper(ServeClientBase):
 
     def set_language(self, info):
         """
-        Updates the language attribute based on the detected language information.
+        Adds the detected language of a pass to the session's language cache and settles the
+        language once the detections of several windows converge, see `LanguageCache`.
 
         Args:
             info (object): An object containing the detected language and its probability. This object
-                        must have at least two attributes: `language`, a string indicating the detected
-                        language, and `language_probability`, a float representing the confidence level
-                        of the language detection.
+                        must have at least the attributes `language`, a string indicating the detected
+                        language, `language_probability`, a float representing the confidence level
+                        of the language detection, and `all_language_probs`, the probabilities of all
+                        languages (None if the language was not detected).
         """
-        if info.language_probability > 0.5:
-            self.language = info.language
-            logging.info(f"Detected language {self.language} with probability {info.language_probability}")
+        language = self.language_cache.update(info.language, info.language_probability, info.all_language_probs)
+        if language is not None:
+            self.language = language
+            probability = self.language_cache.probability
+            logging.info(f"Detected language {self.language} with probability {probability}")
             self.websocket.send(json.dumps(
-                {"uid": self.client_uid, "language": self.language, "language_prob": info.language_probability}))
+                {"uid": self.client_uid, "language": self.language, "language_prob": probability}))
 
-    def transcribe_audio(self, input_sample):
+    def transcribe_audio(self, input_sample, final=False):
         """
         Transcribes the provided audio sample using the configured transcriber instance.
-        ...
+        When the server has an inference scheduler, the sample is batched with the windows
+        of the other sessions. Otherwise a model pool dispatches the sample to its least-loaded
+        replica, and a single model is used under SINGLE_MODEL_LOCK.
+
+        In cascade mode, i.e. with a draft transcriber, the sample is transcribed by the draft
+        model unless `final` is set.
 
         Returns:
             The transcription result from the transcriber.
         """
 
-        ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
-
-        result, info = self.transcriber.transcribe(
-            input_sample,
-            initial_prompt=self.initial_prompt,
-            language=self.speaker_lang if self.speaker_lang else self.language,
-            task=self.task,
-            vad_filter=self.use_vad,
-            vad_parameters=self.vad_parameters if self.use_vad else None)
-
-        ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
+        draft = self.draft_transcriber is not None and not final
+        language = self.speaker_lang if self.speaker_lang else self.language
+        speech_chunks = self.get_speech_chunks(input_sample)
+        features = self.get_features(input_sample, speech_chunks) if self.draft_features or not draft else None
+        lag = self.get_lag()
+        # the window is due once its oldest audio is as old as the latency target of the session
+        deadline = time.monotonic() - lag + PRIORITY_CLASSES.get(self.priority, PRIORITY_CLASSES["normal"])
+        # the scheduler and the governor are those of the final model
+        scheduler = getattr(self.server, "inference_scheduler", None) if not draft else None
+        governor = getattr(self.server, "governor", None) if not draft else None
+        transcriber = self.draft_transcriber if draft else self.transcriber
+        # the scheduler applies the governor to whole batches itself
+        decode_options = governor.decode_options() if governor is not None and scheduler is None else {}
+        if scheduler is None and getattr(self.server, "word_timestamps", False):
+            decode_options["word_timestamps"] = True
+        if scheduler is not None:
+            result, info = scheduler.transcribe(TranscriptionRequest(
+                input_sample,
+                language=language,
+                task=self.task,
+                initial_prompt=self.initial_prompt,
+                vad_filter=self.use_vad,
+                vad_parameters=self.vad_parameters if self.use_vad else None,
+                speech_chunks=speech_chunks,
+                features=features),
+                session_uid=self.client_uid,
+                lag=lag)
+        elif isinstance(transcriber, ModelPool):
+            # the pool dispatches concurrent calls to its replicas itself
+            result, info = transcriber.transcribe(
+                input_sample,
+                initial_prompt=self.initial_prompt,
+                language=language,
+                task=self.task,
+                vad_filter=self.use_vad,
+                vad_parameters=self.vad_parameters if self.use_vad else None,
+                speech_chunks=speech_chunks,
+                features=features,
+                deadline=deadline,
+                **decode_options)
+        else:
+            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
+
+            result, info = transcriber.transcribe(
+                input_sample,
+                initial_prompt=self.initial_prompt,
+                language=language,
+                task=self.task,
+                vad_filter=self.use_vad,
+                vad_parameters=self.vad_parameters if self.use_vad else None,
+                speech_chunks=speech_chunks,
+                features=features,
+                deadline=deadline,
+                **decode_options)
+
+            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
 
         if self.language is None and info is not None:
             self.set_language(info)
@@ -198,7 +308,9 @@ class ServeClientFasterWhisper(ServeClientBase):
         Process an audio stream in an infinite loop, continuously transcribing the speech.
 
         This method continuously receives audio frames, performs real-time transcription, and sends
-        transcribed segments to the client via a WebSocket connection.
+        transcribed segments to the client via a WebSocket connection. The loop sleeps on a condition
+        variable until `add_frames` delivers enough new audio or a speech endpoint is signalled, and
+        terminates once `signal_stop` is called.
 
         If the client's language is not detected, it waits for 30 seconds of audio input to make a language prediction.
         It utilizes the Whisper ASR model to transcribe the audio, continuously processing and streaming results. Segments
@@ -210,42 +322,38 @@ class ServeClientFasterWhisper(ServeClientBase):
             Exception: If there is an issue with audio processing or WebSocket communication.
 
         """
-        while not self.stop_event.is_set():
-            if self.exit:
-                logging.info("Exiting speech to text thread")
-                break
-
-            if self.frames_np is None:
-                continue
-
-            client = self.server.speaker_manager.get_client(self.websocket)
-            if not client:
-                print("CLIENT DEAD")
-                return
-
+        resource_plan = getattr(self.server, "resource_plan", None)
+        if resource_plan is not None:
+            # the loop computes the features of the session, and starts its translation threads
+            set_thread_affinity(resource_plan.features.cores)
+        while self.wait_for_audio():
+            self.skip_silence()
             self.clip_audio_if_no_valid_segment()
 
             input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < 1.0:
-                time.sleep(0.1)  # wait for audio chunks to arrive
+            if duration == 0:
                 continue
             try:
-                input_sample = input_bytes.copy()
-                result = self.transcribe_audio(input_sample)
+                result = self.transcribe_audio(input_bytes)
                 if result is None and self.translation_accumulated_text != "":
                     print(f"[INFO]: No output from Whisper, using previous output: {self.translation_accumulated_text}")
                     translation_thread = threading.Thread(target=self.translate_and_send_thread, daemon=True)
                     translation_thread.start()
 
-                if result is None or self.language is None:
+                if result is None or (
+                    self.language is None and self.language_cache.last_probability <= self.language_cache.threshold
+                ):
+                    # no voice activity (or no confident language yet), skip the chunk and wait for new audio
                     self.timestamp_offset += duration
-                    time.sleep(0.25)  # wait for voice activity, result is None when no voice activity
+                    if self.commit_policy is not None:
+                        self.commit_policy.reset()
                     continue
                 self.handle_transcription_output(result, duration)
 
             except Exception as e:
                 logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
-                time.sleep(0.01)
+
+        logging.info("Exiting speech to text thread")
 
     def remove_until_dot(self, text):
         dot_index = text.find('.')
@@ -257,8 +365,12 @@ class ServeClientFasterWhisper(ServeClientBase):
         """
         Signals the transcription thread to stop and waits for it to terminate.
         """
-        # Set the stop event to signal the thread to exit
+        # Set the stop event and wake the thread so it can exit
         self.stop_event.set()
+        self.signal_stop()
+
+        if threading.current_thread() is self.trans_thread:
+            return
 
         # Wait for the thread to finish execution
         self.trans_thread.join(timeout=3)  # Adjust timeout as needed
@@ -338,13 +450,15 @@ class ServeClientFasterWhisper(ServeClientBase):
 
         return translations
 
-    def format_segment(self, start: float, end: float, text: str, translate: bool = False) -> dict:
+    def format_segment(self, start: float, end: float, text: str, translate: bool = False, words=None) -> dict:
         """
         Formats a transcription segment with precise start and end times, along with the text.
         For RTL languages (ar, he, fa, etc.), accumulates text until translation is done.
         For LTR languages, text is sent immediately (no accumulation).
         If `translate` changes from True to False and we're in RTL mode,
         finishes up accumulated text with a translation call.
+        With word timestamps, `words` are the (start, end, text, probability) of the words of
+        the segment in absolute time, sent along with it.
         """
 
         # Prepare output item
@@ -353,6 +467,11 @@ class ServeClientFasterWhisper(ServeClientBase):
             "end": f"{end:.3f}",
             "text": text,
         }
+        if words:
+            item["words"] = [
+                {"start": f"{word_start:.3f}", "end": f"{word_end:.3f}", "word": word, "probability": None if probability is None else round(probability, 3)}
+                for word_start, word_end, word, probability in words
+            ]
 
         rtl_language = self.is_rtl()
 
@@ -428,11 +547,16 @@ class ServeClientFasterWhisper(ServeClientBase):
             dict or None: The last processed segment with its start time, end time, and transcribed text.
                      Returns None if there are no valid segments to process.
         """
+        if self.commit_policy is not None:
+            return self.commit_agreed_segments(segments, duration)
+
         offset = None
         self.current_out = ''
         last_segment = None
+        pending_commit = []  # cascade mode: committed segments, transcribed again before they are sent
         # process complete segments
         if len(segments) > 1:
+            committed = []
             for i, s in enumerate(segments[:-1]):
                 text_ = s.text
                 self.text.append(text_)
@@ -442,8 +566,13 @@ class ServeClientFasterWhisper(ServeClientBase):
                     continue
                 if s.no_speech_prob > self.no_speech_thresh:
                     continue
-                self.transcript.append(self.format_segment(start, end, text_, True))
+                committed.append((start, end, text_, self.get_segment_words(s, duration)))
                 offset = min(duration, s.end)
+            if committed and self.draft_transcriber is None:
+                self.commit_pieces(committed)
+            elif committed:
+                # the repeated last segment may still extend the committed audio below
+                pending_commit = committed
 
         # only process the segments if it satisfies the no_speech_thresh
         if segments[-1].no_speech_prob <= self.no_speech_thresh:
@@ -452,7 +581,8 @@ class ServeClientFasterWhisper(ServeClientBase):
             last_segment = self.format_segment(
                 self.timestamp_offset + segments[-1].start,
                 self.timestamp_offset + min(duration, segments[-1].end),
-                self.current_out
+                self.current_out,
+                words=self.get_segment_words(segments[-1], duration)
             )
 
         # if same incomplete segment is seen multiple times then update the offset
@@ -465,12 +595,11 @@ class ServeClientFasterWhisper(ServeClientBase):
         if self.same_output_threshold > 5:
             if not len(self.text) or self.text[-1].strip().lower() != self.current_out.strip().lower():
                 self.text.append(self.current_out)
-                self.transcript.append(self.format_segment(
-                    self.timestamp_offset,
-                    self.timestamp_offset + duration,
-                    self.current_out,
-                    True
-                ))
+                repeated = (self.timestamp_offset, self.timestamp_offset + duration, self.current_out, None)
+                if self.draft_transcriber is None:
+                    self.commit_pieces([repeated])
+                else:
+                    pending_commit.append(repeated)
             self.current_out = ''
             offset = duration
             self.same_output_threshold = 0
@@ -478,8 +607,98 @@ class ServeClientFasterWhisper(ServeClientBase):
         else:
             self.prev_out = self.current_out
 
+        if pending_commit:
+            self.commit_pieces(self.transcribe_final(self.timestamp_offset + offset, pending_commit))
+
         # update offset
         if offset is not None:
             self.timestamp_offset += offset
 
-        return last_segment
\ No newline at end of file
+        return last_segment
+
+    def commit_agreed_segments(self, segments, duration):
+        """
+        Processes the segments from whisper with the LocalAgreement commit policy: the words
+        on which consecutive passes agree are appended to the transcript at once, and the
+        audio of fully committed segments is trimmed from the next window, see
+        `whisper_live.commit_policy.LocalAgreement`. A pass started by a speech endpoint
+        commits everything. With word timestamps, the audio is trimmed at word boundaries and
+        the segments sent to the client carry their words. In cascade mode, committed words are
+        sent once their audio is trimmed, as transcribed again by the final model.
+
+        Args:
+            segments(list): segments as returned by whisper
+            duration(float): duration of the current chunk
+
+        Returns:
+            dict or None: The tentative rest of the hypothesis with its start time, end time and text.
+        """
+        segments = [s for s in segments if s.no_speech_prob <= self.no_speech_thresh]
+        previous = list(self.commit_policy.committed)
+        update = self.commit_policy.update(segments, self.timestamp_offset, duration, final=self.at_endpoint)
+        aligned = any(s.words for s in segments)
+        tentative = update.tentative
+        if self.draft_transcriber is None:
+            committed = update.committed
+        else:
+            # committed words are final once their audio is trimmed, until then they are shown
+            # with the tentative ones
+            committed = previous + update.committed
+            committed = committed[:len(committed) - len(self.commit_policy.committed)]
+            tentative = self.commit_policy.committed + tentative
+        if committed:
+            text_ = "".join(word.text for word in committed)
+            pieces = [(committed[0].start, committed[-1].end, text_, committed if aligned else None)]
+            if self.draft_transcriber is not None:
+                pieces = self.transcribe_final(update.trim, pieces)
+            self.text.append("".join(piece[2] for piece in pieces))
+            self.commit_pieces(pieces)
+
+        self.current_out = "".join(word.text for word in tentative)
+        last_segment = None
+        if tentative:
+            last_segment = self.format_segment(
+                tentative[0].start, tentative[-1].end, self.current_out,
+                words=tentative if aligned else None)
+
+        if update.trim is not None:
+            self.timestamp_offset = max(self.timestamp_offset, update.trim)
+        return last_segment
+
+    def commit_pieces(self, pieces):
+        """Appends committed text, a list of (start, end, text, words), to the transcript."""
+        for start, end, text_, words in pieces:
+            self.transcript.append(self.format_segment(start, end, text_, True, words))
+
+    def transcribe_final(self, end, draft_pieces):
+        """
+        Cascade mode: transcribes the pending audio up to the absolute time `end`, whose text the
+        draft model committed, with the final model before it is sent.
+
+        Args:
+            end (float): Absolute time up to which the audio is committed.
+            draft_pieces (list): The committed text of the draft model as (start, end, text, words),
+                kept if the final model finds no speech.
+
+        Returns:
+            list: The committed text of the final model as (start, end, text, words).
+        """
+        input_bytes, _ = self.get_audio_chunk_for_processing()
+        input_bytes = input_bytes[:int(round((end - self.timestamp_offset) * self.RATE))]
+        duration = input_bytes.shape[0] / self.RATE
+        result = self.transcribe_audio(input_bytes, final=True) if duration > 0 else None
+        pieces = []
+        for s in result or []:
+            start, end_ = self.timestamp_offset + s.start, self.timestamp_offset + min(duration, s.end)
+            if start < end_ and s.no_speech_prob <= self.no_speech_thresh:
+                pieces.append((start, end_, s.text, self.get_segment_words(s, duration)))
+        return pieces or draft_pieces
+
+    def get_segment_words(self, segment, duration):
+        """Aligned words of a segment in absolute time, or None without word timestamps."""
+        if not segment.words:
+            return None
+        return [
+            (self.timestamp_offset + word.start, self.timestamp_offset + min(duration, word.end), word.word, word.probability)
+            for word in segment.words
+        ]
@@ -8,9 +8,18 @@ import torch
 from enum import Enum
 from typing import List, Optional
 
-from whisper_live.transcriber import WhisperModel
+from whisper_live.autotune import autotune, available_cpus
+from whisper_live.model_pool import ModelPool
+from whisper_live.resource_plan import pinned, plan_resources
+from whisper_live.transcriber import FallbackOptions
+from whisper_live.commit_policy import COMMIT_POLICIES
+from whisper_live.energy_gate import GateOptions
+from whisper_live.governor import DecodingGovernor, LoadSample
+from whisper_live.vad_silero import BatchedVAD, configure_vad_model
+from whisper_live.inference_scheduler import DEFAULT_PRIORITY, PRIORITY_CLASSES, InferenceScheduler
 
 import numpy as np
+from faster_whisper.utils import download_model
 
 from websockets.sync.server import serve
 from websockets.exceptions import ConnectionClosed
@@ -19,6 +28,14 @@ from whisper_live.client_managers import SpeakerManager, ListenerManager
 from whisper_live.serve_client_base import ServeClientBase
 from whisper_live.serve_client_faster_whisper import ServeClientFasterWhisper
 from whisper_live.serve_listener import ServeListener
+from whisper_live.protocol import (
+    PROTOCOL_VERSION,
+    AudioFrame,
+    ProtocolError,
+    decode_frame,
+    is_binary_frame,
+    to_float32,
+)
 from translation_tools.llama.utils import LoadBalancedTranslator
 from translation_tools.madlad400.translator import MultiLingualTranslatorLive
 
@@ -42,15 +59,141 @@ class BackendType(Enum):
 class TranscriptionServer:
     RATE = 16000
 
-    def __init__(self):
+    def __init__(self, max_batch_size=8, max_batch_wait=0.01, replicas=1, cpu_threads=0, num_workers=1,
+                 vad_batch_size=32, vad_sessions=1, vad_intra_threads=1, vad_inter_threads=1,
+                 energy_gate=False, streaming_features=True, feature_backend="numpy",
+                 max_fallback_attempts=0, batch_fallback=True, adaptive_decoding=False,
+                 commit_policy="local_agreement", word_timestamps=False, cascade_model=None,
+                 autotune=False, autotune_latency=1.0, autotune_audio=None, pin_cores=False, vad_cores=1, translation_cores=0,
+                 feature_cores=0):
+        """
+        Args:
+            max_batch_size (int, optional): Maximum number of session windows transcribed in one
+                batched model call. 0 disables batching, sessions then take turns on the model.
+                Defaults to 8.
+            max_batch_wait (float, optional): Seconds the scheduler waits for further windows
+                before running a batch. Defaults to 0.01.
+            replicas (int, optional): Number of model replicas; transcriptions go to the
+                least-loaded one. Defaults to 1.
+            cpu_threads (int, optional): CPU threads of every replica, 0 for the CTranslate2
+                default. Defaults to 0.
+            num_workers (int, optional): Parallel workers (inter_threads) of every replica.
+                Defaults to 1.
+            vad_batch_size (int, optional): Maximum number of sessions whose VAD windows are scored
+                in one batched Silero call. 0 scores every session on its own ingest thread.
+                Defaults to 32.
+            vad_sessions (int, optional): Number of Silero ONNX sessions shared by all VAD calls.
+                Defaults to 1.
+            vad_intra_threads (int, optional): Intra-op threads of every VAD session. Defaults to 1.
+            vad_inter_threads (int, optional): Inter-op threads of every VAD session. Defaults to 1.
+            energy_gate (bool, optional): Whether windows an energy gate classifies as certainly
+                silent skip the neural VAD and transcription. Defaults to False.
+            streaming_features (bool, optional): Whether every session computes the log-mel
+                frames of its audio once as it arrives, instead of the transcriber recomputing
+                the whole window on every pass. Defaults to True.
+            feature_backend (str, optional): Backend of the transcriber's log-mel features,
+                "numpy" or "torch". Defaults to "numpy".
+            max_fallback_attempts (int, optional): Decodings per window in the temperature
+                fallback, the first one included. 0 tries every temperature. Defaults to 0.
+            batch_fallback (bool, optional): Whether the rejected windows of a batch fall back
+                together, one generate call per temperature. Defaults to True.
+            adaptive_decoding (bool, optional): Whether a governor steps the decoding options
+                down (smaller beam, fewer fallbacks and new tokens) while the sessions lag or
+                the model is saturated, and back up when there is headroom. Defaults to False.
+            commit_policy (str, optional): How sessions finalize text. "local_agreement" commits
+                the words two consecutive passes agree on and trims their audio from the next
+                window; "segments" commits all segments but the last one, and the last one once it
+                repeated more than five times. Defaults to "local_agreement".
+            word_timestamps (bool, optional): Whether the transcriber aligns every word with the
+                audio (cross-attention alignment by dynamic time warping). Sessions then commit and
+                trim their audio at word boundaries, and segments sent to clients carry their words
+                with timings. Defaults to False.
+            cascade_model (str, optional): Fast (small or distilled) model, by name or path, of a
+                model cascade: it transcribes every pass for the tentative text, and the main model
+                only the audio whose text the commit policy is about to finalize. Defaults to None,
+                i.e. the main model transcribes every pass.
+            autotune (bool, optional): Whether, on CPU, the compute type, CPU threads and workers
+                of the replicas are chosen at startup by transcribing a sample with a few
+                combinations, see `whisper_live.autotune`. Overrides `cpu_threads` and
+                `num_workers`. The result is cached per CPU and model. Defaults to False.
+            autotune_latency (float, optional): Seconds a window may take in the autotune
+                search; the fastest combination within it is chosen. Defaults to 1.0.
+            autotune_audio (str, optional): Speech sample of the autotune search; a sample that
+                cannot be loaded fails the startup. Defaults to the built-in synthetic speech of
+                `whisper_live.autotune.synthetic_speech`.
+            pin_cores (bool, optional): Whether the cores are partitioned between the engines, see
+                `whisper_live.resource_plan.plan_resources`: every replica, the VAD, the
+                translation model and the session threads get their own cores, and their threads
+                are pinned to them; in a cascade, the draft replicas get half of the replica cores.
+                `cpu_threads` (if 0) and `vad_intra_threads` then follow from the plan, and a
+                `cpu_threads` or `num_workers` that does not fit the cores of a replica raises a
+                ValueError. Defaults to False.
+            vad_cores (int, optional): Cores of the VAD with `pin_cores`. Defaults to 1.
+            translation_cores (int, optional): Cores of the local translation model with
+                `pin_cores`, 0 to share the Whisper cores. Defaults to 0.
+            feature_cores (int, optional): Cores of the session threads (streaming features,
+                torch feature backend) with `pin_cores`, 0 to share the Whisper cores. Defaults to 0.
+        """
         self.transcriber = None
+        self.draft_transcriber = None
+        self.cascade_model = cascade_model
+        self.autotune = autotune
+        self.autotune_latency = autotune_latency
+        self.autotune_audio = autotune_audio
+        self.autotune_result = None
+        self.inference_scheduler = None
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.replicas = replicas
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.vad_batch_size = vad_batch_size
+        self.vad_engine = None
+        self.vad_sessions = vad_sessions
+        self.vad_intra_threads = vad_intra_threads
+        self.vad_inter_threads = vad_inter_threads
+        self.vad_model = None
+        self.energy_gate_options = GateOptions() if energy_gate else None
+        self.streaming_features = streaming_features
+        self.feature_backend = feature_backend
+        self.fallback_options = FallbackOptions(max_attempts=max_fallback_attempts or None, batch_fallback=batch_fallback)
+        self.adaptive_decoding = adaptive_decoding
+        if commit_policy not in COMMIT_POLICIES:
+            raise ValueError(f"Unknown commit policy '{commit_policy}', expected one of {COMMIT_POLICIES}")
+        self.commit_policy = commit_policy
+        self.word_timestamps = word_timestamps
+        self.resource_plan = None
+        if pin_cores:
+            self.resource_plan = plan_resources(
+                replicas=replicas,
+                num_workers=num_workers,
+                vad_sessions=vad_sessions,
+                vad_cores=vad_cores,
+                translation_cores=translation_cores,
+                feature_cores=feature_cores,
+                cascade=cascade_model is not None,
+            )
+            asr = self.resource_plan.asr
+            if self.cpu_threads > asr.threads:
+                raise ValueError(
+                    f"cpu_threads={self.cpu_threads} with num_workers={num_workers} does not fit in a replica of "
+                    f"{min(len(replica.cores) for replica in self.resource_plan.replicas)} core(s), at most "
+                    f"{asr.threads}, or 0 to follow the plan"
+                )
+            self.cpu_threads = self.cpu_threads or asr.threads
+            self.resource_plan = self.resource_plan.with_replica_config(self.cpu_threads, num_workers)
+            logging.info(f"Resource plan: {self.resource_plan.to_dict()}")
+            self.vad_intra_threads = self.resource_plan.vad.threads
+        self.governor = None
         self.speaker_manager = SpeakerManager(max_clients=4)
         self.listener_manager = ListenerManager(max_clients=64)
         self.use_vad = True
         self.single_model = False
         USE_MADLAD = os.getenv("USE_MADLAD", "false").lower() == "true"
         if USE_MADLAD:
-            self.translator = MultiLingualTranslatorLive()
+            translation = self.resource_plan.translation if self.resource_plan is not None else None
+            with pinned(translation.cores if translation is not None else None):
+                self.translator = MultiLingualTranslatorLive(intra_threads=translation.threads if translation is not None else 0)
         else:
             self.translator = LoadBalancedTranslator()
        
@@ -73,6 +216,16 @@ class TranscriptionServer:
         # Initialize client if 'is_listener' is not set
         client: Optional[ServeClientBase] = None
 
+        protocol = options.get("protocol")
+        if protocol is not None and protocol != PROTOCOL_VERSION:
+            logging.warning(f"Unsupported protocol version {protocol}, falling back to JSON audio packets.")
+            protocol = None
+
+        priority = options.get("priority", DEFAULT_PRIORITY)
+        if priority not in PRIORITY_CLASSES:
+            logging.warning(f"Unknown priority class {priority}, using {DEFAULT_PRIORITY}.")
+            priority = DEFAULT_PRIORITY
+
         client = ServeClientFasterWhisper(
                 websocket,
                 language=options.get('language', None),
@@ -84,7 +237,12 @@ class TranscriptionServer:
                 use_vad=self.use_vad,
                 translator=self.translator,
                 transcriber=self.transcriber,
-                server=self
+                draft_transcriber=self.draft_transcriber,
+                server=self,
+                protocol=protocol,
+                min_audio_duration=options.get("min_audio_duration", 1.0),
+                min_new_audio_duration=options.get("min_new_audio_duration", 0.25),
+                priority=priority
             )
         logging.info("Running faster_whisper backend.")
 
@@ -93,6 +251,55 @@ class TranscriptionServer:
 
         self.speaker_manager.add_client(websocket, client)
 
+    def get_status(self):
+        """
+        Returns the load of the server: connected clients and, per session, how far it lags
+        behind real time, how often it was passed over by the scheduler, how much audio
+        it dropped, how much silence each filtering stage removed and its language detection.
+        """
+        sessions = {}
+        for client in list(self.speaker_manager.clients.values()):
+            sessions[client.client_uid] = {
+                "priority": getattr(client, "priority", DEFAULT_PRIORITY),
+                "lag": round(client.get_lag(), 3),
+                "dropped_audio": round(client.dropped_audio_duration, 3),
+                "lost_packets": client.lost_packets,
+                "filtered_audio": client.get_filtered_audio(),
+            }
+            language_cache = getattr(client, "language_cache", None)
+            if language_cache is not None:
+                sessions[client.client_uid]["language"] = language_cache.to_dict()
+        status = {
+            "clients_number": self.speaker_manager.get_client_count(),
+            "listeners_number": self.listener_manager.get_client_count(),
+            "sessions": sessions,
+        }
+        if self.inference_scheduler is not None:
+            status["scheduler"] = self.inference_scheduler.get_status()
+        if self.transcriber is not None:
+            status["replicas"] = self.transcriber.get_status()
+            status["fallback"] = self.transcriber.get_fallback_stats()
+        if self.governor is not None:
+            status["governor"] = self.governor.get_status()
+        if self.autotune_result is not None:
+            status["autotune"] = self.autotune_result.to_dict()
+        if self.resource_plan is not None:
+            status["resources"] = self.resource_plan.to_dict()
+        if self.draft_transcriber is not None:
+            status["cascade"] = {
+                "model": self.cascade_model,
+                "replicas": self.draft_transcriber.get_status(),
+            }
+        if self.vad_model is not None:
+            status["vad"] = {"sessions": self.vad_model.get_status()}
+            if self.vad_engine is not None:
+                status["vad"].update({
+                    "max_batch_size": self.vad_engine.max_batch_size,
+                    "steps": self.vad_engine.steps,
+                    "windows": self.vad_engine.windows,
+                })
+        return status
+
     def get_audio_from_websocket(self, websocket):
         """
         Receives audio buffer from websocket and creates a numpy array from it.
@@ -106,6 +313,8 @@ class TranscriptionServer:
             return False, None, None
         if data == b"LISTENER":
             return True, None, None
+        if is_binary_frame(data):
+            return self.get_audio_from_binary_frame(websocket, data)
         try:
             parsed_data = json.loads(data)
             speaker_lang = parsed_data.get('speakerLang')
@@ -126,6 +335,35 @@ class TranscriptionServer:
             logging.error(f"An error occurred while processing audio: {str(e)}")
             return False, None, None
 
+    def get_audio_from_binary_frame(self, websocket, data):
+        """
+        Decodes a binary audio or control frame (see `whisper_live.protocol`).
+
+        Args:
+            websocket: The websocket the frame was received on.
+            data (bytes): The received frame.
+        Returns:
+            A tuple (audio, speaker_lang, all_langs). `audio` is None for control frames
+            and False in case of an error.
+        """
+        try:
+            frame = decode_frame(data)
+        except ProtocolError as e:
+            logging.error(f"Invalid binary frame: {str(e)}")
+            return False, None, None
+
+        client = self.speaker_manager.get_client(websocket)
+        if client:
+            client.track_sequence(frame.sequence)
+
+        if not isinstance(frame, AudioFrame):
+            return None, frame.speaker_lang, frame.all_langs
+
+        if frame.sample_rate != self.RATE:
+            logging.error(f"Unsupported sample rate {frame.sample_rate}, expected {self.RATE}.")
+            return False, None, None
+        return to_float32(frame), None, None
+
     def handle_new_connection(self, websocket):
         try:
             logging.info("New client connected")
@@ -154,9 +392,18 @@ class TranscriptionServer:
             return True
         client = self.speaker_manager.get_client(websocket)
 
-        if client is False or frame_np is False or frame_np is None or frame_np.size == 0:
+        if client is False or frame_np is False:
+            return False
+
+        if frame_np is None:
+            # control frame, only carries the speaker language settings
+            client.set_speaker_lang(speaker_lang)
+            client.set_all_langs(all_langs)
+            return True
+
+        if frame_np.size == 0:
             return False
-        
+
         client.set_speaker_lang(speaker_lang)
         client.set_all_langs(all_langs)
         client.add_frames(frame_np)
@@ -227,7 +474,8 @@ class TranscriptionServer:
 
     def create_model(self,model_size_or_path):
         """
-        Instantiates a new model, sets it as the transcriber.
+        Instantiates the model replicas, sets the pool as the transcriber. In cascade mode, also
+        the replicas of the draft model.
         """
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -236,15 +484,97 @@ class TranscriptionServer:
             compute_type = "float16" if major >= 7 else "float32"
         else:
             compute_type = "int8"
+            if self.autotune:
+                if model_size_or_path is None:
+                    raise ValueError("Autotune needs the model to tune, pass its path with -fw.")
+                model_path = model_size_or_path
+                if not os.path.isdir(model_path):
+                    model_path = download_model(model_size_or_path)
+                self.autotune_result = autotune(
+                    model_path,
+                    target_latency=self.autotune_latency,
+                    audio_path=self.autotune_audio,
+                    cpus=(
+                        len(self.resource_plan.replicas[0].cores) if self.resource_plan is not None
+                        else max(1, available_cpus() // self.replicas)
+                    ),
+                )
+                compute_type, self.cpu_threads, self.num_workers = self.autotune_result.config
+                if self.resource_plan is not None:
+                    self.resource_plan = self.resource_plan.with_replica_config(self.cpu_threads, self.num_workers)
 
         logging.info(f"Using Device={device} with precision {compute_type}")
-        self.transcriber = WhisperModel(
+        core_sets = [replica.cores for replica in self.resource_plan.replicas] if self.resource_plan is not None else None
+        self.transcriber = ModelPool(
             model_size_or_path,
+            replicas=self.replicas,
+            cpu_threads=self.cpu_threads,
+            num_workers=self.num_workers,
+            core_sets=core_sets,
             device=device,
             compute_type=compute_type,
             local_files_only=False,
+            feature_backend=self.feature_backend,
+            fallback_options=self.fallback_options,
+        )
+        if self.cascade_model is not None:
+            draft = self.resource_plan.draft if self.resource_plan is not None else None
+            self.draft_transcriber = ModelPool(
+                self.cascade_model,
+                replicas=self.replicas,
+                cpu_threads=draft.threads if draft is not None else self.cpu_threads,
+                num_workers=draft.workers if draft is not None else self.num_workers,
+                core_sets=[engine.cores for engine in self.resource_plan.drafts] if draft is not None else None,
+                device=device,
+                compute_type=compute_type,
+                local_files_only=False,
+                feature_backend=self.feature_backend,
+                fallback_options=self.fallback_options,
+            )
+        if self.adaptive_decoding:
+            self.governor = DecodingGovernor(self.sample_load, capacity=self.replicas)
+        if self.max_batch_size > 0:
+            if self.inference_scheduler is not None:
+                self.inference_scheduler.stop()
+            self.inference_scheduler = InferenceScheduler(
+                self.transcriber,
+                max_batch_size=self.max_batch_size,
+                max_wait=self.max_batch_wait,
+                transcribe_options={"word_timestamps": True} if self.word_timestamps else None,
+                governor=self.governor,
+            )
+            # the scheduler threads run on the Whisper cores
+            with pinned(self.resource_plan.asr.cores if self.resource_plan is not None else None):
+                self.inference_scheduler.start()
+        if self.resource_plan is not None and self.feature_backend == "torch":
+            torch.set_num_threads(self.resource_plan.features.threads)
+
+    def sample_load(self):
+        """Load of the server for the decoding governor: session lag, queued windows and model busy time."""
+        lags = [client.get_lag() for client in list(self.speaker_manager.clients.values())]
+        queued = len(self.inference_scheduler.pending) if self.inference_scheduler is not None else 0
+        return LoadSample(
+            max_lag=max(lags, default=0.0),
+            queued=queued,
+            busy_seconds=self.transcriber.get_busy_seconds(),
         )
 
+    def create_vad_engine(self):
+        """
+        Loads the pool of VAD sessions and starts the batched VAD engine shared by all
+        sessions, if enabled. With a resource plan, both run on the VAD cores.
+        """
+        with pinned(self.resource_plan.vad.cores if self.resource_plan is not None else None):
+            if self.vad_model is None:
+                self.vad_model = configure_vad_model(
+                    sessions=self.vad_sessions,
+                    intra_op_num_threads=self.vad_intra_threads,
+                    inter_op_num_threads=self.vad_inter_threads,
+                )
+            if self.vad_batch_size > 0 and self.vad_engine is None:
+                self.vad_engine = BatchedVAD(max_batch_size=self.vad_batch_size)
+                self.vad_engine.start()
+
     def run(self,
             host,
             port=9090,
@@ -269,6 +599,8 @@ class TranscriptionServer:
             raise ValueError(f"Custom faster_whisper model '{faster_whisper_custom_model_path}' is not a valid path.")
 
         self.create_model(faster_whisper_custom_model_path)
+        if self.use_vad:
+            self.create_vad_engine()
 
         if not BackendType.is_valid(backend):
             raise ValueError(f"{backend} is not a valid backend type. Choose backend from {BackendType.valid_types()}")
@@ -0,0 +1,229 @@
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from whisper_live.feature_extractor import hann_window
+
+
+class StreamingFeatureExtractor:
+    """
+    Log-mel spectrogram of a live stream, computing every STFT frame once.
+
+    Frames are indexed by absolute position: frame `k` is centered on sample `hop_length * k`
+    of the stream. `accept` computes the frames whose window is complete, so each call only
+    does the STFT of the hops the new audio completed. `get_features` then builds the input of
+    `WhisperModel.transcribe` for a window of the stream by slicing the cached frames; only the
+    few frames at the edges of the window (and of its speech chunks) are computed again, with
+    the reflect and zero padding of the batch extractor.
+
+    The cache holds the log10 mel power of the raw audio. The peak normalization of the
+    transcriber is a constant offset in log space, applied together with the global-max clamp
+    when a window is built, so the result matches faster_whisper's `FeatureExtractor` on the
+    same window within floating point tolerance.
+
+    Args:
+        mel_filters (np.ndarray): Mel filterbank of shape (n_mels, n_fft // 2 + 1).
+        n_fft (int): FFT size. Defaults to 400.
+        hop_length (int): Samples between frames. Defaults to 160.
+        chunk_length (int): Seconds of the encoder input. Defaults to 30.
+        sampling_rate (int): Sampling rate of the stream. Defaults to 16000.
+        max_frames (int): Number of frames retained. Defaults to 60 seconds.
+    """
+
+    def __init__(
+        self,
+        mel_filters: np.ndarray,
+        n_fft: int = 400,
+        hop_length: int = 160,
+        chunk_length: int = 30,
+        sampling_rate: int = 16000,
+        max_frames: int = 6000,
+    ):
+        self.mel_filters = np.asarray(mel_filters, dtype=np.float32)
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.half_window = n_fft // 2
+        self.nb_max_frames = chunk_length * sampling_rate // hop_length
+        self.max_frames = max_frames
+        self.window = hann_window(n_fft)
+
+        self.frames = np.empty((2 * max_frames, len(self.mel_filters)), dtype=np.float32)
+        self.count = 0
+        self.first_frame = 2  # frames 0 and 1 reach before the start of the stream
+        self.tail = np.zeros(0, dtype=np.float32)  # samples from the window start of the next frame
+        self.skip = hop_length * self.first_frame - self.half_window  # samples before that window
+        self.lock = threading.Lock()
+        # per stream scratch space of `get_features`, grown to the largest window
+        self.scratch = np.empty((0, len(self.mel_filters)), dtype=np.float32)
+        self.computed = np.empty(0, dtype=bool)
+
+    @classmethod
+    def from_feature_extractor(cls, feature_extractor, **kwargs):
+        """Creates a stream with the configuration of a (batch) `FeatureExtractor`."""
+        return cls(
+            feature_extractor.mel_filters,
+            n_fft=feature_extractor.n_fft,
+            hop_length=feature_extractor.hop_length,
+            chunk_length=feature_extractor.chunk_length,
+            sampling_rate=feature_extractor.sampling_rate,
+            **kwargs,
+        )
+
+    @property
+    def end(self) -> int:
+        """Absolute index past the last cached frame."""
+        return self.first_frame + self.count
+
+    def log_mel(self, windows: np.ndarray) -> np.ndarray:
+        """log10 mel power of every row of `windows`, shape (n_frames, n_mels)."""
+        spectrum = np.fft.rfft(windows * self.window, axis=1).astype(np.complex64)
+        power = np.abs(spectrum) ** 2
+        mel = power @ self.mel_filters.T
+        return np.log10(np.maximum(mel, 1e-30))
+
+    def accept(self, audio: np.ndarray) -> int:
+        """
+        Computes the frames completed by the new audio.
+
+        Args:
+            audio (np.ndarray): One dimensional float array following the previously accepted audio.
+
+        Returns:
+            int: The number of frames computed.
+        """
+        if self.skip:
+            skipped = min(self.skip, audio.shape[0])
+            audio = audio[skipped:]
+            self.skip -= skipped
+        samples = np.concatenate([self.tail, audio.astype(np.float32, copy=False)])
+        n_frames = (samples.shape[0] - self.n_fft) // self.hop_length + 1
+        if n_frames <= 0:
+            self.tail = samples
+            return 0
+
+        windows = np.lib.stride_tricks.sliding_window_view(samples, self.n_fft)[:: self.hop_length][:n_frames]
+        log_mel = self.log_mel(windows)
+        self.tail = samples[n_frames * self.hop_length:].copy()
+
+        with self.lock:
+            if self.count + n_frames > self.frames.shape[0]:
+                keep = min(self.count, max(0, self.max_frames - n_frames))
+                self.frames[:keep] = self.frames[self.count - keep:self.count]
+                self.first_frame += self.count - keep
+                self.count = keep
+            if n_frames > self.frames.shape[0]:
+                self.first_frame += n_frames - self.frames.shape[0]
+                log_mel = log_mel[-self.frames.shape[0]:]
+                n_frames = log_mel.shape[0]
+            self.frames[self.count:self.count + n_frames] = log_mel
+            self.count += n_frames
+        return n_frames
+
+    @staticmethod
+    def _collected(audio: np.ndarray, speech_chunks: List[dict], lo: int, hi: int) -> np.ndarray:
+        """
+        Samples [lo, hi) of the collected speech chunks followed by zeros, gathered without
+        concatenating the whole window.
+        """
+        samples = np.zeros(hi - lo, dtype=np.float32)
+        offset = 0  # position of the chunk in the collected audio
+        for chunk in speech_chunks:
+            length = chunk["end"] - chunk["start"]
+            first, last = max(lo, offset), min(hi, offset + length)
+            if first < last:
+                samples[first - lo:last - lo] = audio[chunk["start"] + first - offset:chunk["start"] + last - offset]
+            offset += length
+            if offset >= hi:
+                break
+        return samples
+
+    def _frame(self, audio: np.ndarray, speech_chunks: List[dict], center: int) -> np.ndarray:
+        """
+        The window of the frame centered on `center` of the zero padded collected audio,
+        reflected at the start like faster_whisper's `fram_wave`.
+        """
+        half_window = (self.n_fft - 1) // 2 + 1
+        if center > half_window:
+            return self._collected(audio, speech_chunks, center - half_window, center + half_window)
+        samples = self._collected(audio, speech_chunks, 0, center + half_window)
+        return np.pad(samples, (half_window - center, 0), mode="reflect")
+
+    def get_features(
+        self,
+        audio: np.ndarray,
+        start: int,
+        speech_chunks: Optional[List[dict]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Features of a window of the stream, as the transcriber would compute them.
+
+        Args:
+            audio (np.ndarray): The window, i.e. the samples of the stream from `start` on.
+            start (int): Absolute sample index of the window.
+            speech_chunks (List[dict], optional): Speech chunks of the window passed to the
+                transcriber, the features are then those of the collected chunks.
+
+        Returns:
+            np.ndarray: Features of shape (n_mels, content_frames + nb_max_frames) like
+                `FeatureExtractor(audio)` of the peak normalized (and collected) audio, or None
+                if the chunks are not aligned to the frames or the window is silent.
+        """
+        if speech_chunks is None:
+            speech_chunks = [{"start": 0, "end": audio.shape[0]}]
+        if not speech_chunks:
+            return None
+        hop = self.hop_length
+        for i, chunk in enumerate(speech_chunks):
+            if (start + chunk["start"]) % hop or (i < len(speech_chunks) - 1 and chunk["end"] % hop != chunk["start"] % hop):
+                return None
+        # no temporary absolute copy of the window
+        peak = max(float(audio.max()), -float(audio.min()))
+        if peak == 0:
+            return None
+
+        collected_length = sum(chunk["end"] - chunk["start"] for chunk in speech_chunks)
+        content_frames = collected_length // hop
+        # frames after the content whose window still reaches into the audio count for the clamp
+        n_frames = (collected_length + self.half_window - 1) // hop + 1
+        if self.scratch.shape[0] < n_frames:
+            self.scratch = np.empty((n_frames, len(self.mel_filters)), dtype=np.float32)
+            self.computed = np.empty(n_frames, dtype=bool)
+        log_mel = self.scratch[:n_frames]
+        computed = self.computed[:n_frames]
+        computed[:] = False
+
+        with self.lock:
+            offset = 0  # position of the chunk in the collected audio
+            for chunk in speech_chunks:
+                length = chunk["end"] - chunk["start"]
+                # frames whose window lies within the chunk
+                first = -(-(offset + self.half_window) // hop)
+                last = (offset + length - self.half_window) // hop
+                first_absolute = (start + chunk["start"] - offset) // hop + first
+                skip = max(0, self.first_frame - first_absolute)
+                available = self.end - first_absolute
+                first, last = first + skip, min(last, first + available - 1)
+                if last >= first:
+                    source = first_absolute + skip - self.first_frame
+                    log_mel[first:last + 1] = self.frames[source:source + last - first + 1]
+                    computed[first:last + 1] = True
+                offset += length
+
+        missing = np.flatnonzero(~computed)
+        if missing.shape[0]:
+            windows = np.stack([self._frame(audio, speech_chunks, frame * hop) for frame in missing])
+            log_mel[missing] = self.log_mel(windows)
+
+        # normalization and clamps in place: the features are the only allocation of the window
+        log_mel -= np.float32(2 * np.log10(peak))
+        np.maximum(log_mel, -10.0, out=log_mel)
+        # the zero padded frames after the content are at the -10 floor
+        floor = max(float(log_mel.max()), -10.0) - 8.0
+        features = np.empty((len(self.mel_filters), content_frames + self.nb_max_frames), dtype=np.float32)
+        np.maximum(log_mel, floor, out=log_mel)
+        features[:, :n_frames] = log_mel.T
+        features[:, n_frames:] = max(-10.0, floor)
+        features += 4.0
+        features /= 4.0
+        return features
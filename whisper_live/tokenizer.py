@@ -1,7 +1,9 @@
+import codecs
 import string
+import threading
 
 from functools import cached_property
-from typing import List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import tokenizers
 
@@ -105,6 +107,11 @@ class Tokenizer:
             [s if isinstance(s, str) else self.tokenizer.decode(s) for s in outputs]
         )
 
+    @cached_property
+    def token_table(self) -> Optional["TokenTable"]:
+        """Bytes and text of every token below the timestamps, see `get_token_table`."""
+        return get_token_table(self.tokenizer, self.timestamp_begin)
+
     @cached_property
     def non_speech_tokens(self) -> Tuple[int]:
         """
@@ -155,6 +162,92 @@ class Tokenizer:
     def split_tokens_on_unicode(
         self, tokens: List[int]
     ) -> Tuple[List[str], List[List[int]]]:
+        """
+        Splits the tokens where they decode to complete code points.
+
+        A word ends at the first token after which the decoded word has no replacement
+        character, or only one that is also in the decoded tokens as a whole. Tokens that
+        decode to complete code points on their own are words, taken from `token_table`;
+        the bytes of other words are decoded incrementally, so every token is decoded once
+        instead of the word so far after every token.
+        """
+        token_table = self.token_table
+        if token_table is None:
+            return self._split_tokens_on_unicode_by_prefix(tokens)
+        token_bytes, token_texts = token_table
+
+        decoded_full = None
+        replacement_char = "\ufffd"
+        timestamp_begin = self.timestamp_begin
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+        words = []
+        word_tokens = []
+        current_tokens = []
+        # the decoded word so far, without the bytes of an incomplete code point at its end
+        pieces = []
+        length = 0
+        first_replacement = None
+        unicode_offset = 0
+
+        for token in tokens:
+            if not current_tokens:
+                text = token_texts[token] if token < timestamp_begin else f"<|{(token - timestamp_begin) * 0.02:.2f}|>"
+                if text is not None:
+                    words.append(text)
+                    word_tokens.append([token])
+                    unicode_offset += len(text)
+                    continue
+
+            current_tokens.append(token)
+            if token >= timestamp_begin:
+                # a timestamp ends the text decoded before it
+                text = decoder.decode(b"", final=True) + f"<|{(token - timestamp_begin) * 0.02:.2f}|>"
+                tail = ""
+            else:
+                text = decoder.decode(token_bytes[token])
+                # the decoder only holds back the start of a valid code point, which would
+                # decode to a single replacement character if the word ended here
+                tail = replacement_char if decoder.getstate()[0] else ""
+
+            if text:
+                if first_replacement is None:
+                    index = text.find(replacement_char)
+                    if index >= 0:
+                        first_replacement = length + index
+                pieces.append(text)
+                length += len(text)
+
+            replacement_char_index = first_replacement
+            if replacement_char_index is None:
+                index = tail.find(replacement_char)
+                replacement_char_index = length + index if index >= 0 else None
+
+            if replacement_char_index is not None:
+                if decoded_full is None:
+                    decoded_full = self.decode_with_timestamps(tokens)
+                replacement_char_index += unicode_offset
+            if replacement_char_index is None or (
+                replacement_char_index < len(decoded_full)
+                and decoded_full[replacement_char_index] == replacement_char
+            ):
+                decoded = "".join(pieces) + tail
+                words.append(decoded)
+                word_tokens.append(current_tokens)
+                current_tokens = []
+                unicode_offset += len(decoded)
+                pieces = []
+                length = 0
+                first_replacement = None
+                decoder.reset()
+
+        return words, word_tokens
+
+    def _split_tokens_on_unicode_by_prefix(
+        self, tokens: List[int]
+    ) -> Tuple[List[str], List[List[int]]]:
+        """`split_tokens_on_unicode` for tokenizers that are not byte-level, decoding the
+        word so far after every token."""
         decoded_full = self.decode_with_timestamps(tokens)
         replacement_char = "\ufffd"
 
@@ -205,6 +298,84 @@ class Tokenizer:
         return words, word_tokens
 
 
+def bytes_to_unicode() -> Dict[int, str]:
+    """The printable characters that byte-level BPE vocabularies use for the 256 bytes."""
+    printable = (
+        list(range(ord("!"), ord("~") + 1))
+        + list(range(ord("¡"), ord("¬") + 1))
+        + list(range(ord("®"), ord("ÿ") + 1))
+    )
+    characters = printable[:]
+    shift = 0
+    for byte in range(256):
+        if byte not in printable:
+            printable.append(byte)
+            characters.append(256 + shift)
+            shift += 1
+    return dict(zip(printable, map(chr, characters)))
+
+
+_BYTE_DECODER = {character: byte for byte, character in bytes_to_unicode().items()}
+_token_tables = {}
+_token_tables_lock = threading.Lock()
+
+
+class TokenTable(NamedTuple):
+    """Tokens of a byte-level vocabulary by id.
+
+    Attributes:
+      encoded: The UTF-8 bytes of every token; special tokens, which the decoding skips,
+        have none.
+      decoded: The text of every token that decodes to complete code points on its own and
+        has no replacement character, None for the others.
+    """
+
+    encoded: List[bytes]
+    decoded: List[Optional[str]]
+
+
+def get_token_table(tokenizer: tokenizers.Tokenizer, size: int) -> Optional[TokenTable]:
+    """
+    The `TokenTable` of the tokens below `size`, built once per tokenizer.
+
+    Returns:
+        TokenTable: The table, or None if the vocabulary is not byte-level.
+    """
+    key = (id(tokenizer), size)
+    with _token_tables_lock:
+        entry = _token_tables.get(key)
+    if entry is not None:
+        return entry[1]
+
+    table = []
+    for token_id in range(size):
+        token = tokenizer.id_to_token(token_id)
+        # special tokens such as <|endoftext|> decode to nothing
+        if token is None or (token.startswith("<|") and token.endswith("|>") and not tokenizer.decode([token_id])):
+            table.append(b"")
+            continue
+        try:
+            table.append(bytes(_BYTE_DECODER[character] for character in token))
+        except KeyError:
+            table = None
+            break
+
+    if table is not None:
+        texts = []
+        for encoded in table:
+            try:
+                text = encoded.decode("utf-8")
+            except UnicodeDecodeError:
+                text = None
+            texts.append(None if text is None or "\ufffd" in text else text)
+        table = TokenTable(table, texts)
+
+    with _token_tables_lock:
+        # the tokenizer is kept so that its id is not reused
+        _token_tables[key] = (tokenizer, table)
+    return table
+
+
 _TASKS = (
     "transcribe",
     "translate",
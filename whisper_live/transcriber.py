@@ -1,9 +1,11 @@
 import json
 import logging
 import os
+import threading
 import time
 import zlib
 
+from collections import OrderedDict
 from inspect import signature
 from typing import BinaryIO, Iterable, List, NamedTuple, Optional, Tuple, Union
 
@@ -12,9 +14,11 @@ import numpy as np
 import tokenizers
 
 from faster_whisper.audio import decode_audio, pad_or_trim
-from faster_whisper.feature_extractor import FeatureExtractor
-from faster_whisper.tokenizer import _LANGUAGE_CODES, Tokenizer
+from faster_whisper.tokenizer import _LANGUAGE_CODES
 from faster_whisper.utils import download_model, format_timestamp, get_end, get_logger
+from whisper_live.feature_extractor import FeatureExtractor, get_feature_extractor
+from whisper_live.streaming_features import StreamingFeatureExtractor
+from whisper_live.tokenizer import Tokenizer
 from whisper_live.vad_silero import (
     SpeechTimestampsMap,
     VadOptions,
@@ -82,6 +86,159 @@ class TranscriptionInfo(NamedTuple):
     vad_options: VadOptions
 
 
+class FallbackOptions(NamedTuple):
+    """Temperature fallback policy.
+
+    Attributes:
+      max_attempts: Decodings per window, the first one included. None for one per temperature.
+      batch_fallback: Whether the windows of a batch rejected at a temperature are decoded
+        again together in one generate call instead of one call per window.
+    """
+
+    max_attempts: Optional[int] = None
+    batch_fallback: bool = True
+
+
+class FallbackStats:
+    """
+    Counters of the temperature fallback of a model.
+
+    Attributes:
+        temperatures (dict): Windows decoded at every temperature; the first temperature counts
+            every window, the others how often the fallback reached them.
+        fallback_time (float): Seconds spent in decodings after the first temperature.
+        deadline_stops (int): Windows whose fallback stopped because of their deadline.
+        attempt_cap_stops (int): Windows whose fallback stopped at `max_attempts`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.temperatures = {}
+        self.fallback_time = 0.0
+        self.deadline_stops = 0
+        self.attempt_cap_stops = 0
+
+    def record_temperature(self, temperature, windows):
+        with self.lock:
+            self.temperatures[temperature] = self.temperatures.get(temperature, 0) + windows
+
+    def record_stops(self, deadline_stops=0, attempt_cap_stops=0, fallback_time=0.0):
+        with self.lock:
+            self.deadline_stops += deadline_stops
+            self.attempt_cap_stops += attempt_cap_stops
+            self.fallback_time += fallback_time
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "temperatures": {str(temperature): count for temperature, count in sorted(self.temperatures.items())},
+                "fallback_seconds": round(self.fallback_time, 3),
+                "deadline_stops": self.deadline_stops,
+                "attempt_cap_stops": self.attempt_cap_stops,
+            }
+
+
+class DecodeContext(NamedTuple):
+    """Decoding artifacts of one (task, language, prompt, hotwords, suppressed tokens) key,
+    shared by all transcriptions with that key, see `WhisperModel.get_decode_context`.
+    The token lists are shared and must not be modified.
+
+    Attributes:
+      tokenizer: The tokenizer, whose special tokens are looked up once.
+      suppress_tokens: The suppressed tokens, see `get_suppressed_tokens`.
+      prompt_tokens: Tokens of the initial prompt.
+      hotwords_tokens: Tokens of the hotwords, at most half the context, or None.
+    """
+
+    tokenizer: Tokenizer
+    suppress_tokens: Optional[List[int]]
+    prompt_tokens: List[int]
+    hotwords_tokens: Optional[List[int]]
+
+
+class DecodeContextCache:
+    """
+    Least recently used decode contexts and initial prompt encodings of a model.
+
+    Sessions transcribe every window with the same task, language, prompt and hotwords,
+    so their tokenizer, suppressed tokens and prompt tokens are built once and reused
+    instead of on every call.
+
+    Args:
+        max_size (int): Contexts, and prompts, kept at most. Defaults to 256.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.contexts = OrderedDict()
+        self.prompts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, entries: OrderedDict, key, create):
+        """The entry of the key, created outside the lock if it is missing."""
+        with self.lock:
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = create()
+        with self.lock:
+            entries[key] = value
+            if len(entries) > self.max_size:
+                entries.popitem(last=False)
+        return value
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "contexts": len(self.contexts),
+                "prompts": len(self.prompts),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class MemoTokenizer:
+    """
+    Tokenizer of one transcription call that decodes every token sequence once: a result is
+    decoded for its compression ratio and again for the text of its segments, which are
+    often the whole result. Everything else is delegated to the tokenizer of the context.
+    """
+
+    def __init__(self, context: DecodeContext):
+        self.context = context
+        self._tokenizer = context.tokenizer
+        self._decoded = {}
+
+    def __getattr__(self, name):
+        return getattr(self._tokenizer, name)
+
+    def decode(self, tokens: List[int]) -> str:
+        key = tuple(tokens)
+        text = self._decoded.get(key)
+        if text is None:
+            text = self._decoded[key] = self._tokenizer.decode(tokens)
+        return text
+
+
+class TranscriptionRequest(NamedTuple):
+    """One audio window of a batch passed to `WhisperModel.transcribe_batch`."""
+
+    audio: np.ndarray
+    language: Optional[str] = None
+    task: str = "transcribe"
+    initial_prompt: Optional[Union[str, Iterable[int]]] = None
+    vad_filter: bool = False
+    vad_parameters: Optional[Union[dict, VadOptions]] = None
+    speech_chunks: Optional[List[dict]] = None
+    features: Optional[np.ndarray] = None
+    deadline: Optional[float] = None
+
+
 class WhisperModel:
     def __init__(
         self,
@@ -94,6 +251,8 @@ class WhisperModel:
         download_root: Optional[str] = None,
         local_files_only: bool = False,
         files: dict = None,
+        feature_backend: str = "numpy",
+        fallback_options: Optional[FallbackOptions] = None,
         **model_kwargs,
     ):
         """Initializes the Whisper model.
@@ -125,6 +284,9 @@ class WhisperModel:
           files: Load model files from the memory. This argument is a dictionary mapping file names
             to file contents as file-like or bytes objects. If this is set, model_path acts as an
             identifier for this model.
+          feature_backend: Backend computing the log-mel features, "numpy" (pocketfft on
+            CPU) or "torch" (torch.stft on the model's device).
+          fallback_options: Temperature fallback policy, see `FallbackOptions`.
         """
         self.logger = get_logger()
 
@@ -163,7 +325,11 @@ class WhisperModel:
                 "openai/whisper-tiny" + ("" if self.model.is_multilingual else ".en")
             )
         self.feat_kwargs = self._get_feature_kwargs(model_path, preprocessor_bytes)
-        self.feature_extractor = FeatureExtractor(**self.feat_kwargs)
+        backend_kwargs = {"device": "cpu" if device == "cpu" else "auto"} if feature_backend == "torch" else {}
+        self.feature_extractor = get_feature_extractor(feature_backend, **self.feat_kwargs, **backend_kwargs)
+        self.fallback_options = fallback_options or FallbackOptions()
+        self.fallback_stats = FallbackStats()
+        self.decode_contexts = DecodeContextCache()
         self.num_samples_per_token = self.feature_extractor.hop_length * 2
         self.frames_per_second = (
             self.feature_extractor.sampling_rate // self.feature_extractor.hop_length
@@ -180,6 +346,47 @@ class WhisperModel:
         """The languages supported by the model."""
         return list(_LANGUAGE_CODES) if self.model.is_multilingual else ["en"]
 
+    def get_fallback_stats(self) -> dict:
+        """Counters of the temperature fallback, see `FallbackStats`."""
+        return self.fallback_stats.to_dict()
+
+    def get_decode_context(
+        self,
+        task: str,
+        language: str,
+        initial_prompt: Optional[Union[str, Iterable[int]]] = None,
+        hotwords: Optional[str] = None,
+        suppress_tokens: Optional[List[int]] = [-1],
+    ) -> DecodeContext:
+        """The decode context of the key, built on the first call and cached afterwards."""
+        prompt_key = initial_prompt if initial_prompt is None or isinstance(initial_prompt, str) else tuple(initial_prompt)
+        suppress_key = None if suppress_tokens is None else tuple(suppress_tokens)
+
+        def create():
+            tokenizer = Tokenizer(
+                self.hf_tokenizer,
+                self.model.is_multilingual,
+                task=task,
+                language=language,
+            )
+            hotwords_tokens = None
+            if hotwords:
+                hotwords_tokens = tokenizer.encode(" " + hotwords.strip())[: self.max_length // 2 - 1]
+            return DecodeContext(
+                tokenizer=tokenizer,
+                suppress_tokens=get_suppressed_tokens(tokenizer, suppress_tokens),
+                prompt_tokens=self._encode_initial_prompt(initial_prompt),
+                hotwords_tokens=hotwords_tokens,
+            )
+
+        return self.decode_contexts.get(
+            self.decode_contexts.contexts, (task, language, prompt_key, hotwords, suppress_key), create
+        )
+
+    def create_feature_stream(self, **kwargs) -> StreamingFeatureExtractor:
+        """Returns a streaming log-mel extractor with the configuration of this model."""
+        return StreamingFeatureExtractor.from_feature_extractor(self.feature_extractor, **kwargs)
+
     def _get_feature_kwargs(self, model_path, preprocessor_bytes=None) -> dict:
         config = {}
         try:
@@ -238,6 +445,9 @@ class WhisperModel:
         clip_timestamps: Union[str, List[float]] = "0",
         hallucination_silence_threshold: Optional[float] = None,
         hotwords: Optional[str] = None,
+        speech_chunks: Optional[List[dict]] = None,
+        features: Optional[np.ndarray] = None,
+        deadline: Optional[float] = None,
     ) -> Tuple[Iterable[Segment], TranscriptionInfo]:
         """Transcribes an input file.
 
@@ -302,6 +512,14 @@ class WhisperModel:
              (in seconds) when a possible hallucination is detected
           hotwords:
             Hotwords/hint phrases to provide the model with. Has no effect if prefix is not None.
+          speech_chunks: Speech chunks of the audio already computed by the caller, e.g. by a
+            streaming VAD (list of dicts with start and end samples). When vad_filter is set,
+            they are used instead of running the VAD again.
+          features: Log-mel features of the (peak normalized and VAD filtered) audio already
+            computed by the caller, e.g. by a `StreamingFeatureExtractor`. Ignored if
+            chunk_length is set.
+          deadline: `time.monotonic()` time by which the result is due. The temperature
+            fallback makes no attempt that would end after it, see `FallbackOptions`.
           language_detection_threshold: If the maximum probability of the language tokens is higher
            than this value, the language is detected.
           language_detection_segments: Number of segments to consider for the language detection.
@@ -313,52 +531,26 @@ class WhisperModel:
         """
         sampling_rate = self.feature_extractor.sampling_rate
 
-        # If you need floats between -1 and 1, you can normalize:
-        audio = audio / np.max(np.abs(audio))
-        if not isinstance(audio, np.ndarray):
-            audio = decode_audio(audio, sampling_rate=sampling_rate)
-
-        duration = audio.shape[0] / sampling_rate
-        duration_after_vad = duration
-
-        self.logger.info(
-            "Processing audio with duration %s", format_timestamp(duration)
+        (
+            audio,
+            duration,
+            duration_after_vad,
+            speech_chunks,
+            vad_parameters,
+        ) = self._prepare_audio(
+            audio,
+            vad_filter,
+            vad_parameters,
+            clip_timestamps,
+            speech_chunks,
+            need_audio=features is None or chunk_length is not None,
         )
 
-        if vad_filter and clip_timestamps == "0":
-            if vad_parameters is None:
-                vad_parameters = VadOptions()
-            elif isinstance(vad_parameters, dict):
-                vad_parameters = VadOptions(**vad_parameters)
-            speech_chunks = get_speech_timestamps(audio, vad_parameters)
-            audio = collect_chunks(audio, speech_chunks)
-            duration_after_vad = audio.shape[0] / sampling_rate
-
-            self.logger.info(
-                "VAD filter removed %s of audio",
-                format_timestamp(duration - duration_after_vad),
-            )
-
-            if self.logger.isEnabledFor(logging.DEBUG):
-                self.logger.debug(
-                    "VAD filter kept the following audio segments: %s",
-                    ", ".join(
-                        "[%s -> %s]"
-                        % (
-                            format_timestamp(chunk["start"] / sampling_rate),
-                            format_timestamp(chunk["end"] / sampling_rate),
-                        )
-                        for chunk in speech_chunks
-                    ),
-                )
-
-        else:
-            speech_chunks = None
-
-        if audio.shape[0] == 0:
+        if duration_after_vad == 0:
             return None, None
 
-        features = self.feature_extractor(audio, chunk_length=chunk_length)
+        if features is None or chunk_length is not None:
+            features = self.feature_extractor(audio, chunk_length=chunk_length)
 
         encoder_output = None
         all_language_probs = None
@@ -371,35 +563,20 @@ class WhisperModel:
             language = "en"
 
         if language is None:
-            max_length = 3000
-
-            diff_length = max_length - features.shape[-1]
-            if diff_length > 0:
-                cropped_features = np.concatenate(
-                    [features, np.full((features.shape[0], diff_length), -1.5, dtype=features.dtype)],
-                    axis=1
-                )
-            else:
-                cropped_features = features[..., :max_length]
-
-            cropped_features = np.ascontiguousarray(cropped_features)
-            f_storage = ctranslate2.StorageView.from_array(np.expand_dims(cropped_features, axis=0))
-
-            all_language_probs = self.model.detect_language(features=f_storage)
-
-            sorted_languages = sorted(all_language_probs[0], key=lambda x: x[1], reverse=True)
-            language, language_probability = sorted_languages[0]
-            language = language.strip('<|>').strip()
-            self.logger.info(f"Detected {language}, with {language_probability} probability")
+            # the first window is encoded once, for the detection and its decoding
+            nb_max_frames = self.feature_extractor.nb_max_frames
+            first_window = features[:, :min(nb_max_frames, features.shape[-1] - nb_max_frames)]
+            encoder_output = self.encode(pad_or_trim(first_window, nb_max_frames))
+            (
+                language,
+                language_probability,
+                all_language_probs,
+            ) = self._detect_languages(encoder_output)[0]
         else:
             language_probability = 1
 
-        tokenizer = Tokenizer(
-            self.hf_tokenizer,
-            self.model.is_multilingual,
-            task=task,
-            language=language,
-        )
+        context = self.get_decode_context(task, language, initial_prompt, hotwords, suppress_tokens)
+        tokenizer = MemoTokenizer(context)
 
         options = TranscriptionOptions(
             beam_size=beam_size,
@@ -419,7 +596,7 @@ class WhisperModel:
             initial_prompt=initial_prompt,
             prefix=prefix,
             suppress_blank=suppress_blank,
-            suppress_tokens=get_suppressed_tokens(tokenizer, suppress_tokens),
+            suppress_tokens=context.suppress_tokens,
             without_timestamps=without_timestamps,
             max_initial_timestamp=max_initial_timestamp,
             word_timestamps=word_timestamps,
@@ -432,7 +609,7 @@ class WhisperModel:
         )
 
 
-        segments = self.generate_segments(features, tokenizer, options, encoder_output)
+        segments = self.generate_segments(features, tokenizer, options, encoder_output, deadline, context=context)
 
         if speech_chunks:
             segments = restore_speech_timestamps(segments, speech_chunks, sampling_rate)
@@ -448,12 +625,607 @@ class WhisperModel:
         )
         return segments, info
 
+    def transcribe_batch(
+        self,
+        requests: List[TranscriptionRequest],
+        beam_size: int = 3,
+        best_of: int = 3,
+        patience: float = 1.5,
+        length_penalty: float = 1,
+        repetition_penalty: float = 1.1,
+        no_repeat_ngram_size: int = 2,
+        temperature: Union[float, List[float], Tuple[float, ...]] = [
+            0.0,
+            0.2,
+            0.4,
+            0.6,
+            0.8,
+            1.0,
+        ],
+        compression_ratio_threshold: Optional[float] = 2.4,
+        log_prob_threshold: Optional[float] = -1.0,
+        no_speech_threshold: Optional[float] = 0.6,
+        suppress_blank: bool = True,
+        suppress_tokens: Optional[List[int]] = [-1],
+        without_timestamps: bool = False,
+        max_initial_timestamp: float = 1.0,
+        max_new_tokens: Optional[int] = None,
+        hotwords: Optional[str] = None,
+        word_timestamps: bool = False,
+    ) -> List[Tuple[Optional[List[Segment]], Optional[TranscriptionInfo]]]:
+        """Transcribes several audio windows of up to 30 seconds with batched model calls.
+
+        Windows with prompts of the same length are encoded with one `encode` call and
+        decoded with one `generate` call at the first temperature. Windows whose result is
+        rejected by the fallback thresholds are retried with the remaining temperatures as
+        `self.fallback_options` allows, see `generate_batch_with_fallback`, and audio longer
+        than one window is passed to `transcribe`.
+
+        Arguments:
+          requests: The audio windows with their language, task, prompt and VAD settings, and
+            optionally their precomputed features and deadline.
+          The remaining arguments are the decoding options shared by the whole batch,
+          see `transcribe`.
+
+        Returns:
+          A (segments, info) tuple for every request, with the segments as a list, or
+          (None, None) if the request contains no audio after VAD.
+        """
+        decode_options = dict(
+            beam_size=beam_size,
+            best_of=best_of,
+            patience=patience,
+            length_penalty=length_penalty,
+            repetition_penalty=repetition_penalty,
+            no_repeat_ngram_size=no_repeat_ngram_size,
+            temperature=temperature,
+            compression_ratio_threshold=compression_ratio_threshold,
+            log_prob_threshold=log_prob_threshold,
+            no_speech_threshold=no_speech_threshold,
+            suppress_blank=suppress_blank,
+            suppress_tokens=suppress_tokens,
+            without_timestamps=without_timestamps,
+            max_initial_timestamp=max_initial_timestamp,
+            max_new_tokens=max_new_tokens,
+            hotwords=hotwords,
+            word_timestamps=word_timestamps,
+        )
+        sampling_rate = self.feature_extractor.sampling_rate
+        nb_max_frames = self.feature_extractor.nb_max_frames
+        results = [(None, None)] * len(requests)
+
+        windows = []
+        for index, request in enumerate(requests):
+            (
+                audio,
+                duration,
+                duration_after_vad,
+                speech_chunks,
+                vad_parameters,
+            ) = self._prepare_audio(
+                request.audio,
+                request.vad_filter,
+                request.vad_parameters,
+                speech_chunks=request.speech_chunks,
+                need_audio=request.features is None,
+            )
+            if duration_after_vad == 0:
+                continue
+
+            features = request.features
+            if features is None:
+                features = self.feature_extractor(audio)
+            content_frames = features.shape[-1] - nb_max_frames
+            if content_frames > nb_max_frames:
+                segments, info = self.transcribe(
+                    request.audio,
+                    language=request.language,
+                    task=request.task,
+                    initial_prompt=request.initial_prompt,
+                    vad_filter=request.vad_filter,
+                    vad_parameters=request.vad_parameters,
+                    speech_chunks=request.speech_chunks,
+                    features=request.features,
+                    deadline=request.deadline,
+                    **decode_options,
+                )
+                results[index] = (None, None) if segments is None else (list(segments), info)
+                continue
+
+            windows.append(dict(
+                index=index,
+                request=request,
+                features=features[:, :content_frames],
+                duration=duration,
+                duration_after_vad=duration_after_vad,
+                speech_chunks=speech_chunks,
+                vad_parameters=vad_parameters,
+                language=request.language,
+                language_probability=1,
+                all_language_probs=None,
+            ))
+
+        if not windows:
+            return results
+
+        for window in windows:
+            if not self.model.is_multilingual:
+                window["language"] = "en"
+
+        # the decoder takes one prompt length per call, sessions normally share it; the
+        # length does not depend on the language, so a group is encoded once for the
+        # language detection and the decoding
+        groups = {}
+        call_tokenizers = {}
+        for window in windows:
+            previous_tokens = self._encode_initial_prompt(window["request"].initial_prompt)
+            window["previous_tokens"] = previous_tokens
+            groups.setdefault(min(len(previous_tokens), self.max_length // 2 - 1), []).append(window)
+
+        for group in groups.values():
+            # the windows are zero padded straight into the encoder input of the batch
+            batch_features = np.zeros((len(group), group[0]["features"].shape[0], nb_max_frames), dtype=np.float32)
+            for features, window in zip(batch_features, group):
+                features[:, :window["features"].shape[-1]] = window["features"]
+            padded_features = list(batch_features)
+            encoder_output = self.encode(batch_features)
+            if any(window["language"] is None for window in group):
+                detected = self._detect_languages(encoder_output)
+                for window, (language, language_probability, all_language_probs) in zip(group, detected):
+                    if window["language"] is None:
+                        window["language"] = language
+                        window["language_probability"] = language_probability
+                        window["all_language_probs"] = all_language_probs
+
+            for window in group:
+                request = window["request"]
+                context = self.get_decode_context(
+                    request.task, window["language"], request.initial_prompt, hotwords, suppress_tokens
+                )
+                # windows with the same context share the decodes of the call
+                tokenizer = call_tokenizers.get(id(context))
+                if tokenizer is None:
+                    tokenizer = call_tokenizers[id(context)] = MemoTokenizer(context)
+                options = TranscriptionOptions(
+                    beam_size=beam_size,
+                    best_of=best_of,
+                    patience=patience,
+                    length_penalty=length_penalty,
+                    repetition_penalty=repetition_penalty,
+                    no_repeat_ngram_size=no_repeat_ngram_size,
+                    log_prob_threshold=log_prob_threshold,
+                    no_speech_threshold=no_speech_threshold,
+                    compression_ratio_threshold=compression_ratio_threshold,
+                    condition_on_previous_text=True,
+                    prompt_reset_on_temperature=0.5,
+                    temperatures=(
+                        temperature if isinstance(temperature, (list, tuple)) else [temperature]
+                    ),
+                    initial_prompt=request.initial_prompt,
+                    prefix=None,
+                    suppress_blank=suppress_blank,
+                    suppress_tokens=context.suppress_tokens,
+                    without_timestamps=without_timestamps,
+                    max_initial_timestamp=max_initial_timestamp,
+                    word_timestamps=word_timestamps,
+                    prepend_punctuations="\"'“¿([{-",
+                    append_punctuations="\"'.。,，!！?？:：”)]}、",
+                    max_new_tokens=max_new_tokens,
+                    clip_timestamps=[0.0],
+                    hallucination_silence_threshold=None,
+                    hotwords=hotwords,
+                )
+                prompt = self.get_prompt(
+                    tokenizer,
+                    window["previous_tokens"],
+                    without_timestamps=options.without_timestamps,
+                    hotwords=options.hotwords,
+                    hotwords_tokens=context.hotwords_tokens,
+                )
+                window.update(tokenizer=tokenizer, options=options, prompt=prompt)
+
+            decode_results = self.generate_batch_with_fallback(
+                encoder_output,
+                [window["prompt"] for window in group],
+                [window["tokenizer"] for window in group],
+                group[0]["options"],
+                features=padded_features,
+                deadlines=[window["request"].deadline for window in group],
+            )
+            for window, decode_result in zip(group, decode_results):
+                segment_size = window["features"].shape[-1]
+                window["segments"] = self._get_window_segments(
+                    decode_result,
+                    window["tokenizer"],
+                    window["options"],
+                    segment_size,
+                    segment_size * self.feature_extractor.time_per_frame,
+                )
+            if word_timestamps:
+                # the windows are aligned against the encoder output they were decoded from
+                self._add_window_word_timestamps(group, encoder_output, padded_features)
+
+        for window in windows:
+            options = window["options"]
+            segments = window["segments"]
+            if window["speech_chunks"]:
+                segments = restore_speech_timestamps(
+                    segments, window["speech_chunks"], sampling_rate
+                )
+
+            info = TranscriptionInfo(
+                language=window["language"],
+                language_probability=window["language_probability"],
+                duration=window["duration"],
+                duration_after_vad=window["duration_after_vad"],
+                transcription_options=options,
+                vad_options=window["vad_parameters"],
+                all_language_probs=window["all_language_probs"],
+            )
+            results[window["index"]] = (segments, info)
+
+        return results
+
+    def _encode_initial_prompt(self, initial_prompt: Optional[Union[str, Iterable[int]]]) -> List[int]:
+        """Tokens of an initial prompt; the text encoding does not depend on the language and
+        is cached, the returned list must not be modified."""
+        if initial_prompt is None:
+            return []
+        if isinstance(initial_prompt, str):
+            return self.decode_contexts.get(
+                self.decode_contexts.prompts,
+                initial_prompt,
+                lambda: self.hf_tokenizer.encode(" " + initial_prompt.strip(), add_special_tokens=False).ids,
+            )
+        return list(initial_prompt)
+
+    def _get_window_segments(
+        self,
+        decode_result: Tuple[ctranslate2.models.WhisperGenerationResult, float, float, float],
+        tokenizer: Tokenizer,
+        options: TranscriptionOptions,
+        segment_size: int,
+        segment_duration: float,
+    ) -> List[Segment]:
+        """Builds the segments of a single window that starts at time 0."""
+        result, avg_logprob, temperature, compression_ratio = decode_result
+
+        if options.no_speech_threshold is not None:
+            # no voice activity check
+            should_skip = result.no_speech_prob > options.no_speech_threshold
+            if (
+                options.log_prob_threshold is not None
+                and avg_logprob > options.log_prob_threshold
+            ):
+                # don't skip if the logprob is high enough, despite the no_speech_prob
+                should_skip = False
+            if should_skip:
+                return []
+
+        current_segments, seek = self._split_segments_by_timestamps(
+            tokenizer, result.sequences_ids[0], 0.0, segment_size, segment_duration, 0
+        )
+
+        segments = []
+        for segment in current_segments:
+            text = tokenizer.decode(segment["tokens"])
+            if segment["start"] == segment["end"] or not text.strip():
+                continue
+            segments.append(Segment(
+                id=len(segments) + 1,
+                seek=seek,
+                start=segment["start"],
+                end=segment["end"],
+                text=text,
+                tokens=segment["tokens"],
+                temperature=temperature,
+                avg_logprob=avg_logprob,
+                compression_ratio=compression_ratio,
+                no_speech_prob=result.no_speech_prob,
+                words=None,
+            ))
+        return segments
+
+    def _add_window_word_timestamps(
+        self,
+        group: List[dict],
+        encoder_output: ctranslate2.StorageView,
+        features: List[np.ndarray],
+    ) -> None:
+        """Adds the word timestamps to the segments of the windows of a batch."""
+        text_tokens = [
+            [token for segment in window["segments"] for token in segment.tokens if token < window["tokenizer"].eot]
+            for window in group
+        ]
+        alignments = self.find_alignments(
+            [window["tokenizer"] for window in group],
+            text_tokens,
+            encoder_output,
+            [window["features"].shape[-1] for window in group],
+            features=features,
+        )
+        for window, alignment in zip(group, alignments):
+            options = window["options"]
+            segments = [segment._asdict() for segment in window["segments"]]
+            self.add_word_timestamps(
+                segments,
+                window["tokenizer"],
+                alignment,
+                0.0,
+                options.prepend_punctuations,
+                options.append_punctuations,
+                last_speech_timestamp=0.0,
+            )
+            window["segments"] = [
+                Segment(**{**segment, "words": [Word(**word) for word in segment["words"]]})
+                for segment in segments
+            ]
+
+    def find_alignments(
+        self,
+        tokenizers: List[Tokenizer],
+        text_tokens: List[List[int]],
+        encoder_output: ctranslate2.StorageView,
+        num_frames: List[int],
+        median_filter_width: int = 7,
+        features: Optional[List[np.ndarray]] = None,
+    ) -> List[List[dict]]:
+        """Aligns the text tokens of every window of a batch with its audio.
+
+        CTranslate2 computes the cross-attention weights of the alignment heads for the
+        text tokens and finds their alignment with the audio frames by dynamic time
+        warping. The windows sharing a start sequence (task and language) are aligned in
+        one call.
+
+        Returns:
+          For every window, the list of words with their tokens, start and end time
+          relative to the window and their probability.
+        """
+        alignments = [[] for _ in text_tokens]
+        groups = {}
+        for index, (tokenizer, tokens) in enumerate(zip(tokenizers, text_tokens)):
+            if tokens:
+                groups.setdefault(tuple(tokenizer.sot_sequence), []).append(index)
+
+        for sot_sequence, indices in groups.items():
+            if len(indices) < len(text_tokens):
+                group_output = self._select_encoder_output(encoder_output, indices, features)
+            else:
+                group_output = encoder_output
+            results = self.model.align(
+                group_output,
+                list(sot_sequence),
+                [text_tokens[index] for index in indices],
+                [num_frames[index] for index in indices],
+                median_filter_width=median_filter_width,
+            )
+            for index, result in zip(indices, results):
+                alignments[index] = self._get_word_alignment(tokenizers[index], text_tokens[index], result)
+        return alignments
+
+    def _get_word_alignment(self, tokenizer: Tokenizer, text_tokens: List[int], result) -> List[dict]:
+        """Words of the text tokens with their times, from the token to frame alignment."""
+        text_token_probs = result.text_token_probs
+        text_indices = np.array([pair[0] for pair in result.alignments])
+        time_indices = np.array([pair[1] for pair in result.alignments])
+
+        words, word_tokens = tokenizer.split_to_word_tokens(text_tokens + [tokenizer.eot])
+        if len(word_tokens) <= 1:
+            # the only token is the end of text
+            return []
+        word_boundaries = np.pad(np.cumsum([len(tokens) for tokens in word_tokens[:-1]]), (1, 0))
+
+        jumps = np.pad(np.diff(text_indices), (1, 0), constant_values=1).astype(bool)
+        jump_times = time_indices[jumps] / self.tokens_per_second
+        start_times = jump_times[word_boundaries[:-1]]
+        end_times = jump_times[word_boundaries[1:]]
+        word_probabilities = [
+            np.mean(text_token_probs[i:j])
+            for i, j in zip(word_boundaries[:-1], word_boundaries[1:])
+        ]
+
+        return [
+            dict(word=word, tokens=tokens, start=start, end=end, probability=probability)
+            for word, tokens, start, end, probability in zip(
+                words, word_tokens, start_times, end_times, word_probabilities
+            )
+        ]
+
+    def add_word_timestamps(
+        self,
+        segments: List[dict],
+        tokenizer: Tokenizer,
+        alignment: List[dict],
+        time_offset: float,
+        prepend_punctuations: str,
+        append_punctuations: str,
+        last_speech_timestamp: float,
+    ) -> float:
+        """Distributes the aligned words of a window over its segments.
+
+        Sets the "words" of every segment dict and moves the segment boundaries to its
+        first and last word, unless a word is unreasonably long.
+
+        Returns:
+          The end of the last segment with words, the last speech timestamp for the next window.
+        """
+        if len(segments) == 0:
+            return last_speech_timestamp
+
+        word_durations = np.array([word["end"] - word["start"] for word in alignment])
+        word_durations = word_durations[word_durations.nonzero()]
+        median_duration = np.median(word_durations) if len(word_durations) > 0 else 0.0
+        median_duration = min(0.7, float(median_duration))
+        max_duration = median_duration * 2
+
+        # hack: truncate long words at sentence boundaries
+        if len(word_durations) > 0:
+            sentence_end_marks = ".。!！?？"
+            for i in range(1, len(alignment)):
+                if alignment[i]["end"] - alignment[i]["start"] > max_duration:
+                    if alignment[i]["word"] in sentence_end_marks:
+                        alignment[i]["end"] = alignment[i]["start"] + max_duration
+                    elif alignment[i - 1]["word"] in sentence_end_marks:
+                        alignment[i]["start"] = alignment[i]["end"] - max_duration
+
+        merge_punctuations(alignment, prepend_punctuations, append_punctuations)
+
+        word_index = 0
+        for segment in segments:
+            text_tokens = [token for token in segment["tokens"] if token < tokenizer.eot]
+            saved_tokens = 0
+            words = []
+            while word_index < len(alignment) and saved_tokens < len(text_tokens):
+                timing = alignment[word_index]
+                if timing["word"]:
+                    words.append(dict(
+                        word=timing["word"],
+                        start=round(time_offset + timing["start"], 2),
+                        end=round(time_offset + timing["end"], 2),
+                        probability=timing["probability"],
+                    ))
+                saved_tokens += len(timing["tokens"])
+                word_index += 1
+
+            # hack: truncate long words at segment boundaries
+            if len(words) > 0:
+                # the first and second word after a pause are at most twice the median word duration
+                if words[0]["end"] - last_speech_timestamp > median_duration * 4 and (
+                    words[0]["end"] - words[0]["start"] > max_duration
+                    or (len(words) > 1 and words[1]["end"] - words[0]["start"] > max_duration * 2)
+                ):
+                    if len(words) > 1 and words[1]["end"] - words[1]["start"] > max_duration:
+                        boundary = max(words[1]["end"] / 2, words[1]["end"] - max_duration)
+                        words[0]["end"] = words[1]["start"] = boundary
+                    words[0]["start"] = max(0, words[0]["end"] - max_duration)
+
+                # prefer the segment-level start timestamp if the first word is too long
+                if segment["start"] < words[0]["end"] and segment["start"] - 0.5 > words[0]["start"]:
+                    words[0]["start"] = max(0, min(words[0]["end"] - median_duration, segment["start"]))
+                else:
+                    segment["start"] = words[0]["start"]
+
+                # prefer the segment-level end timestamp if the last word is too long
+                if segment["end"] > words[-1]["start"] and segment["end"] + 0.5 < words[-1]["end"]:
+                    words[-1]["end"] = max(words[-1]["start"] + median_duration, segment["end"])
+                else:
+                    segment["end"] = words[-1]["end"]
+
+                last_speech_timestamp = segment["end"]
+
+            segment["words"] = words
+        return last_speech_timestamp
+
+    def _detect_languages(
+        self, encoder_output: ctranslate2.StorageView
+    ) -> List[Tuple[str, float, List[Tuple[str, float]]]]:
+        """Detects the language of every window of a batch from its encoder output.
+
+        The encoder output is the one the windows are decoded from, so the detection only
+        adds a single decoder step.
+
+        Returns:
+          A list with the detected language, its probability and the probabilities
+          of all languages for every window.
+        """
+        all_language_probs = self.model.detect_language(encoder_output)
+
+        detected = []
+        for language_probs in all_language_probs:
+            language_probs = [
+                (token.strip('<|>').strip(), probability) for token, probability in language_probs
+            ]
+            language, language_probability = max(language_probs, key=lambda x: x[1])
+            self.logger.info(f"Detected {language}, with {language_probability} probability")
+            detected.append((language, language_probability, language_probs))
+        return detected
+
+    def _prepare_audio(
+        self,
+        audio: Union[str, BinaryIO, np.ndarray],
+        vad_filter: bool,
+        vad_parameters: Optional[Union[dict, VadOptions]],
+        clip_timestamps: Union[str, List[float]] = "0",
+        speech_chunks: Optional[List[dict]] = None,
+        need_audio: bool = True,
+    ) -> Tuple[Optional[np.ndarray], float, float, Optional[List[dict]], Optional[VadOptions]]:
+        """Normalizes the audio and removes the non-speech parts if vad_filter is set.
+
+        The VAD is only run if no precomputed speech_chunks are given. The input, often a
+        read-only view of a session's audio buffer, is copied once: by the collection of the
+        speech chunks, normalized in place afterwards, or by the normalization itself. If the
+        audio is not needed, e.g. because its features are given, it is not copied at all.
+
+        Returns:
+          A tuple with the audio (None if not needed), its duration, its duration after VAD,
+          the speech chunks kept by the VAD (None if the VAD is not applied) and the VAD options.
+        """
+        sampling_rate = self.feature_extractor.sampling_rate
+
+        if not isinstance(audio, np.ndarray):
+            audio = decode_audio(audio, sampling_rate=sampling_rate)
+        # the peak without a temporary copy of the absolute values
+        peak = max(float(audio.max()), -float(audio.min())) if audio.shape[0] else 0.0
+
+        duration = audio.shape[0] / sampling_rate
+        duration_after_vad = duration
+
+        self.logger.info(
+            "Processing audio with duration %s", format_timestamp(duration)
+        )
+
+        if vad_filter and clip_timestamps == "0":
+            if vad_parameters is None:
+                vad_parameters = VadOptions()
+            elif isinstance(vad_parameters, dict):
+                vad_parameters = VadOptions(**vad_parameters)
+            if speech_chunks is None:
+                # the VAD runs on the normalized audio
+                audio = audio / peak
+                speech_chunks = get_speech_timestamps(audio, vad_parameters)
+                audio = collect_chunks(audio, speech_chunks)
+            elif need_audio:
+                audio = collect_chunks(audio, speech_chunks)
+                audio /= peak
+            duration_after_vad = sum(
+                min(chunk["end"], int(duration * sampling_rate)) - chunk["start"] for chunk in speech_chunks
+            ) / sampling_rate
+
+            self.logger.info(
+                "VAD filter removed %s of audio",
+                format_timestamp(duration - duration_after_vad),
+            )
+
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "VAD filter kept the following audio segments: %s",
+                    ", ".join(
+                        "[%s -> %s]"
+                        % (
+                            format_timestamp(chunk["start"] / sampling_rate),
+                            format_timestamp(chunk["end"] / sampling_rate),
+                        )
+                        for chunk in speech_chunks
+                    ),
+                )
+
+        else:
+            speech_chunks = None
+            if need_audio:
+                audio = audio / peak
+
+        if not need_audio:
+            audio = None
+        return audio, duration, duration_after_vad, speech_chunks, vad_parameters
+
     def generate_segments(
         self,
         features: np.ndarray,
         tokenizer: Tokenizer,
         options: TranscriptionOptions,
         encoder_output: Optional[ctranslate2.StorageView] = None,
+        deadline: Optional[float] = None,
+        context: Optional[DecodeContext] = None,
     ) -> Iterable[Segment]:
         content_frames = features.shape[-1] - \
             self.feature_extractor.nb_max_frames
@@ -487,7 +1259,9 @@ class WhisperModel:
         all_tokens = []
         prompt_reset_since = 0
 
-        if options.initial_prompt is not None:
+        if context is not None:
+            all_tokens.extend(context.prompt_tokens)
+        elif options.initial_prompt is not None:
             if isinstance(options.initial_prompt, str):
                 initial_prompt = " " + options.initial_prompt.strip()
                 initial_prompt_tokens = tokenizer.encode(initial_prompt)
@@ -496,6 +1270,7 @@ class WhisperModel:
                 all_tokens.extend(options.initial_prompt)
 
         all_segments = []
+        last_speech_timestamp = 0.0
         # NOTE: This loop is obscurely flattened to make the diff readable.
         # A later commit should turn this into a simpler nested loop.
         # for seek_clip_start, seek_clip_end in seek_clips:
@@ -537,9 +1312,11 @@ class WhisperModel:
                 without_timestamps=options.without_timestamps,
                 prefix=options.prefix if seek == 0 else None,
                 hotwords=options.hotwords,
+                hotwords_tokens=context.hotwords_tokens if context is not None else None,
             )
 
-            if seek > 0 or encoder_output is None:
+            # an encoder output passed in is that of the first full window
+            if seek > 0 or encoder_output is None or segment_size != min(self.feature_extractor.nb_max_frames, content_frames):
                 encoder_output = self.encode(segment)
 
             (
@@ -547,7 +1324,7 @@ class WhisperModel:
                 avg_logprob,
                 temperature,
                 compression_ratio,
-            ) = self.generate_with_fallback(encoder_output, prompt, tokenizer, options)
+            ) = self.generate_with_fallback(encoder_output, prompt, tokenizer, options, deadline=deadline)
 
 
             if options.no_speech_threshold is not None:
@@ -573,82 +1350,25 @@ class WhisperModel:
                     continue
 
             tokens = result.sequences_ids[0]
-            current_segments = []
-
-            single_timestamp_ending = (
-                len(tokens) >= 2
-                and tokens[-2] < tokenizer.timestamp_begin <= tokens[-1]
+            current_segments, seek = self._split_segments_by_timestamps(
+                tokenizer, tokens, time_offset, segment_size, segment_duration, seek
             )
 
-            consecutive_timestamps = [
-                i
-                for i in range(len(tokens))
-                if i > 0
-                and tokens[i] >= tokenizer.timestamp_begin
-                and tokens[i - 1] >= tokenizer.timestamp_begin
-            ]
-
-            if len(consecutive_timestamps) > 0:
-                slices = list(consecutive_timestamps)
-                if single_timestamp_ending:
-                    slices.append(len(tokens))
-
-                last_slice = 0
-                for current_slice in slices:
-                    sliced_tokens = tokens[last_slice:current_slice]
-                    start_timestamp_position = (
-                        sliced_tokens[0] - tokenizer.timestamp_begin
-                    )
-                    end_timestamp_position = (
-                        sliced_tokens[-1] - tokenizer.timestamp_begin
-                    )
-                    start_time = (
-                        time_offset + start_timestamp_position * self.time_precision
-                    )
-                    end_time = (
-                        time_offset + end_timestamp_position * self.time_precision
-                    )
-
-                    current_segments.append(
-                        dict(
-                            seek=seek,
-                            start=start_time,
-                            end=end_time,
-                            tokens=sliced_tokens,
-                        )
-                    )
-                    last_slice = current_slice
-
-                if single_timestamp_ending:
-                    # single timestamp at the end means no speech after the last timestamp.
-                    seek += segment_size
-                else:
-                    # otherwise, ignore the unfinished segment and seek to the last timestamp
-                    last_timestamp_position = (
-                        tokens[last_slice - 1] - tokenizer.timestamp_begin
-                    )
-                    seek += last_timestamp_position * self.input_stride
-
-            else:
-                duration = segment_duration
-                timestamps = [
-                    token for token in tokens if token >= tokenizer.timestamp_begin
+            if options.word_timestamps:
+                text_tokens = [
+                    token for segment in current_segments for token in segment["tokens"] if token < tokenizer.eot
                 ]
-                if len(timestamps) > 0 and timestamps[-1] != tokenizer.timestamp_begin:
-                    last_timestamp_position = timestamps[-1] - tokenizer.timestamp_begin
-                    duration = last_timestamp_position * self.time_precision
-
-                current_segments.append(
-                    dict(
-                        seek=seek,
-                        start=time_offset,
-                        end=time_offset + duration,
-                        tokens=tokens,
-                    )
+                alignment = self.find_alignments([tokenizer], [text_tokens], encoder_output, [segment_size])[0]
+                last_speech_timestamp = self.add_word_timestamps(
+                    current_segments,
+                    tokenizer,
+                    alignment,
+                    time_offset,
+                    options.prepend_punctuations,
+                    options.append_punctuations,
+                    last_speech_timestamp=last_speech_timestamp,
                 )
 
-                seek += segment_size
-
             for segment in current_segments:
                 tokens = segment["tokens"]
                 text = tokenizer.decode(tokens)
@@ -691,12 +1411,106 @@ class WhisperModel:
                 prompt_reset_since = len(all_tokens)
         return all_segments
 
+    def _split_segments_by_timestamps(
+        self,
+        tokenizer: Tokenizer,
+        tokens: List[int],
+        time_offset: float,
+        segment_size: int,
+        segment_duration: float,
+        seek: int,
+    ) -> Tuple[List[dict], int]:
+        """Splits the decoded tokens of one window at consecutive timestamp tokens.
+
+        Returns:
+          A tuple with the list of segment dicts (seek, start, end, tokens) and the
+          seek position of the next window.
+        """
+        current_segments = []
+
+        single_timestamp_ending = (
+            len(tokens) >= 2
+            and tokens[-2] < tokenizer.timestamp_begin <= tokens[-1]
+        )
+
+        consecutive_timestamps = [
+            i
+            for i in range(len(tokens))
+            if i > 0
+            and tokens[i] >= tokenizer.timestamp_begin
+            and tokens[i - 1] >= tokenizer.timestamp_begin
+        ]
+
+        if len(consecutive_timestamps) > 0:
+            slices = list(consecutive_timestamps)
+            if single_timestamp_ending:
+                slices.append(len(tokens))
+
+            last_slice = 0
+            for current_slice in slices:
+                sliced_tokens = tokens[last_slice:current_slice]
+                start_timestamp_position = (
+                    sliced_tokens[0] - tokenizer.timestamp_begin
+                )
+                end_timestamp_position = (
+                    sliced_tokens[-1] - tokenizer.timestamp_begin
+                )
+                start_time = (
+                    time_offset + start_timestamp_position * self.time_precision
+                )
+                end_time = (
+                    time_offset + end_timestamp_position * self.time_precision
+                )
+
+                current_segments.append(
+                    dict(
+                        seek=seek,
+                        start=start_time,
+                        end=end_time,
+                        tokens=sliced_tokens,
+                    )
+                )
+                last_slice = current_slice
+
+            if single_timestamp_ending:
+                # single timestamp at the end means no speech after the last timestamp.
+                seek += segment_size
+            else:
+                # otherwise, ignore the unfinished segment and seek to the last timestamp
+                last_timestamp_position = (
+                    tokens[last_slice - 1] - tokenizer.timestamp_begin
+                )
+                seek += last_timestamp_position * self.input_stride
+
+        else:
+            duration = segment_duration
+            timestamps = [
+                token for token in tokens if token >= tokenizer.timestamp_begin
+            ]
+            if len(timestamps) > 0 and timestamps[-1] != tokenizer.timestamp_begin:
+                last_timestamp_position = timestamps[-1] - tokenizer.timestamp_begin
+                duration = last_timestamp_position * self.time_precision
+
+            current_segments.append(
+                dict(
+                    seek=seek,
+                    start=time_offset,
+                    end=time_offset + duration,
+                    tokens=tokens,
+                )
+            )
+
+            seek += segment_size
+
+        return current_segments, seek
+
     def encode(self, features: np.ndarray) -> ctranslate2.StorageView:
         # When the model is running on multiple GPUs, the encoder output should be moved
         # to the CPU since we don't know which GPU will handle the next job.
         to_cpu = self.model.device == "cuda" and len(self.model.device_index) > 1
 
-        features = np.expand_dims(features, 0)
+        if features.ndim == 2:
+            features = np.expand_dims(features, 0)
         features = get_ctranslate2_storage(features)
 
         return self.model.encode(features, to_cpu=to_cpu)
@@ -707,127 +1521,260 @@ class WhisperModel:
         prompt: List[int],
         tokenizer: Tokenizer,
         options: TranscriptionOptions,
+        first_result: Optional[ctranslate2.models.WhisperGenerationResult] = None,
+        deadline: Optional[float] = None,
     ) -> Tuple[ctranslate2.models.WhisperGenerationResult, float, float, float]:
-        decode_result = None
-        all_results = []
-        below_cr_threshold_results = []
+        """Decodes one window, retrying with the next temperature when the result is rejected.
+
+        Args:
+          first_result: Result of an earlier decoding of this window with the first temperature
+            (e.g. from a batched call). It is used instead of decoding again.
+          deadline: `time.monotonic()` time by which the window is due, see
+            `generate_batch_with_fallback`.
+        """
+        return self.generate_batch_with_fallback(
+            encoder_output,
+            [prompt],
+            [tokenizer],
+            options,
+            first_results=None if first_result is None else [first_result],
+            deadlines=[deadline],
+        )[0]
+
+    def generate_batch_with_fallback(
+        self,
+        encoder_output: ctranslate2.StorageView,
+        prompts: List[List[int]],
+        tokenizers: List[Tokenizer],
+        options: TranscriptionOptions,
+        features: Optional[List[np.ndarray]] = None,
+        first_results: Optional[List[ctranslate2.models.WhisperGenerationResult]] = None,
+        deadlines: Optional[List[Optional[float]]] = None,
+    ) -> List[Tuple[ctranslate2.models.WhisperGenerationResult, float, float, float]]:
+        """Decodes a batch of windows, retrying the rejected ones with the next temperature.
+
+        The fallback follows `self.fallback_options`: a window gets at most `max_attempts`
+        decodings, and no further one once the previous attempt would end after its deadline.
+        With `batch_fallback`, the windows still rejected at a temperature are decoded again
+        together in one `generate` call; otherwise every window falls back on its own.
+        A window whose fallback is cut short keeps its best result so far.
+
+        Args:
+          encoder_output: Encoder output of the windows.
+          prompts: Prompt of every window, all of the same length.
+          tokenizers: Tokenizer of every window.
+          options: Decoding options shared by the windows.
+          features: Padded features of every window, encoded again for a subset of the
+            windows when the encoder output is not on the CPU.
+          first_results: Results of an earlier decoding with the first temperature.
+          deadlines: `time.monotonic()` time by which every window is due, None for no deadline.
+
+        Returns:
+          The (result, avg_logprob, temperature, compression_ratio) tuple of every window.
+        """
+        count = len(prompts)
+        deadlines = deadlines or [None] * count
+        all_results = [[] for _ in range(count)]
+        below_cr_threshold_results = [[] for _ in range(count)]
+        decode_results = [None] * count
 
         max_initial_timestamp_index = int(
             round(options.max_initial_timestamp / self.time_precision)
         )
+        max_length = self._get_max_length(prompts, options)
+        temperatures = options.temperatures[:self.fallback_options.max_attempts]
+        encoder_outputs = {tuple(range(count)): encoder_output}
+
+        pending = list(range(count))
+        attempt_duration = 0.0
+        fallback_start = None
+        for attempt, temperature in enumerate(temperatures):
+            if attempt > 0:
+                now = time.monotonic()
+                # another attempt of this length would end after the deadline
+                allowed = [i for i in pending if deadlines[i] is None or now + attempt_duration <= deadlines[i]]
+                self.fallback_stats.record_stops(deadline_stops=len(pending) - len(allowed))
+                pending = allowed
+                if not pending:
+                    break
+                if fallback_start is None:
+                    fallback_start = now
+
+            started = time.monotonic()
+            if attempt == 0 and first_results is not None:
+                results = list(first_results)
+            else:
+                units = [pending] if attempt == 0 or self.fallback_options.batch_fallback else [[i] for i in pending]
+                results = []
+                for unit in units:
+                    key = tuple(unit)
+                    if key not in encoder_outputs:
+                        encoder_outputs[key] = self._select_encoder_output(encoder_output, unit, features)
+                    results.extend(self.model.generate(
+                        encoder_outputs[key],
+                        [prompts[i] for i in unit],
+                        length_penalty=options.length_penalty,
+                        repetition_penalty=options.repetition_penalty,
+                        no_repeat_ngram_size=options.no_repeat_ngram_size,
+                        max_length=max_length,
+                        return_scores=True,
+                        return_no_speech_prob=True,
+                        suppress_blank=options.suppress_blank,
+                        suppress_tokens=options.suppress_tokens,
+                        max_initial_timestamp_index=max_initial_timestamp_index,
+                        **self._get_sampling_kwargs(options, temperature),
+                    ))
+            attempt_duration = time.monotonic() - started
+            self.fallback_stats.record_temperature(temperature, len(pending))
+
+            rejected = []
+            for i, result in zip(pending, results):
+                decode_result = self._get_decode_result(result, tokenizers[i], options, temperature)
+                all_results[i].append(decode_result)
+
+                needs_fallback, below_cr_threshold = self._needs_fallback(decode_result, options)
+                if below_cr_threshold:
+                    below_cr_threshold_results[i].append(decode_result)
+                if needs_fallback:
+                    rejected.append(i)
+                else:
+                    decode_results[i] = decode_result
+            pending = rejected
+            if not pending:
+                break
+        else:
+            if len(temperatures) < len(options.temperatures):
+                self.fallback_stats.record_stops(attempt_cap_stops=len(pending))
+
+        if fallback_start is not None:
+            self.fallback_stats.record_stops(fallback_time=time.monotonic() - fallback_start)
+
+        for i in range(count):
+            if decode_results[i] is None:
+                # all failed, select the result with the highest average log probability
+                decode_result = max(
+                    below_cr_threshold_results[i] or all_results[i], key=lambda x: x[1]
+                )
+                # to pass final temperature for prompt_reset_on_temperature
+                decode_results[i] = (
+                    decode_result[0],
+                    decode_result[1],
+                    all_results[i][-1][2],
+                    decode_result[3],
+                )
+        return decode_results
+
+    def _select_encoder_output(
+        self,
+        encoder_output: ctranslate2.StorageView,
+        indices: List[int],
+        features: Optional[List[np.ndarray]] = None,
+    ) -> ctranslate2.StorageView:
+        """Encoder output of the windows `indices` of a batch."""
+        if self.model.device == "cpu" or features is None:
+            return get_ctranslate2_storage(np.ascontiguousarray(np.asarray(encoder_output)[indices]))
+        return self.encode(np.stack([features[i] for i in indices]))
+
+    def _get_max_length(self, prompts: List[List[int]], options: TranscriptionOptions) -> int:
+        longest_prompt = max(len(prompt) for prompt in prompts)
         if options.max_new_tokens is not None:
-            max_length = len(prompt) + options.max_new_tokens
+            max_length = longest_prompt + options.max_new_tokens
         else:
             max_length = self.max_length
 
         if max_length > self.max_length:
             raise ValueError(
-                f"The length of the prompt is {len(prompt)}, and the `max_new_tokens` "
-                f"{max_length - len(prompt)}. Thus, the combined length of the prompt "
+                f"The length of the prompt is {longest_prompt}, and the `max_new_tokens` "
+                f"{max_length - longest_prompt}. Thus, the combined length of the prompt "
                 f"and `max_new_tokens` is: {max_length}. This exceeds the "
                 f"`max_length` of the Whisper model: {self.max_length}. "
                 "You should either reduce the length of your prompt, or "
                 "reduce the value of `max_new_tokens`, "
                 f"so that their combined length is less that {self.max_length}."
             )
+        return max_length
+
+    @staticmethod
+    def _get_sampling_kwargs(options: TranscriptionOptions, temperature: float) -> dict:
+        if temperature > 0:
+            return {
+                "beam_size": 1,
+                "num_hypotheses": options.best_of,
+                "sampling_topk": 0,
+                "sampling_temperature": temperature,
+            }
+        return {
+            "beam_size": options.beam_size,
+            "patience": options.patience,
+        }
+
+    def _get_decode_result(
+        self,
+        result: ctranslate2.models.WhisperGenerationResult,
+        tokenizer: Tokenizer,
+        options: TranscriptionOptions,
+        temperature: float,
+    ) -> Tuple[ctranslate2.models.WhisperGenerationResult, float, float, float]:
+        tokens = result.sequences_ids[0]
+        # Recover the average log prob from the returned score.
+        seq_len = len(tokens)
+        cum_logprob = result.scores[0] * (seq_len**options.length_penalty)
+        avg_logprob = cum_logprob / (seq_len + 1)
 
-        for temperature in options.temperatures:
-            if temperature > 0:
-                kwargs = {
-                    "beam_size": 1,
-                    "num_hypotheses": options.best_of,
-                    "sampling_topk": 0,
-                    "sampling_temperature": temperature,
-                }
-            else:
-                kwargs = {
-                    "beam_size": options.beam_size,
-                    "patience": options.patience,
-                }
-
-            result = self.model.generate(
-                encoder_output,
-                [prompt],
-                length_penalty=options.length_penalty,
-                repetition_penalty=options.repetition_penalty,
-                no_repeat_ngram_size=options.no_repeat_ngram_size,
-                max_length=max_length,
-                return_scores=True,
-                return_no_speech_prob=True,
-                suppress_blank=options.suppress_blank,
-                suppress_tokens=options.suppress_tokens,
-                max_initial_timestamp_index=max_initial_timestamp_index,
-                **kwargs,
-            )[0]
-
-            tokens = result.sequences_ids[0]
-            # Recover the average log prob from the returned score.
-            seq_len = len(tokens)
-            cum_logprob = result.scores[0] * (seq_len**options.length_penalty)
-            avg_logprob = cum_logprob / (seq_len + 1)
-
-            text = tokenizer.decode(tokens).strip()
-            compression_ratio = get_compression_ratio(text)
-
-            decode_result = (
-                result,
-                avg_logprob,
-                temperature,
-                compression_ratio,
-            )
-            all_results.append(decode_result)
+        text = tokenizer.decode(tokens).strip()
+        compression_ratio = get_compression_ratio(text)
 
-            needs_fallback = False
+        return result, avg_logprob, temperature, compression_ratio
 
-            if options.compression_ratio_threshold is not None:
-                if compression_ratio > options.compression_ratio_threshold:
-                    needs_fallback = True  # too repetitive
+    def _needs_fallback(
+        self,
+        decode_result: Tuple[ctranslate2.models.WhisperGenerationResult, float, float, float],
+        options: TranscriptionOptions,
+    ) -> Tuple[bool, bool]:
+        """Checks a decoding result against the fallback thresholds.
 
-                    self.logger.debug(
-                        "Compression ratio threshold is not met with temperature %.1f (%f > %f)",
-                        temperature,
-                        compression_ratio,
-                        options.compression_ratio_threshold,
-                    )
-                else:
-                    below_cr_threshold_results.append(decode_result)
+        Returns:
+          A tuple (needs_fallback, below_compression_ratio_threshold).
+        """
+        result, avg_logprob, temperature, compression_ratio = decode_result
+        needs_fallback = False
+        below_cr_threshold = False
 
-            if (
-                options.log_prob_threshold is not None
-                and avg_logprob < options.log_prob_threshold
-            ):
-                needs_fallback = True  # average log probability is too low
+        if options.compression_ratio_threshold is not None:
+            if compression_ratio > options.compression_ratio_threshold:
+                needs_fallback = True  # too repetitive
 
                 self.logger.debug(
-                    "Log probability threshold is not met with temperature %.1f (%f < %f)",
+                    "Compression ratio threshold is not met with temperature %.1f (%f > %f)",
                     temperature,
-                    avg_logprob,
-                    options.log_prob_threshold,
+                    compression_ratio,
+                    options.compression_ratio_threshold,
                 )
+            else:
+                below_cr_threshold = True
 
-            if (
-                options.no_speech_threshold is not None
-                and result.no_speech_prob > options.no_speech_threshold
-                and options.log_prob_threshold is not None
-                and avg_logprob < options.log_prob_threshold
-            ):
-                needs_fallback = False  # silence
+        if (
+            options.log_prob_threshold is not None
+            and avg_logprob < options.log_prob_threshold
+        ):
+            needs_fallback = True  # average log probability is too low
 
-            if not needs_fallback:
-                break
-        else:
-            # all failed, select the result with the highest average log probability
-            decode_result = max(
-                below_cr_threshold_results or all_results, key=lambda x: x[1]
-            )
-            # to pass final temperature for prompt_reset_on_temperature
-            decode_result = (
-                decode_result[0],
-                decode_result[1],
+            self.logger.debug(
+                "Log probability threshold is not met with temperature %.1f (%f < %f)",
                 temperature,
-                decode_result[3],
+                avg_logprob,
+                options.log_prob_threshold,
             )
-        return decode_result
+
+        if (
+            options.no_speech_threshold is not None
+            and result.no_speech_prob > options.no_speech_threshold
+            and options.log_prob_threshold is not None
+            and avg_logprob < options.log_prob_threshold
+        ):
+            needs_fallback = False  # silence
+
+        return needs_fallback, below_cr_threshold
 
     def get_prompt(
         self,
@@ -836,15 +1783,15 @@ class WhisperModel:
         without_timestamps: bool = False,
         prefix: Optional[str] = None,
         hotwords: Optional[str] = None,
+        hotwords_tokens: Optional[List[int]] = None,
     ) -> List[int]:
         prompt = []
 
         if previous_tokens or (hotwords and not prefix):
             prompt.append(tokenizer.sot_prev)
             if hotwords and not prefix:
-                hotwords_tokens = tokenizer.encode(" " + hotwords.strip())
-                if len(hotwords_tokens) >= self.max_length // 2:
-                    hotwords_tokens = hotwords_tokens[: self.max_length // 2 - 1]
+                if hotwords_tokens is None:
+                    hotwords_tokens = tokenizer.encode(" " + hotwords.strip())[: self.max_length // 2 - 1]
                 prompt.extend(hotwords_tokens)
             if previous_tokens:
                 prompt.extend(previous_tokens[-(self.max_length // 2 - 1):])
@@ -874,10 +1821,22 @@ def restore_speech_timestamps(
     updated_segments = []
 
     for segment in segments:
-        segment = segment._replace(
-            start=ts_map.get_original_time(segment.start),
-            end=ts_map.get_original_time(segment.end),
-        )
+        if segment.words:
+            words = []
+            for word in segment.words:
+                # the start and end of a word are resolved to the same chunk
+                middle = (word.start + word.end) / 2
+                chunk_index = ts_map.get_chunk_index(middle)
+                words.append(word._replace(
+                    start=ts_map.get_original_time(word.start, chunk_index),
+                    end=ts_map.get_original_time(word.end, chunk_index),
+                ))
+            segment = segment._replace(start=words[0].start, end=words[-1].end, words=words)
+        else:
+            segment = segment._replace(
+                start=ts_map.get_original_time(segment.start),
+                end=ts_map.get_original_time(segment.end),
+            )
 
         updated_segments.append(segment)
 
@@ -885,6 +1844,41 @@ def restore_speech_timestamps(
 
 
 
+def merge_punctuations(alignment: List[dict], prepended: str, appended: str) -> None:
+    """Merges the punctuation tokens of an alignment into the adjacent words, in place."""
+    # merge prepended punctuations
+    i = len(alignment) - 2
+    j = len(alignment) - 1
+    while i >= 0:
+        previous = alignment[i]
+        following = alignment[j]
+        if previous["word"].startswith(" ") and previous["word"].strip() in prepended:
+            # prepend it to the following word
+            following["word"] = previous["word"] + following["word"]
+            following["tokens"] = previous["tokens"] + following["tokens"]
+            previous["word"] = ""
+            previous["tokens"] = []
+        else:
+            j = i
+        i -= 1
+
+    # merge appended punctuations
+    i = 0
+    j = 1
+    while j < len(alignment):
+        previous = alignment[i]
+        following = alignment[j]
+        if not previous["word"].endswith(" ") and following["word"] in appended:
+            # append it to the previous word
+            previous["word"] = previous["word"] + following["word"]
+            previous["tokens"] = previous["tokens"] + following["tokens"]
+            following["word"] = ""
+            following["tokens"] = []
+        else:
+            i = j
+        j += 1
+
+
 def get_ctranslate2_storage(segment: np.ndarray) -> ctranslate2.StorageView:
     segment = np.ascontiguousarray(segment)
     segment = ctranslate2.StorageView.from_array(segment)
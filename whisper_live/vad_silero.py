@@ -1,13 +1,29 @@
 import bisect
-import functools
+import collections
+import logging
 import os
+import threading
+import time
 
-from typing import List, NamedTuple, Optional
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional, Union
 
 import numpy as np
 
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ImportError:  # the post-processing kernel then runs as plain Python
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda function: function
+
 from faster_whisper.utils import get_assets_path
 
+from whisper_live.energy_gate import EnergyGate
+
 
 # The code below is adapted from https://github.com/snakers4/silero-vad.
 class VadOptions(NamedTuple):
@@ -52,11 +68,55 @@ def get_speech_timestamps(
     if vad_options is None:
         vad_options = VadOptions(**kwargs)
 
+    speech_probs = get_speech_probs(audio)
+    return speech_probs_to_timestamps(speech_probs, len(audio), vad_options)
+
+
+def get_speech_probs(audio: np.ndarray, window_size_samples: int = 512) -> List[float]:
+    """Scores every window of the audio with silero VAD, starting from a fresh model state.
+
+    Args:
+      audio: One dimensional float array.
+      window_size_samples: Samples per window, the last window is zero padded.
+
+    Returns:
+      The speech probability of each window.
+    """
+    sampling_rate = 16000
+    model = get_vad_model()
+    state, context = model.get_initial_states(batch_size=1)
+
+    speech_probs = []
+    for current_start_sample in range(0, len(audio), window_size_samples):
+        chunk = audio[current_start_sample : current_start_sample + window_size_samples]
+        if len(chunk) < window_size_samples:
+            chunk = np.pad(chunk, (0, int(window_size_samples - len(chunk))))
+        speech_prob, state, context = model(chunk, state, context, sampling_rate)
+        speech_probs.append(speech_prob)
+    return speech_probs
+
+
+def speech_probs_to_timestamps(
+    speech_probs: Union[List[float], np.ndarray],
+    audio_length_samples: int,
+    vad_options: VadOptions,
+    window_size_samples: int = 512,
+) -> List[dict]:
+    """Turns per-window speech probabilities into padded speech chunks.
+
+    Args:
+      speech_probs: Speech probability of each window, the first window starts at sample 0.
+      audio_length_samples: Length of the scored audio.
+      vad_options: Options for VAD processing.
+      window_size_samples: Samples per window.
+
+    Returns:
+      List of dicts containing begin and end samples of each speech chunk.
+    """
     threshold = vad_options.threshold
     min_speech_duration_ms = vad_options.min_speech_duration_ms
     max_speech_duration_s = vad_options.max_speech_duration_s
     min_silence_duration_ms = vad_options.min_silence_duration_ms
-    window_size_samples = 512
     speech_pad_ms = vad_options.speech_pad_ms
     sampling_rate = 16000
     min_speech_samples = sampling_rate * min_speech_duration_ms / 1000
@@ -68,112 +128,137 @@ def get_speech_timestamps(
     )
     min_silence_samples = sampling_rate * min_silence_duration_ms / 1000
     min_silence_samples_at_max_speech = sampling_rate * 98 / 1000
+    neg_threshold = threshold - 0.15
 
-    audio_length_samples = len(audio)
-
-    model = get_vad_model()
-    state, context = model.get_initial_states(batch_size=1)
-
-    speech_probs = []
-    for current_start_sample in range(0, audio_length_samples, window_size_samples):
-        chunk = audio[current_start_sample : current_start_sample + window_size_samples]
-        if len(chunk) < window_size_samples:
-            chunk = np.pad(chunk, (0, int(window_size_samples - len(chunk))))
-        speech_prob, state, context = model(chunk, state, context, sampling_rate)
-        speech_probs.append(speech_prob)
+    # probabilities are compared in their own precision, e.g. float32 model outputs
+    speech_probs = np.asarray(speech_probs).reshape(-1)
+    if speech_probs.dtype != np.float32:
+        speech_probs = speech_probs.astype(np.float64)
+    dtype = speech_probs.dtype.type
+    is_speech = speech_probs >= dtype(threshold)
+    is_silence = speech_probs < dtype(neg_threshold)
+    if not HAS_NUMBA:
+        # plain Python indexes lists much faster than arrays
+        is_speech, is_silence = is_speech.tolist(), is_silence.tolist()
+
+    starts, ends, count = _find_speeches(
+        is_speech,
+        is_silence,
+        window_size_samples,
+        float(min_speech_samples),
+        float(max_speech_samples),
+        float(min_silence_samples),
+        float(min_silence_samples_at_max_speech),
+        audio_length_samples,
+    )
+    starts, ends = _pad_speeches(
+        starts[:count], ends[:count], speech_pad_samples, audio_length_samples
+    )
+    return [
+        {"start": start, "end": end} for start, end in zip(starts.tolist(), ends.tolist())
+    ]
+
+
+@njit(cache=True)
+def _find_speeches(
+    is_speech,
+    is_silence,
+    window_size_samples,
+    min_speech_samples,
+    max_speech_samples,
+    min_silence_samples,
+    min_silence_samples_at_max_speech,
+    audio_length_samples,
+):
+    """
+    Hysteresis over the windows above the speech threshold (is_speech) and below the
+    silence threshold (is_silence), returns the unpadded speech starts and ends.
+    """
+    starts = np.zeros(len(is_speech) + 1, dtype=np.int64)
+    ends = np.zeros(len(is_speech) + 1, dtype=np.int64)
+    count = 0
 
     triggered = False
-    speeches = []
-    current_speech = {}
-    neg_threshold = threshold - 0.15
-
+    current_start = 0
     # to save potential segment end (and tolerate some silence)
     temp_end = 0
     # to save potential segment limits in case of maximum segment size reached
-    prev_end = next_start = 0
+    prev_end = 0
+    next_start = 0
 
-    for i, speech_prob in enumerate(speech_probs):
-        if (speech_prob >= threshold) and temp_end:
+    for i in range(len(is_speech)):
+        sample = window_size_samples * i
+        if is_speech[i] and temp_end:
             temp_end = 0
             if next_start < prev_end:
-                next_start = window_size_samples * i
+                next_start = sample
 
-        if (speech_prob >= threshold) and not triggered:
+        if is_speech[i] and not triggered:
             triggered = True
-            current_speech["start"] = window_size_samples * i
+            current_start = sample
             continue
 
-        if (
-            triggered
-            and (window_size_samples * i) - current_speech["start"] > max_speech_samples
-        ):
+        if triggered and sample - current_start > max_speech_samples:
             if prev_end:
-                current_speech["end"] = prev_end
-                speeches.append(current_speech)
-                current_speech = {}
+                starts[count] = current_start
+                ends[count] = prev_end
+                count += 1
                 # previously reached silence (< neg_thres) and is still not speech (< thres)
                 if next_start < prev_end:
                     triggered = False
                 else:
-                    current_speech["start"] = next_start
+                    current_start = next_start
                 prev_end = next_start = temp_end = 0
             else:
-                current_speech["end"] = window_size_samples * i
-                speeches.append(current_speech)
-                current_speech = {}
+                starts[count] = current_start
+                ends[count] = sample
+                count += 1
                 prev_end = next_start = temp_end = 0
                 triggered = False
                 continue
 
-        if (speech_prob < neg_threshold) and triggered:
+        if is_silence[i] and triggered:
             if not temp_end:
-                temp_end = window_size_samples * i
+                temp_end = sample
             # condition to avoid cutting in very short silence
-            if (window_size_samples * i) - temp_end > min_silence_samples_at_max_speech:
+            if sample - temp_end > min_silence_samples_at_max_speech:
                 prev_end = temp_end
-            if (window_size_samples * i) - temp_end < min_silence_samples:
-                continue
-            else:
-                current_speech["end"] = temp_end
-                if (
-                    current_speech["end"] - current_speech["start"]
-                ) > min_speech_samples:
-                    speeches.append(current_speech)
-                current_speech = {}
-                prev_end = next_start = temp_end = 0
-                triggered = False
+            if sample - temp_end < min_silence_samples:
                 continue
-
-    if (
-        current_speech
-        and (audio_length_samples - current_speech["start"]) > min_speech_samples
-    ):
-        current_speech["end"] = audio_length_samples
-        speeches.append(current_speech)
-
-    for i, speech in enumerate(speeches):
-        if i == 0:
-            speech["start"] = int(max(0, speech["start"] - speech_pad_samples))
-        if i != len(speeches) - 1:
-            silence_duration = speeches[i + 1]["start"] - speech["end"]
-            if silence_duration < 2 * speech_pad_samples:
-                speech["end"] += int(silence_duration // 2)
-                speeches[i + 1]["start"] = int(
-                    max(0, speeches[i + 1]["start"] - silence_duration // 2)
-                )
-            else:
-                speech["end"] = int(
-                    min(audio_length_samples, speech["end"] + speech_pad_samples)
-                )
-                speeches[i + 1]["start"] = int(
-                    max(0, speeches[i + 1]["start"] - speech_pad_samples)
-                )
-        else:
-            speech["end"] = int(
-                min(audio_length_samples, speech["end"] + speech_pad_samples)
-            )
-
-    return speeches
+            if temp_end - current_start > min_speech_samples:
+                starts[count] = current_start
+                ends[count] = temp_end
+                count += 1
+            prev_end = next_start = temp_end = 0
+            triggered = False
+
+    if triggered and audio_length_samples - current_start > min_speech_samples:
+        starts[count] = current_start
+        ends[count] = audio_length_samples
+        count += 1
+
+    return starts, ends, count
+
+
+def _pad_speeches(
+    starts: np.ndarray, ends: np.ndarray, speech_pad_samples: float, audio_length_samples: int
+):
+    """Pads every speech by speech_pad_samples, splitting shorter gaps between neighbours."""
+    if len(starts) == 0:
+        return starts, ends
+    new_starts = starts.astype(np.float64)
+    new_ends = ends.astype(np.float64)
+
+    silence = starts[1:] - ends[:-1]
+    short = silence < 2 * speech_pad_samples
+    half = silence // 2
+    new_ends[:-1] = np.where(
+        short, ends[:-1] + half, np.minimum(audio_length_samples, ends[:-1] + speech_pad_samples)
+    )
+    new_starts[1:] = np.maximum(0, np.where(short, starts[1:] - half, starts[1:] - speech_pad_samples))
+    new_starts[0] = max(0, starts[0] - speech_pad_samples)
+    new_ends[-1] = min(audio_length_samples, ends[-1] + speech_pad_samples)
+    return new_starts.astype(np.int64), new_ends.astype(np.int64)
 
 
 def collect_chunks(audio: np.ndarray, chunks: List[dict]) -> np.ndarray:
@@ -184,6 +269,280 @@ def collect_chunks(audio: np.ndarray, chunks: List[dict]) -> np.ndarray:
     return np.concatenate([audio[chunk["start"] : chunk["end"]] for chunk in chunks])
 
 
+class StreamingVAD:
+    """Silero VAD over a live stream, scoring every window exactly once.
+
+    The model state and context are kept between calls to `accept`, so appending audio only
+    scores the newly completed 512 sample windows. Speech probabilities are cached by absolute
+    window index (window `i` covers samples [512 * i, 512 * (i + 1)) of the stream), which lets
+    `get_speech_chunks` produce the speech chunks of any retained range without running the
+    model again.
+
+    Without an engine the windows are scored synchronously in `accept`. With a `BatchedVAD`
+    engine they are queued and scored by the engine thread together with the windows of the
+    other streams; `on_scored` is called from that thread once the queue is drained.
+
+    With an `EnergyGate`, the windows it classifies as certainly silent are recorded with
+    probability 0 without running the model.
+
+    Args:
+      vad_options: Options for VAD processing.
+      max_windows: Number of window probabilities retained. Defaults to 60 seconds.
+      engine: Optional `BatchedVAD` scoring the windows of many streams per model call.
+      on_scored: Optional callback invoked after newly accepted windows have been scored.
+      gate: Optional `EnergyGate` run before the model.
+    """
+
+    window_size_samples = 512
+    sampling_rate = 16000
+
+    def __init__(
+        self,
+        vad_options: Optional[VadOptions] = None,
+        max_windows: int = 1875,
+        engine: Optional["BatchedVAD"] = None,
+        on_scored: Optional[Callable[[], None]] = None,
+        gate: Optional[EnergyGate] = None,
+    ):
+        self.vad_options = vad_options or VadOptions()
+        self.max_windows = max_windows
+        self.engine = engine
+        self.on_scored = on_scored
+        self.gate = gate
+        self.model = engine.model if engine is not None else get_vad_model()
+        self.state, self.context = self.model.get_initial_states(batch_size=1)
+        self.remainder = np.zeros(0, dtype=np.float32)
+        self.queued = collections.deque()  # windows waiting for the engine
+        self.speech_probs = []
+        self.first_window = 0  # absolute index of speech_probs[0]
+        self.last_speech_end = 0  # absolute end sample of the last window above the threshold
+        self.in_speech = False
+        self.gated_windows = 0  # windows the gate classified as silent
+        self.scored_windows = 0  # windows scored by the model
+        self.rejected_windows = 0  # scored windows below the threshold
+        self.lock = threading.Lock()
+
+    @property
+    def end(self) -> int:
+        """Absolute sample index past the last scored window."""
+        return (self.first_window + len(self.speech_probs)) * self.window_size_samples
+
+    def accept(self, audio: np.ndarray) -> int:
+        """Scores (or queues for the engine) the windows completed by the new audio.
+
+        Args:
+          audio: One dimensional float array following the previously accepted audio.
+
+        Returns:
+          The number of windows completed.
+        """
+        if self.remainder.shape[0]:
+            audio = np.concatenate([self.remainder, audio])
+        n_windows = audio.shape[0] // self.window_size_samples
+        windows = audio[: n_windows * self.window_size_samples].reshape(n_windows, self.window_size_samples)
+        self.remainder = audio[n_windows * self.window_size_samples :].copy()
+        if n_windows == 0:
+            return 0
+        silent = self.gate(windows) if self.gate is not None else np.zeros(n_windows, dtype=bool)
+
+        if self.engine is not None:
+            with self.lock:
+                # gated windows are queued as None to keep the order of the probabilities
+                self.queued.extend(None if gated else window.copy() for window, gated in zip(windows, silent))
+            self.engine.submit(self)
+            return n_windows
+
+        for window, gated in zip(windows, silent):
+            if gated:
+                self.record(0.0, gated=True)
+                continue
+            speech_prob, self.state, self.context = self.model(
+                window, self.state, self.context, self.sampling_rate
+            )
+            self.record(speech_prob.item())
+        if self.on_scored is not None:
+            self.on_scored()
+        return n_windows
+
+    def record(self, speech_prob: float, gated: bool = False):
+        """Appends the probability of the next window of the stream."""
+        with self.lock:
+            self.speech_probs.append(speech_prob)
+            if gated:
+                self.gated_windows += 1
+            else:
+                self.scored_windows += 1
+            if speech_prob >= self.vad_options.threshold:
+                self.last_speech_end = self.end
+                self.in_speech = True
+            elif not gated:
+                self.rejected_windows += 1
+            if len(self.speech_probs) > 2 * self.max_windows:
+                drop = len(self.speech_probs) - self.max_windows
+                del self.speech_probs[:drop]
+                self.first_window += drop
+
+    def get_filtered_seconds(self) -> dict:
+        """Seconds of audio classified as silence by the energy gate and by the model."""
+        duration = self.window_size_samples / self.sampling_rate
+        with self.lock:
+            return {
+                "energy_gate": round(self.gated_windows * duration, 3),
+                "vad": round(self.rejected_windows * duration, 3),
+            }
+
+    def has_speech(self, start: int) -> bool:
+        """Whether any window scored after absolute sample `start` is above the threshold."""
+        return self.last_speech_end > start
+
+    def trailing_silence(self) -> float:
+        """Seconds scored since the last window above the threshold."""
+        return (self.end - self.last_speech_end) / self.sampling_rate
+
+    def end_of_speech(self) -> bool:
+        """Returns True once when the silence after speech reaches `min_silence_duration_ms`."""
+        with self.lock:
+            if self.in_speech and self.trailing_silence() * 1000 >= self.vad_options.min_silence_duration_ms:
+                self.in_speech = False
+                return True
+        return False
+
+    def get_speech_chunks(self, start: int, end: int) -> List[dict]:
+        """Speech chunks of the absolute sample range [start, end) from the cached probabilities.
+
+        Returns:
+          List of dicts containing begin and end samples of each speech chunk, relative to `start`.
+        """
+        with self.lock:
+            first = max(start // self.window_size_samples, self.first_window)
+            last = min(-(-end // self.window_size_samples), self.first_window + len(self.speech_probs))
+            if last <= first:
+                return []
+            speech_probs = self.speech_probs[first - self.first_window : last - self.first_window]
+
+        offset = first * self.window_size_samples
+        chunks = speech_probs_to_timestamps(
+            speech_probs, end - offset, self.vad_options, self.window_size_samples
+        )
+        speech_chunks = []
+        for chunk in chunks:
+            chunk_start = max(0, chunk["start"] + offset - start)
+            chunk_end = min(end - start, chunk["end"] + offset - start)
+            if chunk_end > chunk_start:
+                speech_chunks.append({"start": chunk_start, "end": chunk_end})
+        return speech_chunks
+
+
+class BatchedVAD:
+    """Scores the queued windows of many `StreamingVAD` streams with batched Silero calls.
+
+    Silero is recurrent, so consecutive windows of one stream cannot share a call. Every step
+    instead takes the next window of up to `max_batch_size` streams, stacks them with their
+    states and contexts into one `session.run`, and scatters the new states back. Streams with
+    a backlog advance one window per step, round robin, until their queues are drained.
+
+    Args:
+      max_batch_size: Maximum number of streams scored per model call.
+    """
+
+    def __init__(self, max_batch_size: int = 32):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        self.max_batch_size = max_batch_size
+        self.model = get_vad_model()
+        self.active = collections.deque()  # streams with queued windows
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.steps = 0
+        self.windows = 0
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, stream: StreamingVAD):
+        """Schedules a stream whose queue holds windows."""
+        with self.condition:
+            if stream not in self.active:
+                self.active.append(stream)
+            self.condition.notify()
+
+    def remove(self, stream: StreamingVAD):
+        with self.condition:
+            if stream in self.active:
+                self.active.remove(stream)
+
+    def step(self, streams: List[StreamingVAD]) -> List[StreamingVAD]:
+        """Scores the next queued window of every stream with one model call.
+
+        Returns:
+          The streams whose queue is drained.
+        """
+        batch, windows = [], []
+        for stream in streams:
+            with stream.lock:
+                window = stream.queued.popleft()
+            if window is None:  # classified as silent by the energy gate
+                stream.record(0.0, gated=True)
+            else:
+                batch.append(stream)
+                windows.append(window)
+
+        if batch:
+            state = np.concatenate([stream.state for stream in batch], axis=1)
+            context = np.concatenate([stream.context for stream in batch], axis=0)
+            speech_probs, state, context = self.model(
+                np.stack(windows), state, context, StreamingVAD.sampling_rate
+            )
+            for i, stream in enumerate(batch):
+                stream.state = state[:, i : i + 1]
+                stream.context = context[i : i + 1]
+                stream.record(float(speech_probs[i, 0]))
+            self.steps += 1
+            self.windows += len(batch)
+        return [stream for stream in streams if not stream.queued]
+
+    def run(self):
+        while not self.stop_event.is_set():
+            with self.condition:
+                if not self.condition.wait_for(lambda: self.active or self.stop_event.is_set(), timeout=0.1):
+                    continue
+                if self.stop_event.is_set():
+                    return
+                streams = [
+                    self.active.popleft() for _ in range(min(self.max_batch_size, len(self.active)))
+                ]
+
+            try:
+                drained = self.step(streams)
+            except Exception as e:
+                logging.error(f"Batched VAD step of {len(streams)} streams failed: {e}")
+                drained = []
+                for stream in streams:
+                    with stream.lock:
+                        stream.queued.clear()
+
+            with self.condition:
+                for stream in streams:
+                    if stream.queued and stream not in self.active:
+                        self.active.append(stream)
+            for stream in drained:
+                if stream.on_scored is not None:
+                    stream.on_scored()
+
+
 class SpeechTimestampsMap:
     """Helper class to restore original speech timestamps."""
 
@@ -222,15 +581,117 @@ class SpeechTimestampsMap:
         )
 
 
-@functools.lru_cache
-def get_vad_model():
-    """Returns the VAD model instance."""
-    path = os.path.join(get_assets_path(), "silero_vad.onnx")
-    return SileroVADModel(path)
+_vad_model = None
+_vad_model_lock = threading.Lock()
+
+
+def configure_vad_model(
+    sessions: int = 1, intra_op_num_threads: int = 1, inter_op_num_threads: int = 1
+) -> "VADSessionPool":
+    """Replaces the VAD session pool returned by `get_vad_model`."""
+    global _vad_model
+    pool = VADSessionPool(sessions, intra_op_num_threads, inter_op_num_threads)
+    with _vad_model_lock:
+        _vad_model = pool
+    return pool
+
+
+def get_vad_model() -> "VADSessionPool":
+    """Returns the VAD session pool shared by all threads, one single threaded session unless configured."""
+    global _vad_model
+    with _vad_model_lock:
+        if _vad_model is None:
+            _vad_model = VADSessionPool()
+        return _vad_model
+
+
+class VADSessionPool:
+    """Silero ONNX sessions shared by all threads.
+
+    Every model call checks out a free session and returns it afterwards, so up to `sessions`
+    calls run in parallel and further callers wait. The wait and busy time counters show
+    whether the VAD, rather than the ASR model, is the bottleneck. The pool is called like a
+    single `SileroVADModel`.
+
+    Args:
+      sessions: Number of ONNX Runtime sessions.
+      intra_op_num_threads: Threads of every session used within an operator.
+      inter_op_num_threads: Threads of every session used across operators.
+      path: Path of the ONNX model, defaults to the bundled silero_vad.onnx.
+    """
+
+    def __init__(
+        self,
+        sessions: int = 1,
+        intra_op_num_threads: int = 1,
+        inter_op_num_threads: int = 1,
+        path: Optional[str] = None,
+    ):
+        if sessions < 1:
+            raise ValueError(f"sessions must be at least 1, got {sessions}")
+        path = path or os.path.join(get_assets_path(), "silero_vad.onnx")
+        self.models = [
+            SileroVADModel(path, intra_op_num_threads, inter_op_num_threads) for _ in range(sessions)
+        ]
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.free = list(self.models)
+        self.condition = threading.Condition()
+        self.started = time.monotonic()
+        self.checkouts = 0
+        self.contended = 0  # checkouts that found no free session
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.busy_time = 0.0
+
+    @contextmanager
+    def checkout(self):
+        """Reserves a free session for the duration of the block and yields it."""
+        requested = time.monotonic()
+        with self.condition:
+            if not self.free:
+                self.contended += 1
+                self.condition.wait_for(lambda: self.free)
+            model = self.free.pop()
+            checked_out = time.monotonic()
+            self.checkouts += 1
+            self.wait_time += checked_out - requested
+            self.max_wait = max(self.max_wait, checked_out - requested)
+        try:
+            yield model
+        finally:
+            with self.condition:
+                self.busy_time += time.monotonic() - checked_out
+                self.free.append(model)
+                self.condition.notify()
+
+    def get_initial_states(self, batch_size: int):
+        return self.models[0].get_initial_states(batch_size)
+
+    def __call__(self, x, state, context, sr: int):
+        with self.checkout() as model:
+            return model(x, state, context, sr)
+
+    def get_status(self):
+        """Returns the size of the pool, the session wait counters and the share of time busy."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        with self.condition:
+            return {
+                "sessions": len(self.models),
+                "intra_op_threads": self.intra_op_num_threads,
+                "inter_op_threads": self.inter_op_num_threads,
+                "in_use": len(self.models) - len(self.free),
+                "checkouts": self.checkouts,
+                "contended": self.contended,
+                "mean_wait": round(self.wait_time / self.checkouts, 6) if self.checkouts else 0.0,
+                "max_wait": round(self.max_wait, 6),
+                "wait_seconds": round(self.wait_time, 3),
+                "utilization": round(self.busy_time / (elapsed * len(self.models)), 4),
+            }
 
 
 class SileroVADModel:
-    def __init__(self, path):
+    def __init__(self, path, intra_op_num_threads: int = 1, inter_op_num_threads: int = 1):
         try:
             import onnxruntime
         except ImportError as e:
@@ -239,8 +700,8 @@ class SileroVADModel:
             ) from e
 
         opts = onnxruntime.SessionOptions()
-        opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = inter_op_num_threads
+        opts.intra_op_num_threads = intra_op_num_threads
         opts.log_severity_level = 4
 
         self.session = onnxruntime.InferenceSession(